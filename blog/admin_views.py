@@ -1,23 +1,134 @@
+from django.contrib import messages
+from django.db.models import Exists, OuterRef, Prefetch, Q
 from django.shortcuts import redirect, render
 from django.contrib.admin.views.decorators import staff_member_required
 from django.urls import reverse
+from django.utils.dateparse import parse_date
+from wagtail.images import get_image_model
 from wagtail.models import Page
-from .models import NewsIndexPage, KeyFactsPage
+from .bulk import BULK_FLAGS, BULK_TAXONOMIES, BulkActionError, apply_bulk_action
+from .pagination import InvalidCursor, keyset_paginate
+from .models import ArticlePage, NewsIndexPage, KeyFactsPage
+from .taxonomy import find_by_slug, get_taxonomies
 from home.models import HomePage
 
+ARTICLES_PER_PAGE = 50
+ARTICLES_ORDERING = [("latest_revision_created_at", True), ("pk", True)]
+
+KEY_FACTS_PER_PAGE = 50
+KEY_FACTS_ORDERING = [("date", True), ("pk", True)]
+KEY_FACT_THUMBNAIL = "fill-50x50"
+
+
+def _bulk_action_choices():
+    """(group label, [(action, label), ...]) for the bulk action <select>."""
+    taxonomies = get_taxonomies()
+    groups = [
+        ("Publishing", [("publish", "Publish"), ("unpublish", "Unpublish")]),
+        ("Flags", [
+            choice
+            for name, label in BULK_FLAGS.items()
+            for choice in ((f"set:{name}", f"Mark as {label}"), (f"unset:{name}", f"Remove {label}"))
+        ]),
+    ]
+    for name in BULK_TAXONOMIES:
+        title = name.replace("_", " ").capitalize()
+        groups.append((f"Add to {title}", [(f"add:{name}:{item['id']}", item["name"]) for item in taxonomies[name]]))
+        groups.append((f"Remove from {title}", [(f"remove:{name}:{item['id']}", item["name"]) for item in taxonomies[name]]))
+    return groups
+
 
 @staff_member_required
 def admin_articles(request):
-    page = NewsIndexPage.objects.first() or Page.objects.filter(slug="news").first()
-    if page:
-        return redirect(reverse("wagtailadmin_explore", args=[page.id]))
-    return redirect(reverse("wagtailadmin_home"))
+    """News articles with multi-select bulk actions (see blog/bulk.py)."""
+    if request.method == "POST":
+        page_ids = [pk for pk in request.POST.getlist("page_ids") if pk.isdigit()]
+        if not page_ids:
+            messages.warning(request, "Select at least one article.")
+        else:
+            try:
+                result = apply_bulk_action(page_ids, request.POST.get("action"), request.user)
+            except BulkActionError as e:
+                messages.error(request, str(e))
+            else:
+                messages.success(
+                    request,
+                    f"{len(result.updated)} updated, {len(result.unchanged)} already up to date.",
+                )
+                for page, reason in result.skipped:
+                    messages.warning(request, f"Skipped \"{page.title}\": {reason}")
+        return redirect(request.get_full_path())
+
+    articles = ArticlePage.objects.all()
+    search_query = (request.GET.get("q") or "").strip()
+    if search_query:
+        articles = articles.filter(title__icontains=search_query)
+
+    try:
+        page_obj = keyset_paginate(
+            articles, ARTICLES_ORDERING, ARTICLES_PER_PAGE,
+            after=request.GET.get("after") or None,
+            before=request.GET.get("before") or None,
+        )
+    except InvalidCursor:
+        page_obj = keyset_paginate(articles, ARTICLES_ORDERING, ARTICLES_PER_PAGE)
+
+    parent = NewsIndexPage.objects.first() or Page.objects.filter(slug="news").first()
+    context = {
+        "page_obj": page_obj,
+        "articles": page_obj.object_list,
+        "search_query": search_query,
+        "action_choices": _bulk_action_choices(),
+        "explore_url": reverse("wagtailadmin_explore", args=[parent.id]) if parent else None,
+    }
+    return render(request, "admin/articles_listing.html", context)
+
+
+def _parse_date(value):
+    try:
+        return parse_date(value or "")
+    except ValueError:
+        return None
 
 
 @staff_member_required
 def admin_keyfacts(request):
     """Custom admin listing for Key Facts pages with direct edit links."""
-    key_facts = KeyFactsPage.objects.all().order_by('-date', '-first_published_at')
+    key_facts = KeyFactsPage.objects.prefetch_related(
+        # The header images and their listing thumbnails, in one query each
+        Prefetch(
+            "page_header_image",
+            queryset=get_image_model().objects.prefetch_renditions(KEY_FACT_THUMBNAIL),
+        ),
+    )
+
+    search_query = (request.GET.get("q") or "").strip()
+    if search_query:
+        key_facts = key_facts.filter(Q(title__icontains=search_query) | Q(intro__icontains=search_query))
+
+    taxonomies = get_taxonomies()
+    type_filter = (request.GET.get("type") or "").strip()
+    article_type = find_by_slug(taxonomies["article_types"], type_filter)
+    if article_type:
+        key_facts = key_facts.filter(Exists(KeyFactsPage.article_types.through.objects.filter(
+            keyfactspage_id=OuterRef("pk"), articletype_id=article_type["id"],
+        )))
+
+    date_from = _parse_date(request.GET.get("date_from"))
+    date_to = _parse_date(request.GET.get("date_to"))
+    if date_from:
+        key_facts = key_facts.filter(date__gte=date_from)
+    if date_to:
+        key_facts = key_facts.filter(date__lte=date_to)
+
+    try:
+        page_obj = keyset_paginate(
+            key_facts, KEY_FACTS_ORDERING, KEY_FACTS_PER_PAGE,
+            after=request.GET.get("after") or None,
+            before=request.GET.get("before") or None,
+        )
+    except InvalidCursor:
+        page_obj = keyset_paginate(key_facts, KEY_FACTS_ORDERING, KEY_FACTS_PER_PAGE)
 
     # Find any valid parent page for "Add" button (HomePage as fallback)
     parent = (
@@ -37,7 +148,13 @@ def admin_keyfacts(request):
         )
 
     context = {
-        "key_facts": key_facts,
+        "key_facts": page_obj.object_list,
+        "page_obj": page_obj,
+        "search_query": search_query,
+        "type_filter": type_filter,
+        "date_from": date_from,
+        "date_to": date_to,
+        "article_types": taxonomies["article_types"],
         "add_url": add_url,
     }
     return render(request, "admin/key_facts_listing.html", context)
@@ -1,4 +1,4 @@
-from wagtail.api.v2.views import PagesAPIViewSet
+from wagtail.api.v2.views import BaseAPIViewSet, PagesAPIViewSet
 from wagtail.api.v2.router import WagtailAPIRouter
 from wagtail.images.api.v2.views import ImagesAPIViewSet
 from wagtail.documents.api.v2.views import DocumentsAPIViewSet
@@ -7,18 +7,75 @@ from wagtail.api.v2.filters import (
     OrderingFilter,
     SearchFilter,
 )
+from wagtail.api.v2.utils import (
+    BadRequestError,
+    get_full_url,
+    get_object_detail_url,
+    parse_fields_parameter,
+)
+from wagtail.images import get_image_model
+from wagtail.models import Page
+import datetime
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import DateField, Q
+from django.db.models.functions import Coalesce, TruncDate
+from django.urls import path
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.fields import Field
+from rest_framework.response import Response
+from wagtail.api import APIField
 
-from .models import ArticlePage
+from .models import ArticlePage, BlogPage, KeyFactsPage, PageTombstone
+from .pagination import decode_cursor, encode_cursor, keyset_filter
+from .renditions import load_api_renditions, rendition_urls
 
 # Create the router. "wagtailapi" is the URL namespace
 api_router = WagtailAPIRouter('wagtailapi')
 
+
+class ImageRenditionsField(Field):
+    """
+    Serializes an image foreign key as {"card": url, "hero": url, ...}.
+
+    The renditions are looked up in the "api_renditions" serializer context,
+    which the view fills with one batched query per response.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, image):
+        renditions = self.context.get('api_renditions')
+        if renditions is None:
+            renditions = load_api_renditions([image])
+        return rendition_urls(image, renditions, self.context.get('request'))
+
+
+def _get_limit(request):
+    """?limit= for the cursor-paginated endpoints, capped at WAGTAILAPI_LIMIT_MAX."""
+    limit_max = getattr(settings, 'WAGTAILAPI_LIMIT_MAX', 20) or 20
+    try:
+        limit = int(request.GET.get('limit', min(20, limit_max)))
+        if limit < 1:
+            raise ValueError()
+    except ValueError as e:
+        raise BadRequestError("limit must be a positive integer") from e
+    if limit > limit_max:
+        raise BadRequestError("limit cannot be higher than %d" % limit_max)
+    return limit
+
+
 # Create a custom Pages API endpoint for blog posts
 class BlogPagesAPIViewSet(PagesAPIViewSet):
     model = ArticlePage
 
     # Configure the fields that should be returned in the API response
     body_fields = [
+        'id',  # needed by mirrors to match items against delta-sync tombstones
         'title',
         'date',
         'intro',
@@ -42,6 +99,10 @@ class BlogPagesAPIViewSet(PagesAPIViewSet):
         'wide_thumbnail',
         'page_header_image',
         'icon',
+        APIField('tall_thumbnail_renditions', serializer=ImageRenditionsField(source='tall_thumbnail')),
+        APIField('wide_thumbnail_renditions', serializer=ImageRenditionsField(source='wide_thumbnail')),
+        APIField('page_header_image_renditions', serializer=ImageRenditionsField(source='page_header_image')),
+        APIField('icon_renditions', serializer=ImageRenditionsField(source='icon')),
     ]
 
     # Configure meta fields
@@ -77,9 +138,495 @@ class BlogPagesAPIViewSet(PagesAPIViewSet):
         'body',
     ]
 
+    # Delta-sync mode parameters (see delta_listing_view)
+    known_query_parameters = PagesAPIViewSet.known_query_parameters.union([
+        'since',
+        'cursor',
+    ])
+
+    # Related objects behind each API field. get_queryset() only joins or
+    # prefetches the ones the current request will actually serialize, so a
+    # listing costs the same number of queries whatever its length.
+    select_related_fields = {
+        'tall_thumbnail': 'tall_thumbnail',
+        'wide_thumbnail': 'wide_thumbnail',
+        'page_header_image': 'page_header_image',
+        'icon': 'icon',
+        'tall_thumbnail_renditions': 'tall_thumbnail',
+        'wide_thumbnail_renditions': 'wide_thumbnail',
+        'page_header_image_renditions': 'page_header_image',
+        'icon_renditions': 'icon',
+        'locale': 'locale',
+    }
+    prefetch_related_fields = {
+        'article_types': 'article_types',
+        'locations': 'locations',
+        'sectors': 'sectors',
+    }
+
     # Override get_queryset to return all blog pages, not just site descendants
     def get_queryset(self):
-        return ArticlePage.objects.live().order_by('-first_published_at')
+        queryset = ArticlePage.objects.live().order_by('-first_published_at')
+
+        fields = self.get_requested_fields()
+        select_related = list(dict.fromkeys(
+            relation for field, relation in self.select_related_fields.items()
+            if field in fields
+        ))
+        prefetch_related = [
+            relation for field, relation in self.prefetch_related_fields.items()
+            if field in fields
+        ]
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        context = self.get_serializer_context()
+
+        # Resolve every requested rendition for the whole response at once
+        rendition_sources = [
+            self.select_related_fields[field] for field in self.get_requested_fields()
+            if field.endswith('_renditions')
+        ]
+        if args and rendition_sources:
+            instances = args[0] if kwargs.get('many') else [args[0]]
+            context['api_renditions'] = load_api_renditions(
+                getattr(instance, source)
+                for instance in instances
+                for source in rendition_sources
+            )
+
+        return self.get_serializer_class()(*args, context=context, **kwargs)
+
+    def get_requested_fields(self):
+        """
+        Names of the top-level fields the serializer will output, resolved from
+        ?fields= the same way _get_serializer_class() does.
+        """
+        request = getattr(self, 'request', None)
+        if request is None:
+            return set()
+
+        if getattr(self, 'action', None) == 'listing_view':
+            fields = set(self.get_listing_default_fields(self.model))
+        else:
+            fields = set(self.get_detail_default_fields(self.model))
+
+        try:
+            fields_config = parse_fields_parameter(request.GET.get('fields', ''))
+        except ValueError:
+            # Reported properly by get_serializer_class()
+            return fields
+
+        if fields_config and fields_config[0][0] == '*':
+            fields = set(self.get_available_fields(self.model))
+            fields_config = fields_config[1:]
+        elif fields_config and fields_config[0][0] == '_':
+            fields = set()
+            fields_config = fields_config[1:]
+
+        for field_name, negated, sub_fields in fields_config:
+            if negated:
+                fields.discard(field_name)
+            else:
+                fields.add(field_name)
+        return fields
+
+    def listing_view(self, request):
+        if 'since' in request.GET or 'cursor' in request.GET:
+            return self.delta_listing_view(request)
+        return super().listing_view(request)
+
+    def delta_listing_view(self, request):
+        """
+        Delta-sync mode: ?since=<ISO timestamp> or ?cursor=<next_cursor>.
+
+        Returns pages published after the given point, ordered by
+        (last_published_at, id), together with tombstones for pages that were
+        unpublished or deleted in the same window. Pages are read with a keyset
+        cursor rather than an offset, so a mirror sync costs O(changes).
+        """
+        for param in ('offset', 'order', 'search'):
+            if param in request.GET:
+                raise BadRequestError(f"{param} cannot be used with since/cursor")
+
+        queryset = self.get_queryset()
+        self.check_query_parameters(queryset)
+        queryset = self.filter_queryset(queryset)
+        limit = _get_limit(request)
+
+        cursor = request.GET.get('cursor')
+        if cursor:
+            position = decode_cursor(cursor, 2)
+            page_filter = keyset_filter(['last_published_at', 'id'], position)
+            tombstone_filter = keyset_filter(['removed_at', 'page_id'], position)
+        else:
+            since = self._parse_since(request.GET['since'])
+            position = [since, 0]
+            page_filter = Q(last_published_at__gt=since)
+            tombstone_filter = Q(removed_at__gt=since)
+
+        pages = queryset.filter(page_filter).order_by('last_published_at', 'id')[:limit + 1]
+        tombstones = PageTombstone.objects.filter(
+            tombstone_filter,
+            content_type=ContentType.objects.get_for_model(self.model),
+        ).order_by('removed_at', 'page_id')[:limit + 1]
+
+        # Merge both change streams on the shared (timestamp, page id) key.
+        # A page is either live or tombstoned, never both, so keys are unique.
+        changes = sorted(
+            [(page.last_published_at, page.pk, page) for page in pages]
+            + [(tombstone.removed_at, tombstone.page_id, tombstone) for tombstone in tombstones],
+            key=lambda change: (change[0], change[1]),
+        )
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        if changes:
+            position = [changes[-1][0], changes[-1][1]]
+
+        changed_pages = [obj for _, _, obj in changes if not isinstance(obj, PageTombstone)]
+        deleted = [
+            {
+                'id': obj.page_id,
+                'type': self.model._meta.label,
+                'url_path': obj.url_path,
+                'reason': obj.reason,
+                'removed_at': obj.removed_at.isoformat(),
+            }
+            for _, _, obj in changes if isinstance(obj, PageTombstone)
+        ]
+
+        serializer = self.get_serializer(changed_pages, many=True)
+        return Response({
+            'meta': {
+                'has_more': has_more,
+                'next_cursor': encode_cursor(position),
+            },
+            'items': serializer.data,
+            'deleted': deleted,
+        })
+
+    def _parse_since(self, value):
+        # A literal "+" in a query string arrives as a space
+        since = parse_datetime(value.strip().replace(' ', '+'))
+        if since is None:
+            raise BadRequestError("since must be an ISO 8601 timestamp")
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since, datetime.timezone.utc)
+        return since
+
+
+# ----------------------------
+# Unified feed: ArticlePage + BlogPage + KeyFactsPage
+# ----------------------------
+FEED_MODELS = {
+    'blog.ArticlePage': ArticlePage,
+    'blog.BlogPage': BlogPage,
+    'blog.KeyFactsPage': KeyFactsPage,
+}
+
+FEED_META_FIELDS = [
+    'type',
+    'detail_url',
+    'html_url',
+    'slug',
+    'first_published_at',
+    'last_published_at',
+]
+
+FEED_BODY_FIELDS = [
+    'title',
+    'date',
+    'intro',
+    'author',
+    'featured',
+    'featured_data',
+    'article_types',
+    'locations',
+    'sectors',
+    'tall_thumbnail',
+    'wide_thumbnail',
+    'page_header_image',
+]
+
+FEED_DEFAULT_FIELDS = [
+    'type',
+    'detail_url',
+    'html_url',
+    'slug',
+    'first_published_at',
+    'title',
+    'date',
+]
+
+# Relations loaded alongside each page, so the whole response is answered in
+# one query per content type plus one per requested taxonomy
+FEED_SELECT_RELATED = {
+    'author': ['author_profile'],
+    'tall_thumbnail': ['tall_thumbnail'],
+    'wide_thumbnail': ['wide_thumbnail'],
+    'page_header_image': ['page_header_image'],
+}
+FEED_PREFETCH_RELATED = {
+    'article_types': ['article_types'],
+    'locations': ['locations'],
+    'sectors': ['sectors'],
+}
+
+
+def _model_has_field(model, name):
+    try:
+        model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return False
+    return True
+
+
+class FeedAPIViewSet(BaseAPIViewSet):
+    """
+    /api/v2/feed/ - one date-ordered stream of articles, blog posts and key facts
+    (the same mix as the /news/ page).
+
+    Filters: ?type=blog.ArticlePage,blog.KeyFactsPage, ?article_type=,
+    ?location=, ?sector= (id or name, sector also accepts its slug),
+    ?date_from= / ?date_to= (YYYY-MM-DD). Sparse fieldsets with ?fields=.
+    Paginated with ?cursor=<next_cursor> and ?limit=.
+    """
+    model = Page
+
+    known_query_parameters = frozenset([
+        'limit',
+        'cursor',
+        'fields',
+        'type',
+        'article_type',
+        'location',
+        'sector',
+        'date_from',
+        'date_to',
+        # Used by jQuery for cache-busting / required by BrowsableAPIRenderer
+        '_',
+        'format',
+    ])
+
+    def listing_view(self, request):
+        unknown = set(request.GET.keys()) - self.known_query_parameters
+        if unknown:
+            raise BadRequestError(
+                "query parameter is not an operation or a recognised field: %s"
+                % ", ".join(sorted(unknown))
+            )
+
+        fields = self.get_feed_fields(request)
+        models = self.get_feed_models(request)
+        limit = _get_limit(request)
+
+        # 1) One UNION query selecting the ids of the next page across all types
+        index = [self.get_index_queryset(model, request) for model in models]
+        index = index[0].union(*index[1:], all=True) if len(index) > 1 else index[0]
+        rows = list(index.order_by('-sort_date', '-id')[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        # 2) One query per content type (plus prefetches) to load the pages
+        ids_by_model = {}
+        for row in rows:
+            model = ContentType.objects.get_for_id(row['content_type_id']).model_class()
+            ids_by_model.setdefault(model, []).append(row['id'])
+
+        pages = {}
+        for model, ids in ids_by_model.items():
+            for page in self.get_page_queryset(model, fields).filter(id__in=ids):
+                pages[page.pk] = page
+
+        # 3) One query for the renditions of every image in the response
+        self.api_renditions = load_api_renditions(
+            getattr(page, name, None)
+            for page in pages.values()
+            for name in ('tall_thumbnail', 'wide_thumbnail', 'page_header_image', 'header_image')
+            if name in fields or (name == 'header_image' and 'page_header_image' in fields)
+        )
+
+        items = [self.serialize_page(pages[row['id']], fields) for row in rows if row['id'] in pages]
+
+        next_cursor = None
+        if has_more and rows:
+            next_cursor = encode_cursor([rows[-1]['sort_date'], rows[-1]['id']])
+
+        return Response({
+            'meta': {
+                'has_more': has_more,
+                'next_cursor': next_cursor,
+            },
+            'items': items,
+        })
+
+    def get_feed_fields(self, request):
+        available = FEED_META_FIELDS + FEED_BODY_FIELDS
+        fields = set(FEED_DEFAULT_FIELDS)
+        if 'fields' not in request.GET:
+            return fields
+
+        try:
+            fields_config = parse_fields_parameter(request.GET['fields'])
+        except ValueError as e:
+            raise BadRequestError("fields error: %s" % str(e)) from e
+
+        if fields_config and fields_config[0][0] == '*':
+            fields = set(available)
+            fields_config = fields_config[1:]
+        elif fields_config and fields_config[0][0] == '_':
+            fields = set()
+            fields_config = fields_config[1:]
+
+        for field_name, negated, sub_fields in fields_config:
+            if field_name not in available:
+                raise BadRequestError("unknown fields: %s" % field_name)
+            if sub_fields:
+                raise BadRequestError("'%s' does not support nested fields" % field_name)
+            if negated:
+                fields.discard(field_name)
+            else:
+                fields.add(field_name)
+        return fields
+
+    def get_feed_models(self, request):
+        models = list(FEED_MODELS.values())
+        if request.GET.get('type'):
+            try:
+                models = [FEED_MODELS[name] for name in request.GET['type'].split(',')]
+            except KeyError as e:
+                raise BadRequestError(
+                    "type must be one of: %s" % ", ".join(FEED_MODELS)
+                ) from e
+
+        # Key facts are not tagged with locations or sectors
+        if request.GET.get('location') or request.GET.get('sector'):
+            models = [model for model in models if _model_has_field(model, 'locations')]
+        if not models:
+            raise BadRequestError("no content types match the given filters")
+        return models
+
+    def get_index_queryset(self, model, request):
+        queryset = model.objects.live().annotate(
+            # Key facts may have no post date; fall back to the publish date
+            sort_date=Coalesce('date', TruncDate('first_published_at'), output_field=DateField()),
+        )
+
+        for param, relation in (('article_type', 'article_types'),
+                                ('location', 'locations'),
+                                ('sector', 'sectors')):
+            value = request.GET.get(param, '').strip()
+            if not value:
+                continue
+            if value.isdigit():
+                queryset = queryset.filter(**{f'{relation}__id': int(value)})
+            elif relation == 'sectors':
+                queryset = queryset.filter(Q(sectors__slug=value) | Q(sectors__name__iexact=value))
+            else:
+                queryset = queryset.filter(**{f'{relation}__name__iexact': value})
+
+        for param, lookup in (('date_from', 'sort_date__gte'), ('date_to', 'sort_date__lte')):
+            if request.GET.get(param):
+                value = parse_date(request.GET[param])
+                if value is None:
+                    raise BadRequestError(f"{param} must be a date (YYYY-MM-DD)")
+                queryset = queryset.filter(**{lookup: value})
+
+        if request.GET.get('cursor'):
+            position = decode_cursor(request.GET['cursor'], 2)
+            queryset = queryset.filter(keyset_filter(['sort_date', 'id'], position, descending=True))
+
+        return queryset.order_by().values('id', 'sort_date', 'content_type_id')
+
+    def get_page_queryset(self, model, fields):
+        select_related = []
+        prefetch_related = []
+        for field in fields:
+            for name in FEED_SELECT_RELATED.get(field, []):
+                if _model_has_field(model, name):
+                    select_related.append(name)
+            for name in FEED_PREFETCH_RELATED.get(field, []):
+                if _model_has_field(model, name):
+                    prefetch_related.append(name)
+        if 'page_header_image' in fields and _model_has_field(model, 'header_image'):
+            select_related.append('header_image')
+
+        return model.objects.select_related(*select_related).prefetch_related(*prefetch_related)
+
+    def serialize_page(self, page, fields):
+        request = self.request
+        meta = {}
+        if 'type' in fields:
+            meta['type'] = page._meta.label
+        if 'detail_url' in fields:
+            meta['detail_url'] = get_object_detail_url(
+                request.wagtailapi_router, request, type(page), page.pk
+            )
+        if 'html_url' in fields:
+            meta['html_url'] = page.get_full_url(request=request)
+        if 'slug' in fields:
+            meta['slug'] = page.slug
+        if 'first_published_at' in fields:
+            meta['first_published_at'] = page.first_published_at
+        if 'last_published_at' in fields:
+            meta['last_published_at'] = page.last_published_at
+
+        data = {'id': page.pk, 'meta': meta}
+        for field in FEED_BODY_FIELDS:
+            if field in fields:
+                data[field] = self.serialize_field(page, field)
+        return data
+
+    def serialize_field(self, page, field):
+        if field == 'author':
+            author = getattr(page, 'author_profile', None)
+            if author:
+                return {'id': author.pk, 'name': author.name}
+            legacy_name = getattr(page, 'author', '')
+            return {'id': None, 'name': legacy_name} if legacy_name else None
+
+        if field in FEED_PREFETCH_RELATED:
+            if not _model_has_field(type(page), field):
+                return []
+            return [
+                {'id': obj.pk, 'meta': {'type': obj._meta.label}, 'name': obj.name}
+                for obj in getattr(page, field).all()
+            ]
+
+        if field in FEED_SELECT_RELATED:
+            image = getattr(page, field, None)
+            if image is None and field == 'page_header_image':
+                image = getattr(page, 'header_image', None)
+            return self.serialize_image(image)
+
+        return getattr(page, field, None)
+
+    def serialize_image(self, image):
+        if image is None:
+            return None
+        return {
+            'id': image.pk,
+            'meta': {
+                'type': image._meta.label,
+                'detail_url': get_object_detail_url(
+                    self.request.wagtailapi_router, self.request, get_image_model(), image.pk
+                ),
+                'download_url': get_full_url(self.request, image.file.url),
+            },
+            'title': image.title,
+            'renditions': rendition_urls(image, self.api_renditions, self.request),
+        }
+
+    @classmethod
+    def get_urlpatterns(cls):
+        return [
+            path('', cls.as_view({'get': 'listing_view'}), name='listing'),
+        ]
+
 
 # Register the custom endpoint
 api_router.register_endpoint('blog', BlogPagesAPIViewSet)
@@ -87,4 +634,7 @@ api_router.register_endpoint('blog', BlogPagesAPIViewSet)
 # Add the standard endpoints
 api_router.register_endpoint('pages', PagesAPIViewSet)
 api_router.register_endpoint('images', ImagesAPIViewSet)
-api_router.register_endpoint('documents', DocumentsAPIViewSet)
\ No newline at end of file
+api_router.register_endpoint('documents', DocumentsAPIViewSet)
+
+# Registered after 'pages' so detail_url links keep pointing at the pages endpoint
+api_router.register_endpoint('feed', FeedAPIViewSet)
\ No newline at end of file
@@ -0,0 +1,158 @@
+# blog/bulk.py
+"""
+Bulk editorial actions for news articles (ArticlePage).
+
+A batch runs in one transaction. Every page gets at most one new
+revision, published straight away unless the page has a pending draft,
+which the change is added to instead. The cache invalidation queued by
+the page signals is coalesced (blog.cache.coalesce_invalidation), so the
+content version, API snapshots and so on are refreshed once per batch
+rather than once per page.
+
+Actions are strings, as posted by the news dashboard form:
+
+    set:<flag> / unset:<flag>               featured, editors_pick, cover_story
+    add:<taxonomy>:<id> / remove:<taxonomy>:<id>
+                                            article_types, locations, sectors
+    publish / unpublish
+"""
+from dataclasses import dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .cache import coalesce_invalidation
+from .models import ArticlePage, ArticleType, Location, Sector
+
+BULK_FLAGS = {
+    "featured": "Featured",
+    "editors_pick": "Editor's pick",
+    "cover_story": "Cover story",
+}
+BULK_TAXONOMIES = {
+    "article_types": ArticleType,
+    "locations": Location,
+    "sectors": Sector,
+}
+
+
+class BulkActionError(ValueError):
+    pass
+
+
+@dataclass
+class BulkResult:
+    updated: list = field(default_factory=list)
+    unchanged: list = field(default_factory=list)
+    # (page, reason)
+    skipped: list = field(default_factory=list)
+
+
+# ----------------------------
+# Changes
+# ----------------------------
+def _set_flag(name, value):
+    def change(page):
+        if getattr(page, name) == value:
+            return False
+        setattr(page, name, value)
+        return True
+    return change
+
+
+def _relate(name, instance, add):
+    def change(page):
+        manager = getattr(page, name)
+        present = instance.pk in {related.pk for related in manager.all()}
+        if present == add:
+            return False
+        if add:
+            manager.add(instance)
+        else:
+            manager.remove(instance)
+        return True
+    return change
+
+
+def parse_action(action):
+    """The kind ("publish", "unpublish" or "change") and, for changes, a change(page) function."""
+    if action in ("publish", "unpublish"):
+        return action, None
+
+    verb, _sep, target = (action or "").partition(":")
+    if verb in ("set", "unset") and target in BULK_FLAGS:
+        return "change", _set_flag(target, verb == "set")
+
+    name, _sep, pk = target.partition(":")
+    if verb in ("add", "remove") and name in BULK_TAXONOMIES and pk.isdigit():
+        instance = BULK_TAXONOMIES[name].objects.filter(pk=pk).first()
+        if instance is None:
+            raise BulkActionError(f"No such {name} item: {pk}")
+        return "change", _relate(name, instance, verb == "add")
+
+    raise BulkActionError(f"Unknown bulk action: {action!r}")
+
+
+# ----------------------------
+# Applying
+# ----------------------------
+def _publish(page, user):
+    if page.live and not page.has_unpublished_changes:
+        return False
+    revision = page.latest_revision or page.save_revision(user=user, log_action=True)
+    revision.publish(user=user)
+    return True
+
+
+def _unpublish(page, user):
+    if not page.live:
+        return False
+    page.unpublish(user=user)
+    return True
+
+
+def _change(page, change, user):
+    # Edit the latest draft, not the live version, so pending changes survive
+    draft = page.latest_revision.as_object() if page.latest_revision else page
+    if not change(draft):
+        return False
+    publish = page.live and not page.has_unpublished_changes
+    revision = draft.save_revision(user=user, log_action=True)
+    if publish:
+        revision.publish(user=user)
+    return True
+
+
+def apply_bulk_action(page_ids, action, user):
+    """
+    Apply `action` to the ArticlePages with these ids, as `user`.
+
+    Pages the user may not publish, or whose draft fails validation, are
+    skipped; an unknown action raises BulkActionError before anything runs.
+    """
+    kind, change = parse_action(action)
+    result = BulkResult()
+
+    with coalesce_invalidation(), transaction.atomic():
+        pages = (
+            ArticlePage.objects.filter(pk__in=page_ids)
+            .select_related("latest_revision")
+            .order_by("pk")
+        )
+        for page in pages:
+            if not page.permissions_for_user(user).can_publish():
+                result.skipped.append((page, "permission denied"))
+                continue
+            try:
+                if kind == "publish":
+                    updated = _publish(page, user)
+                elif kind == "unpublish":
+                    updated = _unpublish(page, user)
+                else:
+                    updated = _change(page, change, user)
+            except ValidationError as e:
+                result.skipped.append((page, "; ".join(e.messages)))
+                continue
+            (result.updated if updated else result.unchanged).append(page)
+
+    return result
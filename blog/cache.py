@@ -0,0 +1,80 @@
+# blog/cache.py
+"""
+Publish-driven cache versioning.
+
+Cached public output (feeds, sitemaps, rendered bodies...) is keyed by the
+current content version, which is bumped whenever a page is published,
+unpublished or deleted (see blog/signals.py). Old entries are never
+deleted explicitly; they simply stop being read and expire.
+
+The version is a timestamp rather than a counter, so it never goes
+backwards, even if the cache is cleared or evicts the key.
+
+Signal handlers queue their invalidation with on_commit_once(). Inside a
+coalesce_invalidation() block (bulk edits) each distinct invalidation is
+queued only once however many pages trigger it.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.db import transaction
+
+CONTENT_VERSION_KEY = "blog:content-version"
+
+
+def get_content_version():
+    version = cache.get(CONTENT_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        # Another process may have set it first; use whatever won
+        cache.add(CONTENT_VERSION_KEY, version, None)
+        version = cache.get(CONTENT_VERSION_KEY, version)
+    return version
+
+
+def bump_content_version():
+    version = time.time_ns()
+    cache.set(CONTENT_VERSION_KEY, version, None)
+    return version
+
+
+def versioned_key(*parts):
+    """Build a cache key that is only valid for the current content version."""
+    return ":".join(["blog", str(get_content_version()), *map(str, parts)])
+
+
+# ----------------------------
+# Coalesced invalidation
+# ----------------------------
+_batch = threading.local()
+
+
+@contextmanager
+def coalesce_invalidation():
+    """
+    Collect the invalidation queued inside the block and queue each
+    distinct one once on leaving it. Nothing is queued if the block raises.
+    """
+    if getattr(_batch, "callbacks", None) is not None:
+        # Nested: the outermost block queues everything
+        yield
+        return
+    _batch.callbacks = {}
+    try:
+        yield
+        callbacks = list(_batch.callbacks.values())
+    finally:
+        _batch.callbacks = None
+    for callback in callbacks:
+        transaction.on_commit(callback)
+
+
+def on_commit_once(key, callback):
+    """transaction.on_commit(callback), once per `key` within coalesce_invalidation()."""
+    callbacks = getattr(_batch, "callbacks", None)
+    if callbacks is None:
+        transaction.on_commit(callback)
+    else:
+        callbacks.setdefault(key, callback)
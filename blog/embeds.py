@@ -0,0 +1,92 @@
+# blog/embeds.py
+"""
+Embed (oEmbed) warm-up.
+
+EmbedBlock looks its URL up in Wagtail's embeds table when it renders and
+only calls out to the provider on a miss, blocking that request. Embeds
+are therefore resolved ahead of time: for a page when it is published
+(warm_page_embeds_task) and for every live page with `manage.py
+warm_embeds`.
+
+Which provider is asked is configured by WAGTAILEMBEDS_FINDERS;
+blog.embed_finders.LocalEmbedFinder answers without network access.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+
+from wagtail.embeds.blocks import EmbedBlock
+from wagtail.embeds.embeds import get_embed
+from wagtail.embeds.exceptions import EmbedException
+from wagtail.models import get_page_models
+
+from .streamfield import stream_field_names, walk_stream
+
+logger = logging.getLogger(__name__)
+
+EMBED_WARM_WORKERS = 4
+
+
+def stream_embeds(stream_value):
+    """Yield (url, max_width, max_height) for every EmbedBlock in a StreamValue."""
+    for block, value in walk_stream(stream_value.stream_block, stream_value.raw_data):
+        if isinstance(block, EmbedBlock) and isinstance(value, str):
+            yield (
+                value,
+                getattr(block.meta, "max_width", None),
+                getattr(block.meta, "max_height", None),
+            )
+
+
+def page_embeds(page):
+    """Every embed in the StreamFields of one (specific) page."""
+    embeds = set()
+    for name in stream_field_names(type(page)):
+        embeds.update(stream_embeds(getattr(page, name)))
+    return embeds
+
+
+def live_page_embeds():
+    """Every embed across the StreamFields of all live pages, without duplicates."""
+    embeds = set()
+    for model in get_page_models():
+        names = stream_field_names(model)
+        if not names:
+            continue
+        pages = model.objects.live().exact_type(model).only("pk", *names)
+        for page in pages.iterator(chunk_size=500):
+            for name in names:
+                embeds.update(stream_embeds(getattr(page, name)))
+    return embeds
+
+
+def warm_embed(url, max_width=None, max_height=None):
+    """Make sure the embed is in the embeds table. Returns False if no provider has it."""
+    try:
+        get_embed(url, max_width, max_height)
+    except EmbedException:
+        logger.warning("No embed found for %s", url)
+        return False
+    return True
+
+
+def _warm_in_thread(embed):
+    try:
+        return warm_embed(*embed)
+    finally:
+        # Each worker thread has its own database connection
+        connection.close()
+
+
+def warm_embeds(embeds, workers=EMBED_WARM_WORKERS):
+    """
+    Resolve many embeds, at most `workers` provider calls at a time.
+
+    Returns {(url, max_width, max_height): resolved}.
+    """
+    embeds = sorted(embeds, key=lambda embed: tuple(str(part) for part in embed))
+    if workers <= 1:
+        return {embed: warm_embed(*embed) for embed in embeds}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(embeds, executor.map(_warm_in_thread, embeds)))
@@ -0,0 +1,225 @@
+# blog/feeds.py
+"""
+RSS 2.0, Atom and JSON Feed syndication for news, blog posts and key facts.
+
+Each feed is built from one bounded query, cached until the next publish
+(see blog/cache.py) and served with ETag/Last-Modified, so polling readers
+get 304s without touching the database.
+"""
+import hashlib
+import json
+from datetime import datetime, time
+
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import F, Max
+from django.http import Http404, HttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed, SyndicationFeed
+from django.views.decorators.http import condition
+
+from .cache import versioned_key
+from .models import ArticlePage, ArticleType, BlogPage, KeyFactsPage, PageTombstone
+
+
+FEED_ITEM_LIMIT = 30
+FEED_CACHE_TIMEOUT = 60 * 60 * 24
+FEED_MAX_AGE = 5 * 60
+
+FEED_SECTIONS = {
+    "news": {"model": ArticlePage, "title": "News", "link": "/news/"},
+    "blog": {"model": BlogPage, "title": "Blog", "link": "/news/"},
+    "key-facts": {"model": KeyFactsPage, "title": "Key facts", "link": "/news/"},
+}
+
+
+# ----------------------------
+# JSON Feed (https://jsonfeed.org/version/1.1)
+# ----------------------------
+class JSONFeed(SyndicationFeed):
+    content_type = "application/feed+json; charset=utf-8"
+
+    def write(self, outfile, encoding):
+        data = {
+            "version": "https://jsonfeed.org/version/1.1",
+            "title": self.feed["title"],
+            "home_page_url": self.feed["link"],
+            "feed_url": self.feed["feed_url"],
+            "description": self.feed["description"],
+            "language": self.feed["language"],
+            "items": [self.item_json(item) for item in self.items],
+        }
+        outfile.write(json.dumps(
+            {key: value for key, value in data.items() if value}, ensure_ascii=False
+        ))
+
+    def item_json(self, item):
+        data = {
+            "id": item["unique_id"] or item["link"],
+            "url": item["link"],
+            "title": item["title"],
+            "summary": item["description"],
+            "date_published": item["pubdate"].isoformat() if item["pubdate"] else None,
+            "date_modified": item["updateddate"].isoformat() if item["updateddate"] else None,
+            "authors": [{"name": item["author_name"]}] if item["author_name"] else None,
+            "tags": list(item["categories"]) or None,
+        }
+        return {key: value for key, value in data.items() if value}
+
+
+FEED_FORMATS = {
+    "rss": Rss201rev2Feed,
+    "atom": Atom1Feed,
+    "json": JSONFeed,
+}
+
+
+# ----------------------------
+# Feed definition
+# ----------------------------
+class SectionFeed(Feed):
+    """
+    The latest live pages of one section, optionally limited to one ArticleType.
+
+    A new instance is made per request, so the request can be kept on it for
+    building absolute page URLs.
+    """
+
+    def __init__(self, section, feed_type, article_type=None):
+        super().__init__()
+        self.section = FEED_SECTIONS[section]
+        self.section_name = section
+        self.feed_type = feed_type
+        self.article_type = article_type
+        self.request = None
+        self.last_modified = None
+
+    def __call__(self, request, *args, **kwargs):
+        self.request = request
+        return super().__call__(request, *args, **kwargs)
+
+    def title(self):
+        if self.article_type:
+            return f"Cash Matters: {self.section['title']} ({self.article_type.name})"
+        return f"Cash Matters: {self.section['title']}"
+
+    def link(self):
+        return self.section["link"]
+
+    def description(self):
+        return f"The latest {self.section['title'].lower()} from Cash Matters"
+
+    def items(self):
+        model = self.section["model"]
+        queryset = model.objects.live().public().prefetch_related("article_types")
+        if hasattr(model, "author_profile"):
+            queryset = queryset.select_related("author_profile")
+        if self.article_type:
+            queryset = queryset.filter(article_types=self.article_type)
+        return queryset.order_by(
+            F("date").desc(nulls_last=True), "-first_published_at"
+        )[:FEED_ITEM_LIMIT]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.intro
+
+    def item_link(self, item):
+        return item.get_url(self.request)
+
+    def item_guid(self, item):
+        return f"cashmatters-page-{item.pk}"
+
+    def item_guid_is_permalink(self, item):
+        return False
+
+    def item_pubdate(self, item):
+        if item.date:
+            return timezone.make_aware(datetime.combine(item.date, time.min))
+        return item.first_published_at
+
+    def item_updateddate(self, item):
+        if item.last_published_at and (
+            self.last_modified is None or item.last_published_at > self.last_modified
+        ):
+            self.last_modified = item.last_published_at
+        return item.last_published_at
+
+    def item_author_name(self, item):
+        author_profile = getattr(item, "author_profile", None)
+        if author_profile:
+            return author_profile.name
+        return getattr(item, "author", "") or None
+
+    def item_categories(self, item):
+        return [article_type.name for article_type in item.article_types.all()]
+
+
+# ----------------------------
+# Cached view with conditional GET
+# ----------------------------
+def _get_article_type(value):
+    if not value:
+        return None
+    queryset = ArticleType.objects.all()
+    article_type = (
+        queryset.filter(pk=value).first() if value.isdigit()
+        else queryset.filter(name__iexact=value).first()
+    )
+    if article_type is None:
+        raise Http404("Unknown article type")
+    return article_type
+
+
+def get_feed_payload(request, section, fmt):
+    """Return the cached feed body and its validators, building it if needed."""
+    if hasattr(request, "_blog_feed_payload"):
+        return request._blog_feed_payload
+
+    if section not in FEED_SECTIONS or fmt not in FEED_FORMATS:
+        raise Http404("Unknown feed")
+
+    type_param = request.GET.get("type", "").strip().lower()[:100]
+    key = versioned_key("feed", section, fmt, hashlib.sha1(type_param.encode()).hexdigest())
+    payload = cache.get(key)
+
+    if payload is None:
+        feed = SectionFeed(section, FEED_FORMATS[fmt], _get_article_type(type_param))
+        response = feed(request)
+
+        # Removing a page changes the feed too, not only publishing one
+        removed_at = PageTombstone.objects.filter(
+            content_type=ContentType.objects.get_for_model(feed.section["model"]),
+        ).aggregate(latest=Max("removed_at"))["latest"]
+        last_modified = max(filter(None, [feed.last_modified, removed_at]), default=None)
+
+        payload = {
+            "body": response.content,
+            "content_type": response["Content-Type"],
+            "etag": hashlib.sha1(response.content).hexdigest(),
+            "last_modified": last_modified,
+        }
+        cache.set(key, payload, FEED_CACHE_TIMEOUT)
+
+    request._blog_feed_payload = payload
+    return payload
+
+
+def _feed_etag(request, section, fmt):
+    return get_feed_payload(request, section, fmt)["etag"]
+
+
+def _feed_last_modified(request, section, fmt):
+    return get_feed_payload(request, section, fmt)["last_modified"]
+
+
+@condition(etag_func=_feed_etag, last_modified_func=_feed_last_modified)
+def feed_view(request, section, fmt):
+    payload = get_feed_payload(request, section, fmt)
+    response = HttpResponse(payload["body"], content_type=payload["content_type"])
+    patch_cache_control(response, public=True, max_age=FEED_MAX_AGE)
+    return response
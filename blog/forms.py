@@ -1,7 +1,7 @@
 from django import forms
 from .models import BlogPage
 import json
-from django.utils.safestring import mark_safe
+from .legacy_blocks import render_editor_blocks
 
 
 class ContentBlockWidget(forms.Widget):
@@ -15,114 +15,7 @@ class ContentBlockWidget(forms.Widget):
                 value = json.loads(value)
             except (json.JSONDecodeError, TypeError):
                 value = []
-        
-        html = '<div id="content-blocks" class="content-blocks-container">'
-        html += '<div class="content-blocks-toolbar">'
-        html += '<button type="button" class="add-block-btn" '
-        html += 'data-block-type="content">📝 Content</button>'
-        html += '<button type="button" class="add-block-btn" '
-        html += 'data-block-type="image_caption">🖼️ Image & Caption</button>'
-        html += '<button type="button" class="add-block-btn" '
-        html += 'data-block-type="video_caption">🎥 Video & Caption</button>'
-        html += '<button type="button" class="add-block-btn" '
-        html += 'data-block-type="iframe_caption">🔗 Iframe & Caption</button>'
-        html += '<button type="button" class="add-block-btn" '
-        html += 'data-block-type="blockquote">💬 Blockquote</button>'
-        html += '<button type="button" class="add-block-btn" '
-        html += 'data-block-type="data_table">📊 Data Table</button>'
-        html += '<button type="button" class="add-block-btn" '
-        html += 'data-block-type="poll">📊 Poll</button>'
-        html += '<button type="button" class="add-block-btn" '
-        html += 'data-block-type="facts_carousel">🎠 Facts Carousel</button>'
-        html += '<button type="button" class="add-block-btn" '
-        html += 'data-block-type="key_fact_image">🔑 Key Fact Image</button>'
-        html += '</div>'
-        html += '<div class="content-blocks-list">'
-        
-        for i, block in enumerate(value):
-            html += self.render_block(block, i, name)
-        
-        html += '</div>'
-        html += '<input type="hidden" name="{}" id="id_{}" '.format(name, name)
-        html += 'value=\'{}\'>'.format(json.dumps(value))
-        html += '</div>'
-        return mark_safe(html)
-    
-    def render_block(self, block, index, field_name):
-        block_type = block.get('type', 'content')
-        html = '<div class="content-block" data-block-type="{}" '.format(
-            block_type)
-        html += 'data-block-index="{}">'.format(index)
-        html += '<div class="block-header">'
-        html += '<span class="block-type">{}</span>'.format(
-            block_type.replace("_", " ").title())
-        html += '<button type="button" class="remove-block-btn">✕</button>'
-        html += '</div>'
-        html += '<div class="block-content">'
-        
-        if block_type == 'content':
-            html += '<textarea name="block_{}_content" '.format(index)
-            html += 'placeholder="Enter your content here..." rows="6">'
-            html += '{}</textarea>'.format(block.get("content", ""))
-        elif block_type == 'image_caption':
-            html += '<div class="image-upload-group">'
-            html += '<input type="file" name="block_{}_image" '.format(index)
-            html += 'accept="image/*">'
-            html += '<input type="text" name="block_{}_caption" '.format(index)
-            html += 'placeholder="Image caption" value="{}">'.format(
-                block.get("caption", ""))
-            html += '</div>'
-        elif block_type == 'video_caption':
-            html += '<div class="video-upload-group">'
-            html += '<input type="file" name="block_{}_video" '.format(index)
-            html += 'accept="video/*">'
-            html += '<input type="text" name="block_{}_caption" '.format(index)
-            html += 'placeholder="Video caption" value="{}">'.format(
-                block.get("caption", ""))
-            html += '</div>'
-        elif block_type == 'iframe_caption':
-            html += '<div class="iframe-group">'
-            html += '<input type="url" name="block_{}_url" '.format(index)
-            html += 'placeholder="Iframe URL" value="{}">'.format(
-                block.get("url", ""))
-            html += '<input type="text" name="block_{}_caption" '.format(index)
-            html += 'placeholder="Iframe caption" value="{}">'.format(
-                block.get("caption", ""))
-            html += '</div>'
-        elif block_type == 'blockquote':
-            html += '<textarea name="block_{}_quote" '.format(index)
-            html += 'placeholder="Enter blockquote text..." rows="4">'
-            html += '{}</textarea>'.format(block.get("quote", ""))
-            html += '<input type="text" name="block_{}_author" '.format(index)
-            html += 'placeholder="Author (optional)" value="{}">'.format(
-                block.get("author", ""))
-        elif block_type == 'data_table':
-            html += '<textarea name="block_{}_table_data" '.format(index)
-            html += 'placeholder="Enter table data..." rows="8">'
-            html += '{}</textarea>'.format(block.get("table_data", ""))
-        elif block_type == 'poll':
-            html += '<input type="text" name="block_{}_question"'.format(
-                index)
-            html += ' placeholder="Poll question" value="{}">'.format(
-                block.get("question", ""))
-            html += '<textarea name="block_{}_options" '.format(index)
-            html += 'placeholder="Poll options (one per line)" rows="4">'
-            html += '{}</textarea>'.format(block.get("options", ""))
-        elif block_type == 'facts_carousel':
-            html += '<textarea name="block_{}_facts" '.format(index)
-            html += 'placeholder="Enter facts as JSON array..." rows="6">'
-            html += '{}</textarea>'.format(block.get("facts", ""))
-        elif block_type == 'key_fact_image':
-            html += '<div class="key-fact-group">'
-            html += '<input type="text" name="block_{}_fact" '.format(index)
-            html += 'placeholder="Key fact text" value="{}">'.format(
-                block.get("fact", ""))
-            html += '<input type="file" name="block_{}_image" '.format(index)
-            html += 'accept="image/*">'
-            html += '</div>'
-        
-        html += '</div></div>'
-        return html
+        return render_editor_blocks(value, name)
 
 
 class ContentBlockField(forms.Field):
@@ -0,0 +1,247 @@
+# blog/legacy_blocks.py
+"""
+HTML for the legacy JSON content blocks of the frontend blog form.
+
+Blocks are plain dicts such as {"type": "blockquote", "quote": "...",
+"author": "..."}. Two renderers share one approach: every piece of output
+is appended to a single list, user content is escaped exactly once on the
+way in, and the list is joined at the end. Rendering is therefore linear
+in the size of the document. render_blocks() produces the public HTML
+and render_editor_blocks() the editing form for ContentBlockWidget.
+"""
+import json
+from urllib.parse import urlsplit
+
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+# (type, toolbar label), in toolbar order
+LEGACY_BLOCK_TYPES = [
+    ("content", "📝 Content"),
+    ("image_caption", "🖼️ Image & Caption"),
+    ("video_caption", "🎥 Video & Caption"),
+    ("iframe_caption", "🔗 Iframe & Caption"),
+    ("blockquote", "💬 Blockquote"),
+    ("data_table", "📊 Data Table"),
+    ("poll", "📊 Poll"),
+    ("facts_carousel", "🎠 Facts Carousel"),
+    ("key_fact_image", "🔑 Key Fact Image"),
+]
+
+
+def _text(block, key):
+    value = block.get(key)
+    return str(value).strip() if value is not None else ""
+
+
+def _safe_url(url):
+    """Only http(s) URLs may end up in an iframe src."""
+    return url if urlsplit(url).scheme in ("http", "https") else ""
+
+
+# ----------------------------
+# Public HTML
+# ----------------------------
+def _content(out, block):
+    content = _text(block, "content")
+    if content:
+        out += ("<p>", escape(content), "</p>")
+
+
+def _image_caption(out, block):
+    caption = escape(_text(block, "caption"))
+    if caption:
+        out += ('<figure><img src="#" alt="', caption, '"><figcaption>', caption, "</figcaption></figure>")
+
+
+def _video_caption(out, block):
+    caption = _text(block, "caption")
+    if caption:
+        out += (
+            '<figure><video controls><source src="#" type="video/mp4"></video><figcaption>',
+            escape(caption), "</figcaption></figure>",
+        )
+
+
+def _iframe_caption(out, block):
+    url = _safe_url(_text(block, "url"))
+    if not url:
+        return
+    caption = _text(block, "caption")
+    if caption:
+        out.append("<figure>")
+    out += ('<iframe src="', escape(url), '" width="100%" height="400" frameborder="0"></iframe>')
+    if caption:
+        out += ("<figcaption>", escape(caption), "</figcaption></figure>")
+
+
+def _blockquote(out, block):
+    quote = _text(block, "quote")
+    if not quote:
+        return
+    out += ("<blockquote><p>", escape(quote), "</p>")
+    author = _text(block, "author")
+    if author:
+        out += ("<cite>— ", escape(author), "</cite>")
+    out.append("</blockquote>")
+
+
+def _data_table(out, block):
+    table_data = _text(block, "table_data")
+    rows = [line.split(",") for line in table_data.split("\n") if line.strip()]
+    if not rows:
+        return
+    out.append("<table><tbody>")
+    for row in rows:
+        out.append("<tr>")
+        for cell in row:
+            out += ("<td>", escape(cell.strip()), "</td>")
+        out.append("</tr>")
+    out.append("</tbody></table>")
+
+
+def _poll(out, block):
+    question = _text(block, "question")
+    if not question:
+        return
+    out += ('<div class="poll"><h3>', escape(question), "</h3>")
+    options = [option.strip() for option in _text(block, "options").split("\n") if option.strip()]
+    if options:
+        out.append("<ul>")
+        for option in options:
+            out += ("<li>", escape(option), "</li>")
+        out.append("</ul>")
+    out.append("</div>")
+
+
+def _facts_carousel(out, block):
+    facts = _text(block, "facts")
+    if not facts:
+        return
+    try:
+        facts_list = json.loads(facts)
+    except (json.JSONDecodeError, TypeError):
+        out += ("<pre>", escape(facts), "</pre>")
+        return
+    if not isinstance(facts_list, list):
+        return
+    out.append('<div class="facts-carousel">')
+    for fact in facts_list:
+        out += ('<div class="fact-item">', escape(fact), "</div>")
+    out.append("</div>")
+
+
+def _key_fact_image(out, block):
+    fact = _text(block, "fact")
+    if fact:
+        out += ('<div class="key-fact"><img src="#" alt="Key fact"><p>', escape(fact), "</p></div>")
+
+
+BLOCK_RENDERERS = {
+    "content": _content,
+    "image_caption": _image_caption,
+    "video_caption": _video_caption,
+    "iframe_caption": _iframe_caption,
+    "blockquote": _blockquote,
+    "data_table": _data_table,
+    "poll": _poll,
+    "facts_carousel": _facts_carousel,
+    "key_fact_image": _key_fact_image,
+}
+
+
+def render_blocks(blocks):
+    """Public HTML for a list of legacy blocks; unknown and empty blocks are skipped."""
+    parts = []
+    for block in blocks:
+        renderer = BLOCK_RENDERERS.get(block.get("type"))
+        if renderer is None:
+            continue
+        out = []
+        renderer(out, block)
+        if out:
+            parts.append("".join(out))
+    return mark_safe("\n".join(parts))
+
+
+# ----------------------------
+# Editor form
+# ----------------------------
+def _textarea(out, index, key, placeholder, rows, block):
+    out += (
+        f'<textarea name="block_{index}_{key}" placeholder="{placeholder}" rows="{rows}">',
+        escape(_text(block, key)), "</textarea>",
+    )
+
+
+def _input(out, index, key, placeholder, block, input_type="text"):
+    out += (
+        f'<input type="{input_type}" name="block_{index}_{key}" placeholder="{placeholder}" value="',
+        escape(_text(block, key)), '">',
+    )
+
+
+def _file(out, index, key, accept):
+    out.append(f'<input type="file" name="block_{index}_{key}" accept="{accept}">')
+
+
+def _editor_fields(out, block_type, index, block):
+    if block_type == "content":
+        _textarea(out, index, "content", "Enter your content here...", 6, block)
+    elif block_type == "image_caption":
+        out.append('<div class="image-upload-group">')
+        _file(out, index, "image", "image/*")
+        _input(out, index, "caption", "Image caption", block)
+        out.append("</div>")
+    elif block_type == "video_caption":
+        out.append('<div class="video-upload-group">')
+        _file(out, index, "video", "video/*")
+        _input(out, index, "caption", "Video caption", block)
+        out.append("</div>")
+    elif block_type == "iframe_caption":
+        out.append('<div class="iframe-group">')
+        _input(out, index, "url", "Iframe URL", block, input_type="url")
+        _input(out, index, "caption", "Iframe caption", block)
+        out.append("</div>")
+    elif block_type == "blockquote":
+        _textarea(out, index, "quote", "Enter blockquote text...", 4, block)
+        _input(out, index, "author", "Author (optional)", block)
+    elif block_type == "data_table":
+        _textarea(out, index, "table_data", "Enter table data...", 8, block)
+    elif block_type == "poll":
+        _input(out, index, "question", "Poll question", block)
+        _textarea(out, index, "options", "Poll options (one per line)", 4, block)
+    elif block_type == "facts_carousel":
+        _textarea(out, index, "facts", "Enter facts as JSON array...", 6, block)
+    elif block_type == "key_fact_image":
+        out.append('<div class="key-fact-group">')
+        _input(out, index, "fact", "Key fact text", block)
+        _file(out, index, "image", "image/*")
+        out.append("</div>")
+
+
+def render_editor_block(out, block, index):
+    block_type = str(block.get("type") or "content")
+    out += (
+        '<div class="content-block" data-block-type="', escape(block_type),
+        '" data-block-index="', str(index), '"><div class="block-header"><span class="block-type">',
+        escape(block_type.replace("_", " ").title()),
+        '</span><button type="button" class="remove-block-btn">✕</button></div><div class="block-content">',
+    )
+    _editor_fields(out, block_type, index, block)
+    out.append("</div></div>")
+
+
+def render_editor_blocks(blocks, name):
+    """The ContentBlockWidget editor: toolbar, one form per block and the JSON input."""
+    out = ['<div id="content-blocks" class="content-blocks-container"><div class="content-blocks-toolbar">']
+    for block_type, label in LEGACY_BLOCK_TYPES:
+        out += ('<button type="button" class="add-block-btn" data-block-type="', block_type, '">', label, "</button>")
+    out.append('</div><div class="content-blocks-list">')
+    for index, block in enumerate(blocks):
+        render_editor_block(out, block, index)
+    out += (
+        '</div><input type="hidden" name="', escape(name), '" id="id_', escape(name),
+        '" value="', escape(json.dumps(blocks)), '"></div>',
+    )
+    return mark_safe("".join(out))
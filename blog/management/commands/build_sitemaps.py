@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.sitemaps import build_sitemaps, get_sitemap_root
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild every sitemap shard and the sitemap index. Publishing keeps '
+        'them up to date incrementally; run this after deploys, imports or '
+        'page moves.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--root',
+            help='Output directory (defaults to BLOG_SITEMAP_ROOT)',
+        )
+
+    def handle(self, *args, **options):
+        root = options['root'] or get_sitemap_root()
+        if not root:
+            raise CommandError('Set BLOG_SITEMAP_ROOT or pass --root')
+
+        counts = build_sitemaps(root=root)
+        for name, count in counts.items():
+            self.stdout.write(f'{name}: {count} URLs')
+
+        self.stdout.write(self.style.SUCCESS(f'Wrote {len(counts)} sitemap shards to {root}'))
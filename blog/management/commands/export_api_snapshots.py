@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.snapshots import export_api_snapshots, get_snapshot_root
+
+
+class Command(BaseCommand):
+    help = 'Write pre-rendered JSON snapshots of the public API for nginx to serve'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--root',
+            help='Output directory (defaults to BLOG_API_SNAPSHOT_ROOT)',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rewrite snapshots even if their content has not changed',
+        )
+
+    def handle(self, *args, **options):
+        root = options['root'] or get_snapshot_root()
+        if not root:
+            raise CommandError('Set BLOG_API_SNAPSHOT_ROOT or pass --root')
+
+        results = export_api_snapshots(root=root, force=options['force'])
+        for name, result in results.items():
+            style = self.style.ERROR if result == 'failed' else self.style.SUCCESS
+            self.stdout.write(style(f'{name}: {result}'))
+
+        self.stdout.write(f'Snapshots written to {root}')
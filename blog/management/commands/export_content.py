@@ -0,0 +1,65 @@
+import gzip
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.exporter import EXPORT_CHUNK_SIZE, EXPORT_SECTIONS, JSONLWriter, XLSXWriter, export_content
+
+
+class Command(BaseCommand):
+    help = (
+        'Stream live pages and snippets (taxonomy included) to JSONL or XLSX, '
+        'reading a fixed-size chunk at a time so memory use stays bounded'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', '-o',
+            default='-',
+            help='Output file; .xlsx writes a workbook, anything else JSONL (default: stdout)',
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Gzip the JSONL output',
+        )
+        parser.add_argument(
+            '--only',
+            choices=sorted(EXPORT_SECTIONS),
+            action='append',
+            help='Export only this section (repeatable)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help=f'Rows read per query (default {EXPORT_CHUNK_SIZE})',
+        )
+
+    def handle(self, *args, **options):
+        output = options['output']
+        sections = options['only'] or list(EXPORT_SECTIONS)
+        chunk_size = max(1, options['chunk_size'])
+        xlsx = output.lower().endswith('.xlsx')
+        if xlsx and options['gzip']:
+            raise CommandError('XLSX files are already compressed; --gzip only applies to JSONL')
+        if xlsx:
+            counts = export_content(XLSXWriter(output), sections, chunk_size)
+        elif output == '-':
+            stream = gzip.open(sys.stdout.buffer, 'wt', encoding='utf-8') if options['gzip'] else self.stdout
+            counts = export_content(JSONLWriter(stream), sections, chunk_size)
+            if options['gzip']:
+                stream.close()
+        else:
+            if options['gzip'] and not output.endswith('.gz'):
+                output = f'{output}.gz'
+            opener = gzip.open if options['gzip'] else open
+            with opener(output, 'wt', encoding='utf-8') as stream:
+                counts = export_content(JSONLWriter(stream), sections, chunk_size)
+
+        # Keep stdout clean for the export itself
+        summary = self.stderr if output == '-' else self.stdout
+        for label, count in counts.items():
+            if count:
+                summary.write(f'{label}: {count}')
+        summary.write(self.style.SUCCESS(f'Exported {sum(counts.values())} rows to {output}'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.polls import flush_poll_votes
+
+
+class Command(BaseCommand):
+    help = 'Move buffered poll votes into PollChoice.votes (safe to run from cron)'
+
+    def handle(self, *args, **options):
+        moved = flush_poll_votes()
+        self.stdout.write(self.style.SUCCESS(f'Flushed {moved} poll votes'))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from blog.renditions import generate_api_renditions_for_ids, live_page_image_ids
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate any missing API image renditions for the images of every live '
+        'page. Publishing and image edits keep them up to date; run this once for '
+        'pages published before that, and after changing BLOG_API_IMAGE_RENDITIONS.'
+    )
+
+    def handle(self, *args, **options):
+        image_ids = live_page_image_ids()
+        self.stdout.write(f'Found {len(image_ids)} images on live pages')
+
+        generate_api_renditions_for_ids(image_ids)
+
+        self.stdout.write(self.style.SUCCESS(f'Generated renditions for {len(image_ids)} images'))
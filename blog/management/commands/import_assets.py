@@ -5,26 +5,32 @@ Usage:
     python manage.py import_assets                    # Scrape all assets
     python manage.py import_assets --dry-run          # Preview without downloading
     python manage.py import_assets --category=logos   # Import specific category
+    python manage.py import_assets --workers=16 --per-host=4   # Download concurrency
+    python manage.py import_assets --refresh          # Ignore the manifest and page cache of earlier runs
 """
 
 import os
 import re
 import json
+import random
 import tempfile
 import hashlib
+import shutil
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from html.parser import HTMLParser
 from pathlib import Path
 from urllib.parse import urljoin, urlparse, unquote, parse_qs
 
 import requests
+from requests.adapters import HTTPAdapter
 from django.core.management.base import BaseCommand
-from django.core.files.base import ContentFile
+from django.core.files.images import ImageFile
 from django.conf import settings
 
-try:
-    from bs4 import BeautifulSoup
-    BS4_AVAILABLE = True
-except ImportError:
-    BS4_AVAILABLE = False
+from blog.snapshots import atomic_write
 
 try:
     from wagtail.images.models import Image
@@ -34,6 +40,18 @@ except ImportError:
     WAGTAIL_AVAILABLE = False
 
 
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_json(path, data):
+    atomic_write(str(path), json.dumps(data, indent=2, sort_keys=True).encode(), time.time())
+
+
 class CMSClient:
     """Access the old CashMatters CMS API with authentication."""
 
@@ -110,6 +128,74 @@ class CMSClient:
         return images
 
 
+class AssetHTMLParser(HTMLParser):
+    """Collect CDN URLs from <img> tags and style attributes in a single pass."""
+
+    CDN_HOST = 'd3an988loexeh7.cloudfront.net'
+    STYLE_URL_RE = re.compile(r'url\([\'"]?([^\'"\)]+)[\'"]?\)')
+
+    def __init__(self):
+        super().__init__()
+        self.urls = set()
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'img':
+            src = attrs.get('src') or attrs.get('data-src') or ''
+            if self.CDN_HOST in src:
+                self.urls.add(src)
+        # Background images
+        if attrs.get('style'):
+            for url in self.STYLE_URL_RE.findall(attrs['style']):
+                if self.CDN_HOST in url:
+                    self.urls.add(url)
+
+
+class PageCache:
+    """
+    The validators and assets of each scraped page, saved as JSON next to
+    the manifest: {url: {"etag", "last_modified", "images", "videos"}}.
+
+    Requests for a cached page are conditional; a 304 reuses its assets
+    without downloading or parsing the page again.
+    """
+
+    FILENAME = 'pages.json'
+
+    def __init__(self, output_dir):
+        self.path = Path(output_dir) / self.FILENAME
+        self.entries = _read_json(self.path)
+
+    def get(self, url):
+        return self.entries.get(url)
+
+    def validators(self, url):
+        """Conditional request headers for `url`."""
+        entry = self.entries.get(url) or {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url, response, assets):
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not (etag or last_modified):
+            self.entries.pop(url, None)
+            return
+        self.entries[url] = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'images': sorted(assets['images']),
+            'videos': sorted(assets['videos']),
+        }
+
+    def save(self):
+        _write_json(self.path, self.entries)
+
+
 class AssetScraper:
     """Scrape assets from cashmatters.org and its CDN."""
 
@@ -150,9 +236,13 @@ class AssetScraper:
         {"id": "417517552", "title": "Cash Matters"},
     ]
 
-    def __init__(self, stdout, style):
+    CDN_URL_RE = re.compile(r'https?://d3an988loexeh7\.cloudfront\.net/media/[^\s\"\'\)>]+')
+    VIMEO_ID_RE = re.compile(r'vimeo\.com/(?:video/)?(\d+)')
+
+    def __init__(self, stdout, style, cache=None):
         self.stdout = stdout
         self.style = style
+        self.cache = cache
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
@@ -163,6 +253,8 @@ class AssetScraper:
         assets = {
             'images': set(),
             'videos': list(self.KNOWN_VIDEOS),
+            # Guessed URLs, probed before anything is downloaded
+            'candidates': [],
         }
 
         # Add known CDN assets first
@@ -175,8 +267,8 @@ class AssetScraper:
         for i in range(2100, 2150):  # Try a range of IDs
             for suffix in ['', '_g0hl7Ko', '_lbCK4fP', '_abc123']:
                 url = f"https://d3an988loexeh7.cloudfront.net/media/media/images/key-fact-{i}{suffix}.png"
-                # We'll validate these later during download
-                assets['images'].add(url)
+                if url not in assets['images']:
+                    assets['candidates'].append(url)
 
         for page_path in self.PAGES_TO_SCRAPE:
             url = urljoin(self.SITE_URL, page_path)
@@ -233,14 +325,18 @@ class AssetScraper:
         return None
 
     def scrape_page(self, url):
-        """Scrape a single page for CDN asset URLs."""
+        """Scrape a single page for CDN asset URLs, unless it hasn't changed since the last run."""
         assets = {
             'images': set(),
             'videos': [],
         }
 
+        cached = self.cache.get(url) if self.cache else None
         try:
-            response = self.session.get(url, timeout=30)
+            response = self.session.get(url, timeout=30, headers=self.cache.validators(url) if self.cache else {})
+            if response.status_code == 304 and cached:
+                self.stdout.write(f"  Not modified: {len(cached['images'])} images, {len(cached['videos'])} videos")
+                return {'images': set(cached['images']), 'videos': list(cached['videos'])}
             response.raise_for_status()
         except requests.RequestException as e:
             self.stdout.write(self.style.WARNING(f"  Failed to fetch {url}: {e}"))
@@ -249,37 +345,23 @@ class AssetScraper:
         html = response.text
 
         # Find all CDN image URLs using regex
-        cdn_pattern = r'https?://d3an988loexeh7\.cloudfront\.net/media/[^\s\"\'\)>]+'
-        cdn_urls = re.findall(cdn_pattern, html)
-
-        for url in cdn_urls:
+        for url_found in self.CDN_URL_RE.findall(html):
             # Clean up URL (remove trailing quotes, etc.)
-            url = url.rstrip('\"\')')
-            if self._is_image_url(url):
-                assets['images'].add(url)
+            url_found = url_found.rstrip('\"\')')
+            if self._is_image_url(url_found):
+                assets['images'].add(url_found)
 
         # Find Vimeo video IDs
-        vimeo_pattern = r'vimeo\.com/(?:video/)?(\d+)'
-        vimeo_ids = re.findall(vimeo_pattern, html)
-        assets['videos'].extend(set(vimeo_ids))
-
-        # Also parse with BeautifulSoup if available
-        if BS4_AVAILABLE:
-            soup = BeautifulSoup(html, 'html.parser')
-
-            # Find img tags
-            for img in soup.find_all('img'):
-                src = img.get('src', '') or img.get('data-src', '')
-                if 'd3an988loexeh7.cloudfront.net' in src:
-                    assets['images'].add(src)
-
-            # Find background images in style attributes
-            for elem in soup.find_all(style=True):
-                style = elem['style']
-                urls = re.findall(r'url\([\'"]?([^\'"\)]+)[\'"]?\)', style)
-                for url in urls:
-                    if 'd3an988loexeh7.cloudfront.net' in url:
-                        assets['images'].add(url)
+        assets['videos'].extend(set(self.VIMEO_ID_RE.findall(html)))
+
+        # One parse of the same text for <img> tags and style attributes
+        parser = AssetHTMLParser()
+        parser.feed(html)
+        parser.close()
+        assets['images'].update(parser.urls)
+
+        if self.cache is not None:
+            self.cache.store(url, response, assets)
 
         self.stdout.write(f"  Found {len(assets['images'])} images, {len(assets['videos'])} videos")
         return assets
@@ -292,40 +374,204 @@ class AssetScraper:
         return any(ext in path_lower for ext in image_extensions)
 
 
-class AssetDownloader:
-    """Download assets from URLs."""
+class AssetTooLarge(Exception):
+    pass
+
+
+class DownloadedAsset:
+    """A download streamed to a temp file, with the hashes computed on the way."""
+
+    def __init__(self, path, size, sha1, sha256):
+        self.path = path
+        self.size = size
+        self.sha1 = sha1
+        self.sha256 = sha256
+        self.temporary = True
 
-    def __init__(self, stdout, style, skip_failed=True):
+    def open(self):
+        return open(self.path, 'rb')
+
+    def move_to(self, path):
+        """Move the file into place; a rename when both are on the same filesystem."""
+        shutil.move(self.path, path)
+        self.path = path
+        self.temporary = False
+
+    def discard(self):
+        """Delete the temp file unless it was moved into place."""
+        if self.temporary and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class AssetDownloader:
+    """
+    Download assets from URLs, several at a time.
+
+    At most `workers` downloads run at once and at most `per_host` of them
+    against any one host. Each worker thread keeps its own keep-alive
+    session. Connection errors, 429 and 5xx responses are retried with
+    exponential backoff and full jitter. Content is streamed a chunk at a
+    time to a temp file in `temp_dir`, hashed on the way with SHA-1 (what
+    Wagtail stores in Image.file_hash) and SHA-256, and abandoned once it
+    exceeds `max_size` bytes.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+    MAX_SIZE = 50 * 1024 * 1024
+    DOWNLOAD_WORKERS = 8
+    PER_HOST_LIMIT = 4
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    # S3 behind CloudFront answers 403 for keys that don't exist
+    MISSING_STATUSES = {403, 404, 410}
+    USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+
+    def __init__(self, stdout, style, skip_failed=True, workers=DOWNLOAD_WORKERS,
+                 per_host=PER_HOST_LIMIT, max_retries=3, backoff=0.5, max_size=MAX_SIZE, temp_dir=None):
         self.stdout = stdout
         self.style = style
         self.skip_failed = skip_failed
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        })
-
-    def download(self, url, max_retries=2):
-        """Download a file from URL with retries."""
+        self.workers = max(1, workers)
+        self.per_host = max(1, per_host)
+        self.max_retries = max(1, max_retries)
+        self.backoff = backoff
+        self.max_size = max_size
+        self.temp_dir = temp_dir
+
+        self._local = threading.local()
+        self._sessions = []
+        self._lock = threading.Lock()
+        self._host_limits = defaultdict(lambda: threading.BoundedSemaphore(self.per_host))
+
+    @property
+    def session(self):
+        """This thread's session, created on first use."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({'User-Agent': self.USER_AGENT})
+            adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.per_host)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def host_limit(self, url):
+        with self._lock:
+            return self._host_limits[urlparse(url).netloc]
+
+    def close(self):
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+
+    def _sleep_before_retry(self, attempt):
+        time.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+
+    def _fetch(self, url):
+        """GET `url` within the host limit; returns (response, DownloadedAsset or None)."""
+        with self.host_limit(url):
+            with self.session.get(url, timeout=30, stream=True) as response:
+                if not response.ok:
+                    return response, None
+                length = response.headers.get('Content-Length', '')
+                if length.isdigit() and int(length) > self.max_size:
+                    raise AssetTooLarge(f'{length} bytes')
+                return response, self._save_to_temp_file(response, url)
+
+    def _save_to_temp_file(self, response, url):
+        sha1, sha256 = hashlib.sha1(), hashlib.sha256()
+        size = 0
+        suffix = os.path.splitext(urlparse(url).path)[1]
+        fd, path = tempfile.mkstemp(dir=self.temp_dir, prefix='.download-', suffix=suffix)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in response.iter_content(self.CHUNK_SIZE):
+                    size += len(chunk)
+                    # Content-Length may be missing or wrong
+                    if size > self.max_size:
+                        raise AssetTooLarge(f'over {self.max_size} bytes')
+                    sha1.update(chunk)
+                    sha256.update(chunk)
+                    f.write(chunk)
+        except BaseException:
+            os.remove(path)
+            raise
+        return DownloadedAsset(path, size, sha1.hexdigest(), sha256.hexdigest())
+
+    def download(self, url, max_retries=None):
+        """Download a file from URL with retries. Returns None for a 404 or a skipped failure."""
+        max_retries = max_retries or self.max_retries
         for attempt in range(max_retries):
             try:
-                response = self.session.get(url, timeout=30)
+                response, asset = self._fetch(url)
 
                 # Skip 404s silently
                 if response.status_code == 404:
                     return None
+                if response.status_code in self.RETRY_STATUSES and attempt < max_retries - 1:
+                    self._sleep_before_retry(attempt)
+                    continue
 
                 response.raise_for_status()
-                return response.content
+                return asset
 
+            except AssetTooLarge as e:
+                self.stdout.write(f'  Too large, skipped: {url} ({e})')
+                return None
             except requests.RequestException as e:
                 if '404' in str(e) or 'Not Found' in str(e):
                     return None  # Skip 404s silently
                 if attempt < max_retries - 1:
+                    self._sleep_before_retry(attempt)
                     continue  # Retry silently
                 if not self.skip_failed:
                     raise e
         return None
 
+    def probe(self, url, max_retries=None):
+        """Check that `url` exists without downloading it: True, False if missing, None if unknown."""
+        max_retries = max_retries or self.max_retries
+        for attempt in range(max_retries):
+            try:
+                with self.host_limit(url):
+                    response = self.session.head(url, timeout=10, allow_redirects=True)
+                    if response.status_code in (405, 501):
+                        # No HEAD support: ask for the first byte instead
+                        with self.session.get(url, timeout=10, stream=True, headers={'Range': 'bytes=0-0'}) as response:
+                            pass
+
+                if response.status_code in self.MISSING_STATUSES:
+                    return False
+                if response.ok:
+                    return True
+                if response.status_code in self.RETRY_STATUSES and attempt < max_retries - 1:
+                    self._sleep_before_retry(attempt)
+                    continue
+                return None
+
+            except requests.RequestException:
+                if attempt < max_retries - 1:
+                    self._sleep_before_retry(attempt)
+                    continue
+        return None
+
+    def _run_many(self, function, urls):
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(function, url): url for url in urls}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def download_many(self, urls):
+        """Yield (url, DownloadedAsset or None) as downloads finish."""
+        return self._run_many(self.download, urls)
+
+    def probe_many(self, urls):
+        """Yield (url, True, False or None) as probes finish."""
+        return self._run_many(self.probe, urls)
+
     def categorize_asset(self, filename, url):
         """Determine category based on filename patterns."""
         filename_lower = filename.lower()
@@ -359,28 +605,29 @@ class WagtailUploader:
         self.stdout = stdout
         self.style = style
 
-    def upload_image(self, content, filename, category):
-        """Upload image content to Wagtail Image library."""
+    def upload_image(self, asset, filename, category):
+        """Upload a DownloadedAsset to the Wagtail Image library, unless its content is already there."""
         if not WAGTAIL_AVAILABLE:
             self.stdout.write(self.style.ERROR("Wagtail not available"))
             return None
 
-        # Check if image already exists
-        existing = Image.objects.filter(title=filename).first()
+        # Same content under any title, matched on the SHA-1 Wagtail stores
+        existing = Image.objects.filter(file_hash=asset.sha1).first()
         if existing:
-            self.stdout.write(f"  Image already exists: {filename}")
+            self.stdout.write(f"  Image already exists: {filename} (as {existing.title})")
             return existing
 
         try:
-            # Create image file
-            image_file = ContentFile(content, name=filename)
-
-            # Create Wagtail image
-            image = Image(
-                title=filename,
-                file=image_file,
-            )
-            image.save()
+            # Create Wagtail image, copied from the file in chunks by the storage;
+            # the admin forms set the size and hash, save() doesn't
+            with asset.open() as f:
+                image = Image(
+                    title=filename,
+                    file=ImageFile(f, name=filename),
+                    file_size=asset.size,
+                    file_hash=asset.sha1,
+                )
+                image.save()
 
             # Add category tag
             image.tags.add(f"support-{category}")
@@ -394,6 +641,77 @@ class WagtailUploader:
             return None
 
 
+class AssetManifest:
+    """
+    What earlier runs imported, saved as JSON next to the static copies:
+    {url: {"sha256", "sha1", "filename", "category", "image_id"}}.
+
+    A re-run skips the URLs whose static copy and Wagtail image are still
+    there, without downloading them again.
+    """
+
+    FILENAME = 'manifest.json'
+
+    def __init__(self, output_dir, path=None):
+        self.output_dir = Path(output_dir)
+        self.path = Path(path) if path else self.output_dir / self.FILENAME
+        self.entries = _read_json(self.path)
+
+    def imported(self, urls):
+        """The entries for `urls` that don't need downloading again."""
+        entries = {
+            url: self.entries[url] for url in urls
+            if url in self.entries
+            and (self.output_dir / self.entries[url]['category'] / self.entries[url]['filename']).exists()
+        }
+        if WAGTAIL_AVAILABLE:
+            image_ids = set(Image.objects.filter(
+                id__in=[entry['image_id'] for entry in entries.values() if entry.get('image_id')]
+            ).values_list('id', flat=True))
+            entries = {url: entry for url, entry in entries.items() if entry.get('image_id') in image_ids}
+        return entries
+
+    def record(self, url, asset, filename, category, image_id=None):
+        self.entries[url] = {
+            'sha256': asset.sha256,
+            'sha1': asset.sha1,
+            'filename': filename,
+            'category': category,
+            'image_id': image_id,
+        }
+
+    def save(self):
+        _write_json(self.path, self.entries)
+
+
+class MissingCache:
+    """
+    URLs a probe found missing, saved as JSON next to the manifest:
+    {url: timestamp after which to probe it again}.
+    """
+
+    FILENAME = 'missing.json'
+    TTL_DAYS = 7
+
+    def __init__(self, output_dir, ttl_days=TTL_DAYS):
+        self.path = Path(output_dir) / self.FILENAME
+        self.ttl = ttl_days * 24 * 3600
+        now = time.time()
+        self.entries = {url: expires for url, expires in _read_json(self.path).items() if expires > now}
+
+    def __contains__(self, url):
+        return url in self.entries
+
+    def add(self, url):
+        self.entries[url] = time.time() + self.ttl
+
+    def discard(self, url):
+        self.entries.pop(url, None)
+
+    def save(self):
+        _write_json(self.path, self.entries)
+
+
 class Command(BaseCommand):
     help = 'Import digital assets from the old CashMatters website'
 
@@ -442,24 +760,65 @@ class Command(BaseCommand):
             default=True,
             help='Skip URLs that return 404 (default: True)',
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=AssetDownloader.DOWNLOAD_WORKERS,
+            help=f'Concurrent downloads (default {AssetDownloader.DOWNLOAD_WORKERS})',
+        )
+        parser.add_argument(
+            '--per-host',
+            type=int,
+            default=AssetDownloader.PER_HOST_LIMIT,
+            help=f'Concurrent downloads per host (default {AssetDownloader.PER_HOST_LIMIT})',
+        )
+
+        parser.add_argument(
+            '--manifest',
+            help=f'Manifest of imported assets (default: <output-dir>/{AssetManifest.FILENAME})',
+        )
+        parser.add_argument(
+            '--refresh',
+            action='store_true',
+            help='Scrape and download everything again, ignoring the manifest and page cache',
+        )
+        parser.add_argument(
+            '--max-size',
+            type=int,
+            default=AssetDownloader.MAX_SIZE // (1024 * 1024),
+            help=f'Largest file to download, in MB (default {AssetDownloader.MAX_SIZE // (1024 * 1024)})',
+        )
+        parser.add_argument(
+            '--missing-ttl',
+            type=float,
+            default=MissingCache.TTL_DAYS,
+            help=f'Days before a guessed URL found missing is probed again (default {MissingCache.TTL_DAYS})',
+        )
 
     def handle(self, *args, **options):
         self.stdout.write(self.style.SUCCESS('\n=== CashMatters Asset Importer ===\n'))
 
-        if not BS4_AVAILABLE:
-            self.stdout.write(self.style.WARNING(
-                'BeautifulSoup4 not installed. Run: pip install beautifulsoup4\n'
-                'Continuing with regex-only scraping...\n'
-            ))
+        output_dir = Path(settings.BASE_DIR) / options['output_dir']
+        page_cache = PageCache(output_dir)
+        if options['refresh']:
+            page_cache.entries = {}
 
         # Initialize components
-        scraper = AssetScraper(self.stdout, self.style)
-        downloader = AssetDownloader(self.stdout, self.style, skip_failed=options['skip_failed'])
+        scraper = AssetScraper(self.stdout, self.style, cache=page_cache)
+        downloader = AssetDownloader(
+            self.stdout,
+            self.style,
+            skip_failed=options['skip_failed'],
+            workers=options['workers'],
+            per_host=options['per_host'],
+            max_size=options['max_size'] * 1024 * 1024,
+        )
         uploader = WagtailUploader(self.stdout, self.style)
 
         assets = {
             'images': [],
             'videos': [],
+            'candidates': [],
         }
 
         # Step 1: Scrape assets based on source
@@ -470,6 +829,9 @@ class Command(BaseCommand):
             scraped = scraper.scrape_all_assets()
             assets['images'].extend(scraped['images'])
             assets['videos'].extend(scraped['videos'])
+            assets['candidates'].extend(scraped['candidates'])
+            if not options['dry_run']:
+                page_cache.save()
 
         if source in ['cms', 'both']:
             self.stdout.write('\n[1/4] Fetching assets from CMS API...\n')
@@ -485,9 +847,11 @@ class Command(BaseCommand):
         # Deduplicate
         assets['images'] = list(set(assets['images']))
         assets['videos'] = list({v['id']: v for v in assets['videos']}.values())
+        assets['candidates'] = sorted(set(assets['candidates']) - set(assets['images']))
 
         self.stdout.write(self.style.SUCCESS(
-            f'\nFound {len(assets["images"])} images and {len(assets["videos"])} videos\n'
+            f'\nFound {len(assets["images"])} images and {len(assets["videos"])} videos, '
+            f'and guessed {len(assets["candidates"])} key-fact URLs\n'
         ))
 
         if options['dry_run']:
@@ -495,19 +859,32 @@ class Command(BaseCommand):
             return
 
         # Step 2: Create output directory
-        output_dir = Path(settings.BASE_DIR) / options['output_dir']
         self.stdout.write(f'\n[2/4] Creating directory structure at {output_dir}...\n')
         self._create_directories(output_dir)
+        # Downloads land next to their static copies, so moving them there is a rename
+        downloader.temp_dir = output_dir
+        manifest = AssetManifest(output_dir, options['manifest'])
+        if options['refresh']:
+            manifest.entries = {}
+
+        if assets['candidates']:
+            self.stdout.write(f'\nProbing {len(assets["candidates"])} guessed key-fact URLs...\n')
+            missing = MissingCache(output_dir, options['missing_ttl'])
+            assets['images'].extend(self._probe_candidates(assets['candidates'], downloader, manifest, missing))
 
         # Step 3: Download and upload images
         self.stdout.write('\n[3/4] Downloading and uploading images...\n')
-        uploaded_assets = self._process_images(
-            assets['images'],
-            downloader,
-            uploader,
-            output_dir,
-            options['category']
-        )
+        try:
+            uploaded_assets = self._process_images(
+                assets['images'],
+                downloader,
+                uploader,
+                output_dir,
+                options['category'],
+                manifest,
+            )
+        finally:
+            downloader.close()
 
         # Step 4: Save video metadata
         self._save_video_metadata(assets['videos'], output_dir)
@@ -529,6 +906,9 @@ class Command(BaseCommand):
         if len(assets['images']) > 20:
             self.stdout.write(f'  ... and {len(assets["images"]) - 20} more')
 
+        if assets['candidates']:
+            self.stdout.write(f'\nPlus whichever of {len(assets["candidates"])} guessed key-fact URLs exist')
+
         self.stdout.write('\nVideos:')
         for video in assets['videos']:
             self.stdout.write(f'  - Vimeo ID: {video["id"]} ({video["title"]})')
@@ -543,8 +923,35 @@ class Command(BaseCommand):
             cat_dir.mkdir(parents=True, exist_ok=True)
             self.stdout.write(f'  Created: {cat_dir}')
 
-    def _process_images(self, image_urls, downloader, uploader, output_dir, category_filter):
-        """Download and upload all images."""
+    def _probe_candidates(self, urls, downloader, manifest, missing):
+        """The guessed URLs worth downloading: already imported, found by a probe, or unknown."""
+        imported = manifest.imported(urls)
+        known_missing = [url for url in urls if url in missing and url not in imported]
+        to_probe = [url for url in urls if url not in imported and url not in missing]
+
+        found = list(imported)
+        absent = unknown = 0
+        try:
+            for url, exists in downloader.probe_many(to_probe):
+                if exists is False:
+                    missing.add(url)
+                    absent += 1
+                    continue
+                # Probe failures are downloaded anyway rather than lost
+                unknown += exists is None
+                missing.discard(url)
+                found.append(url)
+        finally:
+            missing.save()
+
+        self.stdout.write(
+            f'  {len(found)} to import ({len(imported)} already imported, {unknown} unknown), '
+            f'{absent} missing, {len(known_missing)} skipped as known missing'
+        )
+        return found
+
+    def _process_images(self, image_urls, downloader, uploader, output_dir, category_filter, manifest=None):
+        """Download and upload all images not already imported according to the manifest."""
         uploaded = {
             'logos': [],
             'banners': [],
@@ -552,56 +959,89 @@ class Command(BaseCommand):
             'post-cards': [],
             'general': [],
         }
+        if manifest is None:
+            manifest = AssetManifest(output_dir)
 
         success_count = 0
         skip_count = 0
 
+        # Apply category filter
+        selected = {}
         for url in image_urls:
             filename = downloader.get_filename_from_url(url)
             category = downloader.categorize_asset(filename, url)
+            if category_filter == 'all' or category == category_filter:
+                selected[url] = (filename, category)
+
+        # Imported by an earlier run: nothing to download
+        imported = manifest.imported(selected)
+        for url, entry in imported.items():
+            uploaded[entry['category']].append(
+                self._uploaded_entry(url, entry['filename'], output_dir / entry['category'], entry['image_id'])
+            )
+        if imported:
+            self.stdout.write(f'Already imported: {len(imported)} (from {manifest.path})')
+        pending = [url for url in selected if url not in imported]
 
-            # Apply category filter
-            if category_filter != 'all' and category != category_filter:
-                continue
-
-            try:
-                # Download the file
-                content = downloader.download(url)
-                if not content:
-                    skip_count += 1
-                    continue
-
-                self.stdout.write(f'Downloaded: {filename}')
-
-                # Save to static directory
-                save_path = output_dir / category / filename
-                with open(save_path, 'wb') as f:
-                    f.write(content)
-
-                # Upload to Wagtail
-                if WAGTAIL_AVAILABLE:
-                    image = uploader.upload_image(content, filename, category)
-                    if image:
-                        uploaded[category].append({
-                            'filename': filename,
-                            'wagtail_id': image.id,
-                            'url': url,
-                        })
-                        success_count += 1
-                else:
-                    uploaded[category].append({
-                        'filename': filename,
-                        'static_path': str(save_path),
-                        'url': url,
-                    })
+        # Downloads run concurrently; files and database writes stay on this thread
+        try:
+            for url, asset in downloader.download_many(pending):
+                filename, category = selected[url]
+
+                try:
+                    if not asset:
+                        skip_count += 1
+                        continue
+
+                    self.stdout.write(f'Downloaded: {filename}')
+
+                    # Save to static directory, next to any different file of the same name
+                    filename = self._static_filename(output_dir / category, filename, asset)
+                    save_path = output_dir / category / filename
+                    asset.move_to(save_path)
+
+                    # Upload to Wagtail
+                    image_id = None
+                    if WAGTAIL_AVAILABLE:
+                        image = uploader.upload_image(asset, filename, category)
+                        if not image:
+                            continue
+                        image_id = image.id
+
+                    manifest.record(url, asset, filename, category, image_id)
+                    uploaded[category].append(self._uploaded_entry(url, filename, output_dir / category, image_id))
                     success_count += 1
 
-            except Exception as e:
-                skip_count += 1
-
-        self.stdout.write(f'\nProcessed: {success_count} downloaded, {skip_count} skipped (404 or failed)')
+                except Exception as e:
+                    skip_count += 1
+                finally:
+                    if asset:
+                        asset.discard()
+        finally:
+            manifest.save()
+
+        self.stdout.write(
+            f'\nProcessed: {success_count} downloaded, {len(imported)} already imported, '
+            f'{skip_count} skipped (404 or failed)'
+        )
         return uploaded
 
+    def _static_filename(self, directory, filename, asset):
+        """`filename`, or `name-<hash>.ext` if a different file already has that name."""
+        path = directory / filename
+        if not path.exists():
+            return filename
+        with open(path, 'rb') as f:
+            if hashlib.file_digest(f, 'sha256').hexdigest() == asset.sha256:
+                return filename
+        stem, ext = os.path.splitext(filename)
+        return f'{stem}-{asset.sha256[:8]}{ext}'
+
+    def _uploaded_entry(self, url, filename, directory, image_id):
+        if WAGTAIL_AVAILABLE:
+            return {'filename': filename, 'wagtail_id': image_id, 'url': url}
+        return {'filename': filename, 'static_path': str(directory / filename), 'url': url}
+
     def _save_video_metadata(self, videos, output_dir):
         """Save video metadata to JSON file."""
         video_file = output_dir / 'videos.json'
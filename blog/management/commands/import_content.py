@@ -0,0 +1,159 @@
+import json
+import os
+import time
+from itertools import islice
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from wagtail.models import Page
+
+from blog.cache import bump_content_version
+from blog.importer import IMPORT_BATCH_SIZE, PageImporter, read_records
+from blog.models import ArticlePage, BlogIndexPage, BlogPage, KeyFactsPage, NewsIndexPage
+from blog.renditions import generate_api_renditions_for_ids, page_image_ids
+from blog.sitemaps import get_sitemap_root
+from blog.snapshots import atomic_write, get_snapshot_root
+
+# --type: (page model, default parent index)
+PAGE_TYPES = {
+    'article': (ArticlePage, NewsIndexPage),
+    'blog': (BlogPage, BlogIndexPage),
+    'keyfacts': (KeyFactsPage, NewsIndexPage),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk import pages from a JSONL, CSV or XLSX file, a batch at a time, '
+        'with checkpoints so an interrupted import can be resumed'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='The .jsonl, .csv or .xlsx file to import')
+        parser.add_argument(
+            '--type',
+            choices=sorted(PAGE_TYPES),
+            default='article',
+            help='Page type to create (default article)',
+        )
+        parser.add_argument(
+            '--parent',
+            type=int,
+            help='Id of the parent page (default: the news or blog index)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help=f'Pages per transaction (default {IMPORT_BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='Checkpoint file (default: <path>.checkpoint)',
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Skip the records already imported according to the checkpoint',
+        )
+
+    def get_parent(self, options, index_model):
+        if options['parent']:
+            parent = Page.objects.filter(pk=options['parent']).first()
+        else:
+            parent = index_model.objects.first()
+        if parent is None:
+            raise CommandError('Parent page not found; create it first or pass --parent')
+        return parent
+
+    def read_checkpoint(self, checkpoint_path):
+        try:
+            with open(checkpoint_path) as f:
+                checkpoint = json.load(f)
+        except FileNotFoundError:
+            return 0
+        pending = checkpoint.get('pending')
+        if pending and Page.objects.filter(pk=pending['page_id'], path=pending['path']).exists():
+            # The batch committed, but the process stopped before recording it
+            return pending['records']
+        return checkpoint['records']
+
+    def write_checkpoint(self, checkpoint_path, records, pending=None):
+        checkpoint = {'records': records}
+        if pending:
+            checkpoint['pending'] = pending
+        atomic_write(checkpoint_path, json.dumps(checkpoint).encode(), time.time())
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f'File not found: {path}')
+        model, index_model = PAGE_TYPES[options['type']]
+        parent = self.get_parent(options, index_model)
+        checkpoint_path = options['checkpoint'] or f'{path}.checkpoint'
+        batch_size = max(1, options['batch_size'])
+
+        done = self.read_checkpoint(checkpoint_path) if options['resume'] else 0
+        try:
+            rows = read_records(path)
+        except ValueError as e:
+            raise CommandError(str(e))
+        if done:
+            self.stdout.write(f'Resuming after {done} records')
+            rows = islice(rows, done, None)
+
+        importer = PageImporter(model, parent)
+        imported = failed = 0
+        image_ids = set()
+        started = time.monotonic()
+
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            with transaction.atomic():
+                pages, errors = importer.import_batch(batch)
+                if pages:
+                    # Written before the commit: the batch counts as done on
+                    # --resume only if its last page turns out to exist
+                    self.write_checkpoint(checkpoint_path, done, pending={
+                        'records': done + len(batch), 'page_id': pages[-1].pk, 'path': pages[-1].path,
+                    })
+            done += len(batch)
+            self.write_checkpoint(checkpoint_path, done)
+
+            imported += len(pages)
+            image_ids |= page_image_ids(pages)
+            failed += len(errors)
+            for line_number, message in errors:
+                self.stdout.write(self.style.WARNING(f'Line {line_number}: {message}'))
+            rate = imported / max(time.monotonic() - started, 1e-6)
+            self.stdout.write(f'{done} records read, {imported} pages imported ({rate:.0f} pages/s)')
+
+        elapsed = time.monotonic() - started
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        bump_content_version()
+
+        for label, count in sorted(importer.other_models.items()):
+            self.stdout.write(f'Left out {count} {label} records of another type')
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {imported} pages under "{parent.title}" in {elapsed:.1f}s '
+            f'({imported / max(elapsed, 1e-6):.0f} pages/s); {failed} records skipped'
+        ))
+        if imported:
+            self.refresh_published_output(image_ids)
+        self.stdout.write('Run update_index and rebuild_references_index to index the new pages')
+
+    def refresh_published_output(self, image_ids):
+        # Bulk-created pages skip the publish signals that keep these current
+        if image_ids:
+            self.stdout.write(f'Generating API renditions for {len(image_ids)} images')
+            generate_api_renditions_for_ids(image_ids)
+        for command, root in (
+            ('build_sitemaps', get_sitemap_root()),
+            ('export_api_snapshots', get_snapshot_root()),
+        ):
+            if root:
+                call_command(command, stdout=self.stdout)
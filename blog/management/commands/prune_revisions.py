@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.template.defaultfilters import filesizeformat
+
+from blog.revisions import PRUNE_BATCH_SIZE, PRUNE_KEEP, estimate_size, prunable_revisions, prune_revisions
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete old page and snippet revisions, keeping the newest ones of each '
+        'object and every revision that is live, published, approved or scheduled'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep',
+            type=int,
+            default=PRUNE_KEEP,
+            help=f'Newest revisions to keep per object (default {PRUNE_KEEP})',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=PRUNE_BATCH_SIZE,
+            help=f'Revisions deleted per query (default {PRUNE_BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many revisions would be deleted and their size',
+        )
+
+    def handle(self, *args, **options):
+        keep = options['keep']
+        if keep < 1:
+            raise CommandError('--keep must be at least 1')
+
+        count, size = estimate_size(prunable_revisions(keep))
+        self.stdout.write(
+            f'{count} revisions to prune ({filesizeformat(size)} of uncompressed JSON), '
+            f'keeping the newest {keep} per object'
+        )
+        if options['dry_run'] or not count:
+            return
+
+        deleted = 0
+        for deleted in prune_revisions(keep, max(1, options['batch_size'])):
+            self.stdout.write(f'Deleted {deleted} of {count}')
+        self.stdout.write(self.style.SUCCESS(f'Pruned {deleted} revisions'))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from blog.embeds import EMBED_WARM_WORKERS, live_page_embeds, warm_embeds
+
+
+class Command(BaseCommand):
+    help = (
+        'Resolve every embed URL used in the StreamFields of live pages and '
+        'store it in the embeds table, so no page view waits on an oEmbed call'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=EMBED_WARM_WORKERS,
+            help=f'Provider calls to run at once (default {EMBED_WARM_WORKERS})',
+        )
+
+    def handle(self, *args, **options):
+        embeds = live_page_embeds()
+        self.stdout.write(f'Found {len(embeds)} embeds on live pages')
+
+        results = warm_embeds(embeds, workers=max(1, options['workers']))
+        for (url, _max_width, _max_height), resolved in results.items():
+            if not resolved:
+                self.stdout.write(self.style.WARNING(f'No embed found for {url}'))
+
+        resolved = sum(results.values())
+        self.stdout.write(self.style.SUCCESS(f'Resolved {resolved} of {len(results)} embeds'))
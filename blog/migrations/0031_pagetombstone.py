@@ -0,0 +1,30 @@
+# Generated by Django 6.0.2 on 2026-10-19 03:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0030_articlepage_og_description_articlepage_og_image_and_more'),
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PageTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('page_id', models.PositiveIntegerField(unique=True)),
+                ('url_path', models.TextField(blank=True)),
+                ('reason', models.CharField(choices=[('unpublished', 'Unpublished'), ('deleted', 'Deleted')], max_length=20)),
+                ('removed_at', models.DateTimeField()),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+            ],
+            options={
+                'ordering': ['removed_at', 'page_id'],
+                'indexes': [models.Index(fields=['removed_at', 'page_id'], name='blog_tombstone_removed_idx')],
+            },
+        ),
+    ]
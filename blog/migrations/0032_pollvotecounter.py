@@ -0,0 +1,26 @@
+# Generated by Django 6.0.2 on 2026-10-19 03:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0031_pagetombstone'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PollVoteCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shard', models.PositiveSmallIntegerField()),
+                ('pending', models.PositiveIntegerField(default=0)),
+                ('choice', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vote_counters', to='blog.pollchoice')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('choice', 'shard'), name='blog_pollvotecounter_unique')],
+            },
+        ),
+    ]
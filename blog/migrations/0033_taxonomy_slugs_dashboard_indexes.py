@@ -0,0 +1,62 @@
+# Generated by Django 6.0.2 on 2026-10-19 03:52, then edited by hand:
+# fill_slugs (kept in step with blog.models.unique_slug) and the RunSQL indexes.
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def fill_slugs(apps, schema_editor):
+    for model_name in ("ArticleType", "Location"):
+        model = apps.get_model("blog", model_name)
+        used = set(model.objects.exclude(slug=None).values_list("slug", flat=True))
+        for obj in model.objects.filter(slug=None).order_by("pk"):
+            base = slugify(obj.name)[:110] or model_name.lower()
+            slug, n = base, 2
+            while slug in used:
+                slug, n = f"{base}-{n}", n + 1
+            used.add(slug)
+            obj.slug = slug
+            obj.save(update_fields=["slug"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0032_pollvotecounter'),
+        ('wagtailcore', '0096_referenceindex_referenceindex_source_object_and_more'),
+        ('wagtailimages', '0027_image_description'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articletype',
+            name='slug',
+            field=models.SlugField(blank=True, help_text='Auto-generated from name if left blank', max_length=120, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='slug',
+            field=models.SlugField(blank=True, help_text='Auto-generated from name if left blank', max_length=120, null=True, unique=True),
+        ),
+        migrations.RunPython(fill_slugs, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='blogpage',
+            index=models.Index(fields=['date', 'page_ptr'], name='blog_blogpage_date_idx'),
+        ),
+        # The dashboard's "modified" and "title" sorts order by wagtailcore_page
+        # columns. Wagtail owns that table, so AddIndex can't target it from
+        # this app; the indexes are plain SQL instead, and Wagtail's own
+        # migrations and model state don't know they exist. Reversing this
+        # migration drops them.
+        migrations.RunSQL(
+            [
+                'CREATE INDEX IF NOT EXISTS blog_page_modified_idx '
+                'ON wagtailcore_page (latest_revision_created_at, id)',
+                'CREATE INDEX IF NOT EXISTS blog_page_title_idx ON wagtailcore_page (title, id)',
+            ],
+            [
+                'DROP INDEX IF EXISTS blog_page_modified_idx',
+                'DROP INDEX IF EXISTS blog_page_title_idx',
+            ],
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.2 on 2026-10-19 04:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0033_taxonomy_slugs_dashboard_indexes'),
+        ('wagtailcore', '0096_referenceindex_referenceindex_source_object_and_more'),
+        ('wagtailimages', '0027_image_description'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='keyfactspage',
+            index=models.Index(fields=['date', 'page_ptr'], name='blog_keyfacts_date_idx'),
+        ),
+    ]
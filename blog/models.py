@@ -12,8 +12,10 @@ from wagtail.documents.blocks import DocumentChooserBlock
 from modelcluster.fields import ParentalManyToManyField
 from django.forms import CheckboxSelectMultiple
 from django.core.exceptions import ValidationError
+from django.utils.text import slugify
 from wagtail.models import Page
 from .mixins import OpenGraphMixin
+from .tables import table_context
 
 
 # blog/blocks.py  (կամ models.py-ի վերևում)
@@ -130,7 +132,14 @@ class DataTableBlock(blocks.StructBlock):
         help_text="A heading that identifies the overall topic of the table, useful for screen reader users."
     )
 
+    def get_context(self, value, parent_context=None):
+        context = super().get_context(value, parent_context=parent_context)
+        # Compiled once per table content (see blog/tables.py), not cell by cell
+        context.update(table_context(self, value, context.get("page")))
+        return context
+
     class Meta:
+        template = 'blog/blocks/data_table_block.html'
         icon = "table"
         label = "Data Table"
 
@@ -520,6 +529,12 @@ class BlogPage(OpenGraphMixin, Page):
 
     promote_panels = Page.promote_panels + OpenGraphMixin.og_panels
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of the blogs dashboard by post date
+            models.Index(fields=["date", "page_ptr"], name="blog_blogpage_date_idx"),
+        ]
+
 
 
 
@@ -860,6 +875,12 @@ class KeyFactsPage(Page):
         FieldPanel("date"),
     ]
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of the Key Facts admin listing by date
+            models.Index(fields=["date", "page_ptr"], name="blog_keyfacts_date_idx"),
+        ]
+
 
 class SupportPage(Page):
     """
@@ -1416,15 +1437,68 @@ class PollChoice(Orderable):
         return self.question
 
 
+class PollVoteCounter(models.Model):
+    """
+    Buffered vote counts, flushed into PollChoice.votes in batches.
+
+    Each choice has up to POLL_COUNTER_SHARDS rows (see blog/polls.py) and a
+    vote increments a random one, so concurrent voters rarely wait on the
+    same row lock and PollChoice itself is only written by the flush.
+    """
+    choice = models.ForeignKey(PollChoice, on_delete=models.CASCADE, related_name="vote_counters")
+    shard = models.PositiveSmallIntegerField()
+    pending = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.choice} #{self.shard}: {self.pending}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["choice", "shard"], name="blog_pollvotecounter_unique"),
+        ]
+
+
 from django.db import models
 from wagtail.snippets.models import register_snippet
 from wagtail.admin.panels import FieldPanel
 
+
+def unique_slug(model, name, pk=None):
+    """
+    slugify(name), with -2, -3... appended until no other row of `model`
+    uses it. Migration 0033 filled in the existing slugs the same way.
+    """
+    base = slugify(name)[:110] or model._meta.model_name
+    used = set(
+        model._default_manager.exclude(pk=pk).filter(slug__startswith=base).values_list("slug", flat=True)
+    )
+    slug, n = base, 2
+    while slug in used:
+        slug, n = f"{base}-{n}", n + 1
+    return slug
+
+
 @register_snippet
 class ArticleType(models.Model):
     name = models.CharField(max_length=100, unique=True)
 
-    panels = [FieldPanel("name")]
+    slug = models.SlugField(
+        max_length=120,
+        unique=True,
+        null=True,
+        blank=True,
+        help_text="Auto-generated from name if left blank"
+    )
+
+    panels = [
+        FieldPanel("name"),
+        FieldPanel("slug"),
+    ]
+
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            self.slug = unique_slug(type(self), self.name, self.pk)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
@@ -1435,7 +1509,24 @@ class ArticleType(models.Model):
 @register_snippet
 class Location(models.Model):
     name = models.CharField(max_length=100, unique=True)
-    panels = [FieldPanel("name")]
+
+    slug = models.SlugField(
+        max_length=120,
+        unique=True,
+        null=True,
+        blank=True,
+        help_text="Auto-generated from name if left blank"
+    )
+
+    panels = [
+        FieldPanel("name"),
+        FieldPanel("slug"),
+    ]
+
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            self.slug = unique_slug(type(self), self.name, self.pk)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
@@ -1443,8 +1534,6 @@ class Location(models.Model):
     class Meta:
         ordering = ["name"]
 
-from django.utils.text import slugify
-
 @register_snippet
 class Sector(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -1464,7 +1553,7 @@ class Sector(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            self.slug = slugify(self.name)
+            self.slug = unique_slug(type(self), self.name, self.pk)
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -1501,3 +1590,40 @@ class BrandAssetTag(models.Model):
 
     class Meta:
         ordering = ["title"]
+
+
+from django.contrib.contenttypes.models import ContentType
+
+
+class PageTombstone(models.Model):
+    """
+    Record of a page that left the public site (unpublished or deleted).
+
+    The API delta-sync mode returns these so that mirrors can drop pages that
+    no longer exist. A tombstone is removed again when the page is republished.
+    """
+    REASON_UNPUBLISHED = "unpublished"
+    REASON_DELETED = "deleted"
+    REASON_CHOICES = [
+        (REASON_UNPUBLISHED, "Unpublished"),
+        (REASON_DELETED, "Deleted"),
+    ]
+
+    page_id = models.PositiveIntegerField(unique=True)
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    url_path = models.TextField(blank=True)
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES)
+    removed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.page_id} ({self.reason})"
+
+    class Meta:
+        ordering = ["removed_at", "page_id"]
+        indexes = [
+            models.Index(fields=["removed_at", "page_id"], name="blog_tombstone_removed_idx"),
+        ]
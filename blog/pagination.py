@@ -0,0 +1,268 @@
+# blog/pagination.py
+"""
+Keyset ("cursor") pagination helpers.
+
+Offset pagination has to skip every row before the requested page, so deep
+pages get slower as the archive grows. A keyset cursor remembers the sort
+key of the last row that was returned and asks the database for the rows
+after it instead, which is answered straight from the index.
+
+The API feeds use keyset_page(); the admin listings use keyset_paginate(),
+which also walks backwards, mixes sort directions and tolerates NULLs.
+Counting a large filtered listing is as expensive as reading it, so
+capped_count() only counts exactly up to a limit and estimates beyond.
+"""
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import F, Q
+from django.utils.dateparse import parse_date, parse_datetime
+
+from wagtail.api.v2.utils import BadRequestError
+
+
+class InvalidCursor(BadRequestError):
+    pass
+
+
+@dataclass
+class KeysetPage:
+    object_list: list
+    next_cursor: str = None
+    previous_cursor: str = None
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+
+# ----------------------------
+# Cursors
+# ----------------------------
+def encode_cursor(values):
+    """Encode a tuple of sort key values into an opaque, URL-safe cursor."""
+    payload = []
+    for value in values:
+        if isinstance(value, datetime):
+            payload.append({"dt": value.isoformat()})
+        elif isinstance(value, date):
+            payload.append({"d": value.isoformat()})
+        else:
+            payload.append(value)
+
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, length, nullable=False):
+    """
+    Decode a cursor produced by encode_cursor() back into a list of values.
+
+    Raises InvalidCursor (a 400 in the API) for anything encode_cursor()
+    could not have produced. None is only accepted when `nullable` is set.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("cursor is not valid") from e
+
+    if not isinstance(payload, list) or len(payload) != length:
+        raise InvalidCursor("cursor is not valid")
+
+    values = []
+    for value in payload:
+        if value is None and nullable:
+            values.append(value)
+            continue
+        try:
+            if isinstance(value, dict) and "dt" in value:
+                value = parse_datetime(value["dt"])
+            elif isinstance(value, dict) and "d" in value:
+                value = parse_date(value["d"])
+        except (ValueError, TypeError) as e:
+            # Not a string, or not a real date
+            raise InvalidCursor("cursor is not valid") from e
+        if value is None or isinstance(value, (dict, list)):
+            raise InvalidCursor("cursor is not valid")
+        values.append(value)
+    return values
+
+
+# ----------------------------
+# Queries
+# ----------------------------
+def keyset_filter(fields, values, descending=False):
+    """
+    Build the Q object selecting rows that sort after `values`.
+
+    For fields (a, b, c) this is the expanded form of the row comparison
+    (a, b, c) > (x, y, z), which databases can answer from a composite index:
+    a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z).
+    """
+    lookup = "lt" if descending else "gt"
+    condition = Q()
+    for i, field in enumerate(fields):
+        clause = Q(**{f"{field}__{lookup}": values[i]})
+        for prev_field, prev_value in zip(fields[:i], values[:i]):
+            clause &= Q(**{prev_field: prev_value})
+        condition |= clause
+    return condition
+
+
+def keyset_page(queryset, fields, cursor=None, limit=20, descending=False):
+    """
+    Return (items, next_cursor) for one page of `queryset`.
+
+    The queryset is ordered by `fields` (all ascending, or all descending) and
+    one extra row is fetched to find out whether another page exists, so no
+    COUNT query is needed.
+    """
+    ordering = [f"-{field}" if descending else field for field in fields]
+    queryset = queryset.order_by(*ordering)
+
+    if cursor:
+        values = decode_cursor(cursor, len(fields))
+        queryset = queryset.filter(keyset_filter(fields, values, descending))
+
+    items = list(queryset[:limit + 1])
+    has_more = len(items) > limit
+    items = items[:limit]
+
+    next_cursor = None
+    if has_more and items:
+        last = items[-1]
+        next_cursor = encode_cursor([_resolve(last, field) for field in fields])
+    return items, next_cursor
+
+
+def _resolve(obj, field):
+    """Follow a `related__field` path on a model instance or a values() dict."""
+    if isinstance(obj, dict):
+        return obj[field]
+    for part in field.split("__"):
+        obj = getattr(obj, part)
+    return obj
+
+
+def _order_by(ordering, reverse=False):
+    """NULLs sort last going forwards, so they sort first going backwards."""
+    nulls = {"nulls_first": True} if reverse else {"nulls_last": True}
+    return [
+        F(name).desc(**nulls) if descending != reverse else F(name).asc(**nulls)
+        for name, descending in ordering
+    ]
+
+
+def _beyond(name, descending, value, reverse):
+    """Q for rows strictly after `value` in column `name`, in the direction of travel."""
+    if reverse:
+        if value is None:
+            return Q(**{f"{name}__isnull": False})
+        lookup = "gt" if descending else "lt"
+        return Q(**{f"{name}__{lookup}": value})
+    if value is None:
+        return None
+    lookup = "lt" if descending else "gt"
+    return Q(**{f"{name}__{lookup}": value}) | Q(**{f"{name}__isnull": True})
+
+
+def _seek(ordering, values, reverse):
+    """keyset_filter() for mixed directions and nullable columns."""
+    condition = Q(pk__in=[])
+    equal = Q()
+    for (name, descending), value in zip(ordering, values):
+        beyond = _beyond(name, descending, value, reverse)
+        if beyond is not None:
+            condition |= equal & beyond
+        equal &= Q(**{f"{name}__isnull": True}) if value is None else Q(**{name: value})
+    return condition
+
+
+def _cursor_values(model, ordering, cursor):
+    """decode_cursor(), with each value checked against its model field."""
+    values = decode_cursor(cursor, len(ordering), nullable=True)
+    fields = [model._meta.pk if name == "pk" else model._meta.get_field(name) for name, _desc in ordering]
+    try:
+        return [None if value is None else field.to_python(value) for field, value in zip(fields, values)]
+    except ValidationError as e:
+        raise InvalidCursor("cursor is not valid") from e
+
+
+def keyset_paginate(queryset, ordering, per_page, after=None, before=None):
+    """
+    One page of `queryset` in `ordering`, a list of (field name, descending)
+    ending with a unique field such as ("pk", True).
+
+    `after` and `before` are cursors from a previous KeysetPage; with
+    neither, the first page is returned. Raises InvalidCursor for a
+    malformed or stale cursor.
+    """
+    reverse = before is not None and after is None
+    cursor = before if reverse else after
+
+    if cursor is not None:
+        values = _cursor_values(queryset.model, ordering, cursor)
+        queryset = queryset.filter(_seek(ordering, values, reverse))
+    rows = list(queryset.order_by(*_order_by(ordering, reverse))[:per_page + 1])
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if reverse:
+        rows.reverse()
+
+    def cursor_for(row):
+        return encode_cursor([_resolve(row, name) for name, _descending in ordering])
+
+    page = KeysetPage(rows)
+    if not rows:
+        return page
+    if reverse:
+        # The rows we came back from are still ahead
+        page.next_cursor = cursor_for(rows[-1])
+        if has_more:
+            page.previous_cursor = cursor_for(rows[0])
+    else:
+        if has_more:
+            page.next_cursor = cursor_for(rows[-1])
+        if cursor is not None:
+            page.previous_cursor = cursor_for(rows[0])
+    return page
+
+
+# ----------------------------
+# Counts
+# ----------------------------
+def estimate_count(queryset):
+    """The planner's row estimate for `queryset` (PostgreSQL), or None."""
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = queryset.order_by().values("pk").query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def capped_count(queryset, limit):
+    """
+    (count, exact): the exact count when it is at most `limit`, otherwise
+    the planner's estimate (never below `limit`) and exact=False.
+    """
+    count = queryset.order_by().values("pk")[:limit + 1].count()
+    if count <= limit:
+        return count, True
+    return max(limit + 1, estimate_count(queryset) or 0), False
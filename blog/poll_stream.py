@@ -0,0 +1,118 @@
+# blog/poll_stream.py
+"""
+Live poll results over server-sent events.
+
+Every process keeps one broadcaster. While a poll has at least one watcher,
+a single ticker aggregates its results (blog.polls.aggregate_poll_results)
+at most once per POLL_STREAM_INTERVAL and hands the payload to every
+watcher, so a thousand open streams cost the same one aggregation per tick
+as a single one. The ticker stops when the last watcher disconnects.
+
+Streams need the ASGI entry point (cashmatters/asgi.py). Under WSGI the
+view sends one snapshot and a retry hint, so EventSource falls back to
+polling instead of pinning a worker.
+"""
+import asyncio
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from .polls import aggregate_poll_results
+
+logger = logging.getLogger(__name__)
+
+POLL_STREAM_INTERVAL = 1.0
+POLL_STREAM_HEARTBEAT = 15.0
+POLL_STREAM_RETRY_MS = 5000
+
+
+class PollChannel:
+    def __init__(self):
+        self.watchers = set()
+        self.latest = None
+        self.ticker = None
+
+
+class PollBroadcaster:
+    """Fan out one aggregation per poll per tick to all of its watchers."""
+
+    def __init__(self, aggregate=aggregate_poll_results):
+        self.aggregate = sync_to_async(aggregate)
+        self.channels = {}
+
+    async def _tick(self, poll_id, channel):
+        while channel.watchers:
+            try:
+                results = await self.aggregate(poll_id)
+            except Exception:
+                # Keep the streams open; the next tick may succeed
+                logger.exception("Could not aggregate results for poll %s", poll_id)
+                results = channel.latest
+            if results is not None and results != channel.latest:
+                channel.latest = results
+                for queue in channel.watchers:
+                    # Slow watchers only ever get the newest payload
+                    if queue.full():
+                        queue.get_nowait()
+                    queue.put_nowait(results)
+            await asyncio.sleep(POLL_STREAM_INTERVAL)
+        self.channels.pop(poll_id, None)
+
+    async def watch(self, poll_id):
+        """Yield result payloads as they change, or None as a heartbeat."""
+        channel = self.channels.get(poll_id)
+        if channel is None:
+            channel = self.channels[poll_id] = PollChannel()
+
+        queue = asyncio.Queue(maxsize=1)
+        channel.watchers.add(queue)
+        if channel.ticker is None or channel.ticker.done():
+            channel.ticker = asyncio.create_task(self._tick(poll_id, channel))
+        elif channel.latest is not None:
+            queue.put_nowait(channel.latest)
+
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), POLL_STREAM_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            channel.watchers.discard(queue)
+
+
+broadcaster = PollBroadcaster()
+
+
+def format_event(results):
+    if results is None:
+        return ": heartbeat\n\n"
+    return f"event: results\ndata: {json.dumps(results)}\n\n"
+
+
+async def _event_stream(poll_id):
+    yield f"retry: {POLL_STREAM_RETRY_MS}\n\n"
+    async for results in broadcaster.watch(poll_id):
+        yield format_event(results)
+
+
+@require_GET
+async def results_stream_view(request, poll_id):
+    results = await sync_to_async(aggregate_poll_results)(poll_id)
+    if results is None:
+        raise Http404("Poll not found")
+
+    if isinstance(request, ASGIRequest):
+        content = _event_stream(poll_id)
+    else:
+        content = [f"retry: {POLL_STREAM_RETRY_MS}\n\n", format_event(results)]
+
+    response = StreamingHttpResponse(content, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Tell nginx not to buffer the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,207 @@
+# blog/polls.py
+"""
+Poll voting.
+
+A vote only increments one of several buffered counter rows
+(PollVoteCounter) with an atomic F() update; PollChoice.votes is brought up
+to date by flush_poll_votes(), which runs at most once per
+POLL_FLUSH_INTERVAL (and from `manage.py flush_poll_votes`). Results are
+served from a short-lived cache, so a viral poll costs one small query
+every few seconds rather than one per reader.
+"""
+import random
+from collections import defaultdict
+
+from django.core import signing
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.http import Http404, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_GET, require_POST
+
+from wagtail.rich_text import expand_db_html
+
+from .models import Poll, PollChoice, PollVoteCounter
+
+
+POLL_COUNTER_SHARDS = 16
+POLL_FLUSH_INTERVAL = 10
+POLL_RESULTS_TIMEOUT = 5
+
+POLL_COOKIE_NAME = "cm_polls"
+POLL_COOKIE_SALT = "blog.polls"
+POLL_COOKIE_MAX_AGE = 365 * 24 * 60 * 60
+POLL_SESSION_KEY = "polls_voted"
+
+
+# ----------------------------
+# Counters
+# ----------------------------
+def record_vote(choice_id):
+    """Add one vote to a random counter shard of the choice."""
+    shard = random.randrange(POLL_COUNTER_SHARDS)
+    counters = PollVoteCounter.objects.filter(choice_id=choice_id, shard=shard)
+    if counters.update(pending=F("pending") + 1):
+        return
+    try:
+        with transaction.atomic():
+            PollVoteCounter.objects.create(choice_id=choice_id, shard=shard, pending=1)
+    except IntegrityError:
+        # Another voter created the row first
+        counters.update(pending=F("pending") + 1)
+
+
+def flush_poll_votes():
+    """
+    Move buffered votes into PollChoice.votes. Returns the number of votes moved.
+
+    The counter rows are locked for the duration of the flush, so a vote
+    arriving meanwhile waits and then lands on the emptied row; nothing is
+    counted twice or lost. Rows locked by a concurrent flush are skipped.
+    """
+    with transaction.atomic():
+        counters = list(
+            PollVoteCounter.objects.select_for_update(skip_locked=True)
+            .filter(pending__gt=0)
+            .values_list("pk", "choice_id", "pending")
+        )
+        if not counters:
+            return 0
+
+        totals = defaultdict(int)
+        for _pk, choice_id, pending in counters:
+            totals[choice_id] += pending
+        for choice_id, votes in totals.items():
+            PollChoice.objects.filter(pk=choice_id).update(votes=F("votes") + votes)
+        PollVoteCounter.objects.filter(pk__in=[pk for pk, _choice, _pending in counters]).update(pending=0)
+
+    return sum(totals.values())
+
+
+def schedule_flush():
+    """Flush at most once per POLL_FLUSH_INTERVAL, whichever request gets there first."""
+    if cache.add("blog:polls:flush-lock", 1, POLL_FLUSH_INTERVAL):
+        from .tasks import flush_poll_votes_task
+
+        transaction.on_commit(flush_poll_votes_task.enqueue)
+
+
+# ----------------------------
+# Results
+# ----------------------------
+def aggregate_poll_results(poll_id):
+    """
+    Current counts for a poll, including votes not flushed yet.
+
+    Returns {"poll", "title", "results_title", "results_content", "total",
+    "choices": [...]}, or None for an unknown poll.
+    """
+    poll = Poll.objects.filter(pk=poll_id).values(
+        "id", "title", "results_title", "results_content"
+    ).first()
+    if poll is None:
+        return None
+
+    pending = dict(
+        PollVoteCounter.objects.filter(choice__poll_id=poll_id)
+        .values_list("choice_id")
+        .annotate(total=Sum("pending"))
+    )
+    choices = [
+        {"id": choice_id, "question": question, "votes": votes + pending.get(choice_id, 0)}
+        for choice_id, question, votes in PollChoice.objects.filter(poll_id=poll_id)
+        .order_by("sort_order", "pk")
+        .values_list("id", "question", "votes")
+    ]
+    total = sum(choice["votes"] for choice in choices)
+    for choice in choices:
+        choice["percent"] = round(100 * choice["votes"] / total, 1) if total else 0
+
+    return {
+        "poll": poll["id"],
+        "title": poll["title"],
+        "results_title": poll["results_title"],
+        "results_content": expand_db_html(poll["results_content"]),
+        "total": total,
+        "choices": choices,
+    }
+
+
+def get_poll_results(poll_id):
+    """aggregate_poll_results(), cached for POLL_RESULTS_TIMEOUT seconds."""
+    key = f"blog:polls:{poll_id}:results"
+    results = cache.get(key)
+    if results is None:
+        results = aggregate_poll_results(poll_id)
+        if results is not None:
+            cache.set(key, results, POLL_RESULTS_TIMEOUT)
+    return results
+
+
+# ----------------------------
+# One vote per visitor
+# ----------------------------
+def get_voted_polls(request):
+    voted = set(request.session.get(POLL_SESSION_KEY, [])) if request.session.session_key else set()
+    try:
+        cookie = request.get_signed_cookie(POLL_COOKIE_NAME, salt=POLL_COOKIE_SALT)
+        voted.update(int(poll_id) for poll_id in cookie.split(",") if poll_id)
+    except (KeyError, signing.BadSignature, ValueError):
+        pass
+    return voted
+
+
+def remember_vote(request, response, poll_id, voted):
+    voted = sorted(voted | {poll_id})
+    response.set_signed_cookie(
+        POLL_COOKIE_NAME,
+        ",".join(map(str, voted)),
+        salt=POLL_COOKIE_SALT,
+        max_age=POLL_COOKIE_MAX_AGE,
+        httponly=True,
+        samesite="Lax",
+    )
+    # Don't start a session just for this, but use one if the visitor has it
+    if request.session.session_key:
+        request.session[POLL_SESSION_KEY] = voted
+
+
+# ----------------------------
+# Views
+# ----------------------------
+@require_POST
+def vote_view(request, poll_id):
+    results = get_poll_results(poll_id)
+    if results is None:
+        raise Http404("Poll not found")
+
+    try:
+        choice_id = int(request.POST.get("choice", ""))
+    except ValueError:
+        choice_id = None
+    if choice_id not in {choice["id"] for choice in results["choices"]}:
+        return JsonResponse({"error": "Unknown choice"}, status=400)
+
+    voted = get_voted_polls(request)
+    if poll_id in voted:
+        return JsonResponse({"error": "Already voted", "results": results}, status=409)
+
+    record_vote(choice_id)
+    schedule_flush()
+
+    response = JsonResponse({"voted": choice_id, "results": results})
+    remember_vote(request, response, poll_id, voted)
+    return response
+
+
+@require_GET
+def results_view(request, poll_id):
+    results = get_poll_results(poll_id)
+    if results is None:
+        raise Http404("Poll not found")
+
+    response = JsonResponse({"voted": poll_id in get_voted_polls(request), "results": results})
+    # "voted" is per visitor, so only the browser may reuse the response
+    patch_cache_control(response, private=True, max_age=POLL_RESULTS_TIMEOUT)
+    return response
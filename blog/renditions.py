@@ -0,0 +1,155 @@
+# blog/renditions.py
+"""
+Named image renditions exposed through the API.
+
+Renditions are generated when a page is published and when one of its
+images is saved, e.g. with a new focal point (see blog/tasks.py); the
+`generate_api_renditions` command backfills them for every live page. The
+API only ever *reads* them, in one batched query per response, so an API
+request never triggers image processing.
+"""
+import logging
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q
+
+from wagtail.api.v2.utils import get_full_url
+from wagtail.images import get_image_model
+from wagtail.images.models import Filter
+from wagtail.models import Page, get_page_models
+
+logger = logging.getLogger(__name__)
+
+
+# name -> Wagtail filter spec. Override with BLOG_API_IMAGE_RENDITIONS.
+DEFAULT_API_IMAGE_RENDITIONS = {
+    "card": "fill-540x750",     # tall thumbnail on section pages
+    "wide": "fill-1140x750",    # wide thumbnail on the home page
+    "hero": "width-1660",       # page header
+}
+
+# Image foreign keys on our page models that are exposed through the API
+API_IMAGE_FIELDS = [
+    "tall_thumbnail",
+    "wide_thumbnail",
+    "page_header_image",
+    "header_image",
+    "icon",
+]
+
+
+def get_api_image_renditions():
+    return getattr(settings, "BLOG_API_IMAGE_RENDITIONS", DEFAULT_API_IMAGE_RENDITIONS)
+
+
+def get_page_images(page):
+    """All images referenced by the API image fields of a (specific) page."""
+    images = []
+    for field_name in API_IMAGE_FIELDS:
+        image = getattr(page, field_name, None)
+        if image is not None:
+            images.append(image)
+    return images
+
+
+def _image_fields(model):
+    """The API image fields declared on `model` itself."""
+    names = []
+    for field_name in API_IMAGE_FIELDS:
+        try:
+            field = model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            continue
+        if field.model is model:
+            names.append(field_name)
+    return names
+
+
+def page_image_ids(pages):
+    """Ids of the images in the API image fields of `pages`, without loading them."""
+    return {
+        image_id
+        for page in pages
+        for field_name in API_IMAGE_FIELDS
+        if (image_id := getattr(page, f"{field_name}_id", None))
+    }
+
+
+def live_page_image_ids():
+    """Ids of every image used in an API image field of a live page, one query per page type."""
+    image_ids = set()
+    for model in get_page_models():
+        if model is Page or not _image_fields(model):
+            continue
+        for row in model.objects.live().values_list(*_image_fields(model)):
+            image_ids.update(image_id for image_id in row if image_id)
+    return image_ids
+
+
+def image_is_used_by_live_page(image_id):
+    for model in get_page_models():
+        fields = [] if model is Page else _image_fields(model)
+        if not fields:
+            continue
+        condition = Q()
+        for field_name in fields:
+            condition |= Q(**{field_name: image_id})
+        if model.objects.live().filter(condition).exists():
+            return True
+    return False
+
+
+def load_api_renditions(images):
+    """
+    Fetch the existing API renditions for all `images` in a single query.
+
+    Returns a dict keyed by (image id, filter spec). Missing renditions are
+    simply absent; they are never generated here.
+    """
+    images = {image.pk: image for image in images if image is not None}
+    if not images:
+        return {}
+
+    filters = {spec: Filter(spec=spec) for spec in get_api_image_renditions().values()}
+    Rendition = get_image_model().get_rendition_model()
+    renditions = Rendition.objects.filter(
+        image_id__in=list(images),
+        filter_spec__in=list(filters),
+    )
+
+    found = {}
+    for rendition in renditions:
+        image = images[rendition.image_id]
+        # Only use renditions made with the image's current focal point
+        if rendition.focal_point_key == filters[rendition.filter_spec].get_cache_key(image):
+            found[(image.pk, rendition.filter_spec)] = rendition
+    return found
+
+
+def rendition_urls(image, renditions, request=None):
+    """
+    Return {"card": url, "hero": url, ...} for an image from the result of
+    load_api_renditions(). Sizes that have not been generated yet are None.
+    """
+    urls = {}
+    for name, spec in get_api_image_renditions().items():
+        rendition = renditions.get((image.pk, spec))
+        urls[name] = get_full_url(request, rendition.url) if rendition else None
+    return urls
+
+
+def generate_api_renditions(images):
+    """Create any missing API renditions for `images` (used at publish time)."""
+    specs = list(get_api_image_renditions().values())
+    for image in images:
+        try:
+            image.get_renditions(*specs)
+        except Exception as e:
+            # A broken source file must not block publishing
+            logger.warning("Could not generate renditions for image %s: %s", image.pk, e)
+
+
+def generate_api_renditions_for_ids(image_ids):
+    """generate_api_renditions() for the images with these ids, loaded a chunk at a time."""
+    generate_api_renditions(get_image_model().objects.filter(pk__in=sorted(image_ids)).iterator())
@@ -0,0 +1,86 @@
+# blog/revisions.py
+"""
+Revision pruning (`manage.py prune_revisions`).
+
+Every save in the admin stores a full JSON copy of the page, and Wagtail
+never deletes them. prune_revisions keeps the newest `keep` revisions of
+each page or snippet and deletes the rest in batches, except revisions
+that something still points at:
+
+- live and latest revisions, workflow task states and comments: every
+  foreign key to Revision, found by introspection;
+- revisions whose log entry records a publish or an approval;
+- revisions scheduled to go live.
+"""
+from django.apps import apps
+from django.db import models
+from django.db.models import F, Q, Sum, Window
+from django.db.models.functions import Cast, Length, RowNumber
+
+from wagtail.models import BaseLogEntry, Revision
+
+PRUNE_KEEP = 20
+PRUNE_BATCH_SIZE = 1000
+
+# Log entries are kept for every edit; only these make their revision worth keeping
+PROTECTED_LOG_ACTIONS = (
+    "wagtail.publish",
+    "wagtail.publish.scheduled",
+    "wagtail.publish.schedule",
+    "wagtail.moderation.approve",
+    "wagtail.workflow.approve",
+)
+
+
+def _revision_references():
+    """A values() queryset of revision ids for each foreign key to Revision."""
+    for model in apps.get_models():
+        if model._meta.proxy:
+            continue
+        for field in model._meta.local_concrete_fields:
+            if isinstance(field, models.ForeignKey) and field.related_model is Revision:
+                references = model._base_manager.filter(**{f"{field.attname}__isnull": False})
+                if issubclass(model, BaseLogEntry):
+                    references = references.filter(action__in=PROTECTED_LOG_ACTIONS)
+                yield references.values(field.attname)
+
+
+def _protected():
+    """Revisions that must be kept whatever their age."""
+    protected = Q(approved_go_live_at__isnull=False)
+    for references in _revision_references():
+        protected |= Q(pk__in=references)
+    return protected
+
+
+def prunable_revisions(keep=PRUNE_KEEP):
+    """Revisions older than the newest `keep` of their object that nothing refers to."""
+    ranked = Revision.objects.annotate(
+        position=Window(
+            RowNumber(),
+            partition_by=[F("base_content_type_id"), F("object_id")],
+            order_by=[F("created_at").desc(), F("pk").desc()],
+        )
+    ).filter(position__gt=keep).values("pk")
+    return Revision.objects.filter(pk__in=ranked).exclude(_protected())
+
+
+def estimate_size(revisions):
+    """(count, bytes of revision JSON) for a Revision queryset."""
+    stats = revisions.aggregate(
+        count=models.Count("pk"),
+        size=Sum(Length(Cast("content", models.TextField()))),
+    )
+    return stats["count"], stats["size"] or 0
+
+
+def prune_revisions(keep=PRUNE_KEEP, batch_size=PRUNE_BATCH_SIZE):
+    """Delete prunable revisions a batch at a time, yielding the running total."""
+    # The window ranking scans the whole table, so it runs once; each batch
+    # only re-checks the (indexed) references, in case one appeared since
+    candidates = list(prunable_revisions(keep).order_by("pk").values_list("pk", flat=True))
+    deleted = 0
+    for start in range(0, len(candidates), batch_size):
+        batch = Revision.objects.filter(pk__in=candidates[start:start + batch_size]).exclude(_protected())
+        deleted += batch.delete()[1].get(Revision._meta.label, 0)
+        yield deleted
@@ -0,0 +1,153 @@
+# blog/signals.py
+from functools import partial
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from wagtail.images import get_image_model
+from wagtail.models import Page
+from wagtail.signals import page_published, page_unpublished, post_page_move
+
+from .cache import bump_content_version, on_commit_once
+from .models import ArticleType, Author, Location, PageTombstone, Poll, Sector
+from .sitemaps import get_shard, get_sitemap_root
+from .snapshots import get_snapshot_root
+from .streamfield import bump_dependency, dependency_key
+from .taxonomy import clear_taxonomies
+from .tasks import (
+    export_api_snapshots_task, generate_image_renditions_task, generate_page_renditions_task,
+    update_sitemap_shards_task, warm_page_embeds_task,
+)
+
+
+# ----------------------------
+# Content version for publish-invalidated caches
+# ----------------------------
+@receiver(page_published)
+@receiver(page_unpublished)
+@receiver(post_delete, sender=Page)
+def bump_version_on_change(sender, instance, **kwargs):
+    on_commit_once("content-version", bump_content_version)
+
+
+# ----------------------------
+# Cached StreamField bodies referencing the changed object
+# ----------------------------
+@receiver(page_published)
+@receiver(page_unpublished)
+@receiver(post_page_move)
+@receiver(post_delete, sender=Page)
+@receiver(post_save, sender=get_image_model())
+@receiver(post_delete, sender=get_image_model())
+@receiver(post_save, sender=Poll)
+@receiver(post_delete, sender=Poll)
+def bump_stream_dependency(sender, instance, **kwargs):
+    key = dependency_key(type(instance), instance.pk)
+    on_commit_once(key, partial(bump_dependency, type(instance), instance.pk))
+
+
+# ----------------------------
+# Tombstones for the API delta-sync mode
+# ----------------------------
+def _record_tombstone(page, reason):
+    PageTombstone.objects.update_or_create(
+        page_id=page.pk,
+        defaults={
+            "content_type_id": page.content_type_id,
+            "url_path": page.url_path,
+            "reason": reason,
+            "removed_at": timezone.now(),
+        },
+    )
+
+
+@receiver(page_unpublished)
+def tombstone_unpublished_page(sender, instance, **kwargs):
+    _record_tombstone(instance, PageTombstone.REASON_UNPUBLISHED)
+
+
+@receiver(post_delete, sender=Page)
+def tombstone_deleted_page(sender, instance, **kwargs):
+    # Pages that were never published were never visible to API consumers
+    if instance.first_published_at:
+        _record_tombstone(instance, PageTombstone.REASON_DELETED)
+
+
+@receiver(page_published)
+def clear_tombstone_on_publish(sender, instance, **kwargs):
+    PageTombstone.objects.filter(page_id=instance.pk).delete()
+
+
+# ----------------------------
+# API image renditions
+# ----------------------------
+@receiver(page_published)
+def generate_renditions_on_publish(sender, instance, **kwargs):
+    on_commit_once(("renditions", instance.pk), partial(generate_page_renditions_task.enqueue, instance.pk))
+
+
+@receiver(post_save, sender=get_image_model())
+def generate_renditions_on_image_save(sender, instance, **kwargs):
+    # A new file or focal point leaves the existing renditions unused
+    key = ("image-renditions", instance.pk)
+    on_commit_once(key, partial(generate_image_renditions_task.enqueue, instance.pk))
+
+
+# ----------------------------
+# oEmbed warm-up
+# ----------------------------
+@receiver(page_published)
+def warm_embeds_on_publish(sender, instance, **kwargs):
+    on_commit_once(("embeds", instance.pk), partial(warm_page_embeds_task.enqueue, instance.pk))
+
+
+# ----------------------------
+# Static API snapshots
+# ----------------------------
+@receiver(page_published)
+@receiver(page_unpublished)
+@receiver(post_delete, sender=Page)
+def refresh_api_snapshots(sender, instance, **kwargs):
+    if get_snapshot_root():
+        on_commit_once("api-snapshots", export_api_snapshots_task.enqueue)
+
+
+# ----------------------------
+# Incremental sitemaps
+# ----------------------------
+def _enqueue_sitemap_update(shards):
+    if get_sitemap_root():
+        key = ("sitemap", *(tuple(shard) for shard in shards))
+        on_commit_once(key, partial(update_sitemap_shards_task.enqueue, shards))
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+@receiver(post_delete, sender=Page)
+def update_page_sitemap(sender, instance, **kwargs):
+    shards = [["pages", get_shard(instance.pk)]]
+    author_id = getattr(instance, "author_profile_id", None)
+    if author_id:
+        # The author's lastmod follows their latest post
+        shards.append(["authors", get_shard(author_id)])
+    _enqueue_sitemap_update(shards)
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+def update_author_sitemap(sender, instance, **kwargs):
+    _enqueue_sitemap_update([["authors", get_shard(instance.pk)]])
+
+
+# ----------------------------
+# Cached taxonomy lists
+# ----------------------------
+@receiver(post_save, sender=ArticleType)
+@receiver(post_delete, sender=ArticleType)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_save, sender=Sector)
+@receiver(post_delete, sender=Sector)
+def clear_taxonomy_cache(sender, instance, **kwargs):
+    on_commit_once("taxonomies", clear_taxonomies)
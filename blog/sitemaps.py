@@ -0,0 +1,238 @@
+# blog/sitemaps.py
+"""
+XML sitemaps written to disk for nginx.
+
+URLs are split into shards of SITEMAP_SHARD_SIZE entries by primary key
+(page 1234567 lives in sitemap-pages-24.xml), so publishing a page only
+rebuilds the one shard that contains it plus the small sitemap index.
+Author profiles get their own shards. `manage.py build_sitemaps` does a
+full rebuild.
+
+nginx serves only the public/ subdirectory of BLOG_SITEMAP_ROOT; the
+lock file and the per-shard sidecars stay one level up.
+"""
+import gzip
+import json
+import os
+from contextlib import contextmanager
+from types import SimpleNamespace
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Max
+from django.urls import reverse
+from django.utils import timezone
+
+from wagtail.models import Page, Site
+
+from .models import ArticlePage, Author, BlogPage
+from .snapshots import atomic_write
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines
+    fcntl = None
+
+
+SITEMAP_SHARD_SIZE = 50000
+SITEMAP_INDEX_NAME = "sitemap.xml"
+SITEMAP_PUBLIC_DIR = "public"
+SITEMAP_KINDS = ("pages", "authors")
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+
+def get_sitemap_root():
+    return getattr(settings, "BLOG_SITEMAP_ROOT", None)
+
+
+def get_shard(pk):
+    return pk // SITEMAP_SHARD_SIZE
+
+
+def shard_name(kind, shard):
+    return f"sitemap-{kind}-{shard}.xml"
+
+
+def public_dir(root):
+    """Where the XML files nginx serves are written."""
+    return os.path.join(root, SITEMAP_PUBLIC_DIR)
+
+
+def _base_url():
+    site = Site.objects.filter(is_default_site=True).first()
+    return site.root_url if site else ""
+
+
+@contextmanager
+def _locked(root):
+    """Serialise concurrent shard/index updates from several workers."""
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, ".lock"), "w") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+# ----------------------------
+# Collecting URLs
+# ----------------------------
+def page_entries(shard):
+    """(loc, lastmod) for every live, public page in one shard."""
+    pages = (
+        Page.objects.live().public()
+        .filter(pk__gte=shard * SITEMAP_SHARD_SIZE, pk__lt=(shard + 1) * SITEMAP_SHARD_SIZE)
+        .only("id", "url_path", "last_published_at", "locale_id")
+        .order_by("id")
+    )
+    # Stands in for a request, so Site.get_site_root_paths() (a cache
+    # lookup) runs once per shard rather than once per page
+    site_root_paths = SimpleNamespace(_wagtail_cached_site_root_paths=Site.get_site_root_paths())
+    for page in pages.iterator(chunk_size=2000):
+        url = page.get_full_url(site_root_paths)
+        if url:
+            yield url, page.last_published_at
+
+
+def author_entries(shard):
+    """(loc, lastmod) for every author, lastmod being their latest live post."""
+    authors = Author.objects.filter(
+        pk__gte=shard * SITEMAP_SHARD_SIZE, pk__lt=(shard + 1) * SITEMAP_SHARD_SIZE
+    )
+    latest = {}
+    for model in (ArticlePage, BlogPage):
+        rows = (
+            model.objects.live().filter(author_profile__in=authors)
+            .values("author_profile_id")
+            .annotate(latest=Max("last_published_at"))
+        )
+        for row in rows:
+            current = latest.get(row["author_profile_id"])
+            if current is None or row["latest"] > current:
+                latest[row["author_profile_id"]] = row["latest"]
+
+    base_url = _base_url()
+    for author_id in authors.order_by("id").values_list("id", flat=True):
+        yield base_url + reverse("author_profile_by_id", args=[author_id]), latest.get(author_id)
+
+
+ENTRY_SOURCES = {
+    "pages": page_entries,
+    "authors": author_entries,
+}
+
+
+def existing_shards(kind):
+    """Shard numbers that currently hold at least one object of `kind`."""
+    if kind == "pages":
+        ids = Page.objects.live().values_list("id", flat=True)
+    else:
+        ids = Author.objects.values_list("id", flat=True)
+    last_id = ids.order_by("-id").first()
+    return range(get_shard(last_id) + 1) if last_id is not None else range(0)
+
+
+# ----------------------------
+# Writing files
+# ----------------------------
+def _write_xml(root, name, xml):
+    data = xml.encode("utf-8")
+    mtime = timezone.now().timestamp()
+    path = os.path.join(public_dir(root), name)
+    atomic_write(path + ".gz", gzip.compress(data, mtime=0), mtime)
+    atomic_write(path, data, mtime)
+
+
+def _remove_xml(root, name):
+    for path in (os.path.join(public_dir(root), name), os.path.join(public_dir(root), name + ".gz")):
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def write_shard(root, kind, shard):
+    """Rebuild one shard. Empty shards are removed. Returns the URL count."""
+    lines = [XML_HEADER, f'<urlset xmlns="{SITEMAP_NS}">\n']
+    count = 0
+    lastmod = None
+    for loc, modified in ENTRY_SOURCES[kind](shard):
+        lines.append(f"<url><loc>{escape(loc)}</loc>")
+        if modified:
+            lines.append(f"<lastmod>{modified.isoformat()}</lastmod>")
+            lastmod = max(lastmod, modified) if lastmod else modified
+        lines.append("</url>\n")
+        count += 1
+    lines.append("</urlset>\n")
+
+    name = shard_name(kind, shard)
+    meta_path = os.path.join(root, name + ".json")
+    if not count:
+        _remove_xml(root, name)
+        if os.path.exists(meta_path):
+            os.unlink(meta_path)
+        return 0
+
+    _write_xml(root, name, "".join(lines))
+    # The index is rebuilt from these small sidecar files, never by
+    # re-reading every shard
+    meta = {"count": count, "lastmod": lastmod.isoformat() if lastmod else None}
+    atomic_write(meta_path, json.dumps(meta).encode(), timezone.now().timestamp())
+    return count
+
+
+def write_index(root):
+    shards = sorted(
+        (name[:-len(".json")] for name in os.listdir(root)
+         if name.startswith("sitemap-") and name.endswith(".xml.json")),
+        key=lambda name: (name.rsplit("-", 1)[0], int(name.rsplit("-", 1)[1][:-len(".xml")])),
+    )
+    base_url = _base_url()
+    lines = [XML_HEADER, f'<sitemapindex xmlns="{SITEMAP_NS}">\n']
+    for name in shards:
+        with open(os.path.join(root, name + ".json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        lines.append(f"<sitemap><loc>{escape(base_url)}/sitemaps/{name}</loc>")
+        if meta.get("lastmod"):
+            lines.append(f"<lastmod>{meta['lastmod']}</lastmod>")
+        lines.append("</sitemap>\n")
+    lines.append("</sitemapindex>\n")
+    _write_xml(root, SITEMAP_INDEX_NAME, "".join(lines))
+
+
+def update_sitemap_shards(shards, root=None):
+    """Rebuild the given (kind, shard) pairs and the index."""
+    root = root or get_sitemap_root()
+    if not root:
+        return
+    with _locked(root):
+        for kind, shard in shards:
+            write_shard(root, kind, shard)
+        write_index(root)
+
+
+def build_sitemaps(root=None):
+    """Full rebuild of every shard and the index. Returns {file name: URL count}."""
+    root = root or get_sitemap_root()
+    if not root:
+        return {}
+    counts = {}
+    with _locked(root):
+        for kind in SITEMAP_KINDS:
+            for shard in existing_shards(kind):
+                count = write_shard(root, kind, shard)
+                if count:
+                    counts[shard_name(kind, shard)] = count
+
+        # Drop shards left over from objects that no longer exist
+        for name in os.listdir(root):
+            if name.startswith("sitemap-") and name.endswith(".xml.json"):
+                if name[:-len(".json")] not in counts:
+                    _remove_xml(root, name[:-len(".json")])
+                    os.unlink(os.path.join(root, name))
+
+        write_index(root)
+    return counts
@@ -0,0 +1,157 @@
+# blog/snapshots.py
+"""
+Pre-rendered JSON snapshots of the busiest public API listings.
+
+The snapshots are rendered through the real API views, written next to
+.gz copies, and served by nginx (gzip_static) straight from
+BLOG_API_SNAPSHOT_ROOT, so those requests never reach gunicorn. Every
+file is replaced atomically and a manifest.json records what was
+exported.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+from django.conf import settings
+from django.test import RequestFactory
+from django.urls import resolve
+from django.utils import timezone
+
+from wagtail.models import Site
+
+logger = logging.getLogger(__name__)
+
+
+# snapshot name -> API path. Override with BLOG_API_SNAPSHOTS.
+DEFAULT_API_SNAPSHOTS = {
+    "blog/latest": "/api/v2/blog/",
+    "key-facts/latest": "/api/v2/feed/?type=blog.KeyFactsPage",
+    "pages/menu": "/api/v2/pages/?show_in_menus=true&fields=_,id,title,html_url",
+}
+
+MANIFEST_NAME = "manifest.json"
+
+
+def get_snapshot_root():
+    return getattr(settings, "BLOG_API_SNAPSHOT_ROOT", None)
+
+
+def get_api_snapshots():
+    return getattr(settings, "BLOG_API_SNAPSHOTS", DEFAULT_API_SNAPSHOTS)
+
+
+def render_api_path(api_path, site=None):
+    """Render an API URL through its view, as the public site would."""
+    site = site or Site.objects.filter(is_default_site=True).first()
+    factory = RequestFactory(
+        SERVER_NAME=site.hostname if site else "localhost",
+        SERVER_PORT=str(site.port) if site else "80",
+    )
+    request = factory.get(api_path, secure=bool(site and site.port == 443))
+
+    match = resolve(request.path_info)
+    response = match.func(request, *match.args, **match.kwargs)
+    if hasattr(response, "render"):
+        response.render()
+    return response
+
+
+def atomic_write(path, data, mtime):
+    """Write `data` to a temp file in the same directory, then rename it over `path`."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        # nginx serves the .json and its compressed siblings with the same
+        # Last-Modified, so give them all the same mtime
+        os.utime(tmp_path, (mtime, mtime))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _load_manifest(root):
+    try:
+        with open(os.path.join(root, MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"snapshots": {}}
+
+
+def export_api_snapshots(root=None, force=False):
+    """
+    Render every configured snapshot and write the ones that changed.
+
+    Returns a dict of name -> "written", "unchanged" or "failed".
+    """
+    root = root or get_snapshot_root()
+    if not root:
+        return {}
+
+    manifest = _load_manifest(root)
+    previous = manifest.get("snapshots", {})
+    snapshots = {}
+    results = {}
+    site = Site.objects.filter(is_default_site=True).first()
+
+    for name, api_path in get_api_snapshots().items():
+        try:
+            response = render_api_path(api_path, site=site)
+        except Exception:
+            logger.exception("Could not render API snapshot %s", name)
+            response = None
+
+        if response is None or response.status_code != 200:
+            # Keep serving the last good snapshot
+            if name in previous:
+                snapshots[name] = previous[name]
+            results[name] = "failed"
+            continue
+
+        body = response.content
+        digest = hashlib.sha256(body).hexdigest()
+        path = os.path.join(root, f"{name}.json")
+
+        if not force and previous.get(name, {}).get("sha256") == digest and os.path.exists(path):
+            # Unchanged content keeps its mtime, so client ETags stay valid
+            snapshots[name] = previous[name]
+            results[name] = "unchanged"
+            continue
+
+        mtime = timezone.now().timestamp()
+        entry = {
+            "source": api_path,
+            "path": f"{name}.json",
+            "sha256": digest,
+            "size": len(body),
+            "updated_at": timezone.now().isoformat(),
+        }
+
+        # Compressed copy first: the plain .json is what nginx checks for
+        compressed = gzip.compress(body, compresslevel=9, mtime=0)
+        atomic_write(path + ".gz", compressed, mtime)
+        entry["gzip_size"] = len(compressed)
+        atomic_write(path, body, mtime)
+
+        snapshots[name] = entry
+        results[name] = "written"
+
+    manifest = {
+        "generated_at": timezone.now().isoformat(),
+        "snapshots": snapshots,
+    }
+    atomic_write(
+        os.path.join(root, MANIFEST_NAME),
+        json.dumps(manifest, indent=2, sort_keys=True).encode(),
+        timezone.now().timestamp(),
+    )
+    return results
@@ -0,0 +1,286 @@
+# blog/streamfield.py
+"""
+StreamField helpers.
+
+Article bodies are rendered once per live revision and language and the
+HTML is cached (render_stream_html). A revision's own content never
+changes, but the pages, images and polls it points at can; every cached
+body therefore records the version of each object it references, and a
+change to any of them (see blog/signals.py) makes the entry stale.
+
+References are read from the raw JSON of the stream, so collecting them
+costs no queries. preload_stream() uses them to load every referenced
+page, image and snippet up front, one query per model, instead of letting
+each chooser block look up its own target.
+"""
+import copy
+import time
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import models
+from django.utils import translation
+from django.utils.html import format_html_join
+from django.utils.safestring import mark_safe
+
+from wagtail import blocks
+from wagtail.blocks.list_block import ListValue
+from wagtail.blocks.stream_block import StreamValue
+from wagtail.fields import StreamField
+from wagtail.images import get_image_model
+from wagtail.models import Page
+from wagtail.rich_text.rewriters import FIND_A_TAG, FIND_EMBED_TAG, extract_attrs
+
+BODY_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+# ----------------------------
+# Collecting references
+# ----------------------------
+def _reference_model(model):
+    """Specific page types are all tracked as wagtailcore.Page."""
+    if issubclass(model, Page):
+        return Page
+    return model
+
+
+def stream_field_names(model):
+    return [field.name for field in model._meta.get_fields() if isinstance(field, StreamField)]
+
+
+def _rich_text_references(html):
+    for match in FIND_A_TAG.finditer(html):
+        attrs = extract_attrs(match.group(1))
+        if attrs.get("linktype") == "page" and attrs.get("id", "").isdigit():
+            yield Page, int(attrs["id"])
+    for match in FIND_EMBED_TAG.finditer(html):
+        attrs = extract_attrs(match.group(1))
+        if attrs.get("embedtype") == "image" and attrs.get("id", "").isdigit():
+            yield get_image_model(), int(attrs["id"])
+
+
+def _walk_block(block, value):
+    if value in (None, "", [], {}):
+        return
+
+    if isinstance(block, blocks.StructBlock):
+        if isinstance(value, dict):
+            for name, child_block in block.child_blocks.items():
+                yield from _walk_block(child_block, value.get(name))
+
+    elif isinstance(block, blocks.ListBlock):
+        for item in value:
+            # Newer ListBlock data wraps each item as {"type": "item", "value": ...}
+            if isinstance(item, dict) and item.get("type") == "item" and "value" in item:
+                item = item["value"]
+            yield from _walk_block(block.child_block, item)
+
+    elif isinstance(block, blocks.StreamBlock):
+        yield from walk_stream(block, value)
+
+    else:
+        yield block, value
+
+
+def walk_stream(stream_block, raw_data):
+    """Yield (block, raw value) for every non-empty leaf block in raw stream data."""
+    for item in raw_data:
+        child_block = stream_block.child_blocks.get(item.get("type"))
+        if child_block is not None:
+            yield from _walk_block(child_block, item.get("value"))
+
+
+def stream_references(stream_block, raw_data):
+    """Yield (model, pk) for every object referenced by raw stream data."""
+    for block, value in walk_stream(stream_block, raw_data):
+        if isinstance(block, blocks.ChooserBlock):
+            pk = value.get("id") if isinstance(value, dict) else value
+            if isinstance(pk, int) or (isinstance(pk, str) and pk.isdigit()):
+                yield _reference_model(block.target_model), int(pk)
+        elif isinstance(block, blocks.RichTextBlock) and isinstance(value, str):
+            yield from _rich_text_references(value)
+
+
+def collect_references(stream_value):
+    """{model: {pk, ...}} for every page, image and snippet a StreamValue points at."""
+    references = {}
+    for model, pk in stream_references(stream_value.stream_block, stream_value.raw_data):
+        references.setdefault(model, set()).add(pk)
+    return references
+
+
+# ----------------------------
+# Preloading references
+# ----------------------------
+def thumbnail_fields(model):
+    """Forward foreign keys from `model` to the image model, for select_related()."""
+    image_model = get_image_model()
+    return [
+        field.name for field in model._meta.get_fields()
+        if isinstance(field, models.ForeignKey) and field.related_model is image_model
+    ]
+
+
+def _load_pages(pks):
+    """Specific pages with their images joined in: one query per page type, plus one."""
+    by_type = defaultdict(list)
+    for pk, content_type_id in Page.objects.filter(pk__in=pks).values_list("pk", "content_type_id"):
+        by_type[content_type_id].append(pk)
+
+    pages = {}
+    for content_type_id, type_pks in by_type.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model is None:
+            continue
+        pages.update(
+            model.objects.filter(pk__in=type_pks).select_related(*thumbnail_fields(model)).in_bulk()
+        )
+    return pages
+
+
+def load_references(references):
+    """{model: {pk: instance}} for the output of collect_references()."""
+    image_model = get_image_model()
+    loaded = {}
+    for model, pks in references.items():
+        if model is Page:
+            loaded[model] = _load_pages(pks)
+        elif model is image_model:
+            loaded[model] = model.objects.filter(pk__in=pks).prefetch_renditions().in_bulk()
+        else:
+            loaded[model] = model.objects.in_bulk(pks)
+    return loaded
+
+
+class _Resolver:
+    """Convert raw block data to native values using preloaded instances."""
+
+    def __init__(self, loaded):
+        self.loaded = loaded
+        self.seen = set()
+
+    def chooser(self, block, value):
+        pk = value.get("id") if isinstance(value, dict) else value
+        try:
+            pk = int(pk)
+        except (TypeError, ValueError):
+            return None
+        instance = self.loaded.get(_reference_model(block.target_model), {}).get(pk)
+        if instance is None or not isinstance(instance, block.target_model):
+            return None
+        if (block.target_model, pk) in self.seen:
+            # Like ChooserBlock.bulk_to_python: every occurrence gets its own instance
+            return copy.copy(instance)
+        self.seen.add((block.target_model, pk))
+        return instance
+
+    def to_python(self, block, value):
+        if isinstance(block, blocks.ChooserBlock):
+            return self.chooser(block, value)
+
+        # Subclasses with their own conversion (e.g. ImageBlock) keep it
+        if isinstance(block, blocks.StructBlock) and type(block).to_python is blocks.StructBlock.to_python:
+            return block._to_struct_value([
+                (name, self.to_python(child_block, value[name]) if name in value else child_block.get_default())
+                for name, child_block in block.child_blocks.items()
+            ])
+
+        if isinstance(block, blocks.ListBlock) and type(block).to_python is blocks.ListBlock.to_python:
+            children = []
+            for item in value:
+                item_id = None
+                if isinstance(item, dict) and item.get("type") == "item" and "value" in item:
+                    item_id, item = item.get("id"), item["value"]
+                children.append(ListValue.ListChild(
+                    block.child_block, self.to_python(block.child_block, item), id=item_id
+                ))
+            return ListValue(block, bound_blocks=children)
+
+        if isinstance(block, blocks.StreamBlock) and type(block).to_python is blocks.StreamBlock.to_python:
+            return self.stream(block, value)
+
+        return block.to_python(value)
+
+    def stream(self, stream_block, raw_data):
+        return StreamValue(stream_block, [
+            (item["type"], self.to_python(stream_block.child_blocks[item["type"]], item.get("value")), item.get("id"))
+            for item in raw_data
+            if item.get("type") in stream_block.child_blocks
+        ], is_lazy=False)
+
+
+def preload_stream(stream_value, references=None):
+    """
+    Return a copy of `stream_value` with every chooser already resolved.
+
+    All referenced pages, images and snippets are loaded in one query per
+    model (pages: per page type) rather than by each block on its own.
+    """
+    if references is None:
+        references = collect_references(stream_value)
+    resolver = _Resolver(load_references(references))
+    return resolver.stream(stream_value.stream_block, stream_value.raw_data)
+
+
+# ----------------------------
+# Dependency versions
+# ----------------------------
+def dependency_key(model, pk):
+    return f"blog:dep:{_reference_model(model)._meta.label_lower}:{pk}"
+
+
+def bump_dependency(model, pk):
+    """Invalidate every cached body that references this object."""
+    cache.set(dependency_key(model, pk), time.time_ns(), None)
+
+
+def get_dependency_versions(keys):
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        # Like the content version, a fresh key starts at the current time,
+        # so an evicted version can never match an older cached body
+        now = time.time_ns()
+        for key in missing:
+            cache.add(key, now, None)
+        versions.update(cache.get_many(missing))
+    return versions
+
+
+# ----------------------------
+# Cached rendering
+# ----------------------------
+def _render_blocks(stream_value, context):
+    return format_html_join(
+        "", "{}", ((child.render_as_block(context=context),) for child in stream_value)
+    )
+
+
+def render_stream_html(page, field_name, context, request=None):
+    """
+    Render a StreamField of `page` like `{% include_block %}` on each block.
+
+    The result is cached per live revision, language and field. Previews
+    and pages without a live revision are always rendered fresh.
+    """
+    stream_value = getattr(page, field_name)
+    revision_id = page.live_revision_id
+    if not revision_id or getattr(request, "is_preview", False):
+        return _render_blocks(preload_stream(stream_value), context)
+
+    key = f"blog:body:{page.pk}:{revision_id}:{translation.get_language()}:{field_name}"
+    cached = cache.get(key)
+    if cached is not None:
+        versions = get_dependency_versions(list(cached["deps"]))
+        if versions == cached["deps"]:
+            return mark_safe(cached["html"])
+
+    references = collect_references(stream_value)
+    dependency_keys = [dependency_key(model, pk) for model, pks in references.items() for pk in pks]
+    # Versions are read before rendering: a change that lands meanwhile
+    # leaves the new entry stale rather than wrongly fresh
+    versions = get_dependency_versions(dependency_keys)
+    html = _render_blocks(preload_stream(stream_value, references), context)
+    cache.set(key, {"html": str(html), "deps": versions}, BODY_CACHE_TIMEOUT)
+    return html
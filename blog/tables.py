@@ -0,0 +1,252 @@
+# blog/tables.py
+"""
+Fast rendering for DataTableBlock.
+
+A table is compiled once into escaped HTML rows and plain-text cells and
+cached under a hash of its content, so an unchanged table is never
+compiled twice, whichever revision or page it appears in. Pages render
+only the first DATA_TABLE_ROW_LIMIT rows; the rest are fetched on demand
+(table_rows_view). The CSV download (table_csv_view) is built from the
+same compiled cells.
+"""
+import csv
+import hashlib
+import io
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404, HttpResponse, JsonResponse
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.utils.html import escape, format_html
+from django.utils.safestring import mark_safe
+from django.utils.text import slugify
+from django.views.decorators.http import require_GET
+
+from wagtail.models import Page
+
+from .streamfield import stream_field_names
+
+DATA_TABLE_ROW_LIMIT = 50
+TABLE_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+TABLE_MAX_AGE = 60 * 60
+
+
+def get_row_limit():
+    """Rows rendered with the page; 0 renders every row."""
+    return getattr(settings, "BLOG_DATA_TABLE_ROW_LIMIT", DATA_TABLE_ROW_LIMIT)
+
+
+def table_hash(raw_value):
+    """Content hash of a DataTableBlock's raw (JSON) value."""
+    data = json.dumps(raw_value, sort_keys=True, default=str)
+    return hashlib.sha1(data.encode()).hexdigest()
+
+
+# ----------------------------
+# Compiling
+# ----------------------------
+def _cell_text(cell):
+    return "" if cell is None else str(cell).strip()
+
+
+def _cell_html(text):
+    return escape(text).replace("\r\n", "\n").replace("\n", "<br>")
+
+
+def _header_flags(raw_value, table):
+    headers = raw_value.get("table_headers")
+    if headers:
+        return headers in ("row", "both"), headers in ("column", "both")
+    return bool(table.get("first_row_is_table_header")), bool(table.get("first_col_is_header"))
+
+
+def _cell_attributes(table):
+    """Per-cell class/rowspan/colspan attributes and the cells hidden by merges."""
+    attributes = {}
+    for cell in table.get("cell") or []:
+        if cell.get("className"):
+            attributes.setdefault((cell["row"], cell["col"]), []).append(
+                format_html(' class="{}"', cell["className"])
+            )
+
+    hidden = set()
+    for merge in table.get("mergedCells") or []:
+        row, col = merge["row"], merge["col"]
+        rowspan, colspan = merge.get("rowspan", 1), merge.get("colspan", 1)
+        spans = attributes.setdefault((row, col), [])
+        if rowspan > 1:
+            spans.append(format_html(' rowspan="{}"', rowspan))
+        if colspan > 1:
+            spans.append(format_html(' colspan="{}"', colspan))
+        hidden.update(
+            (r, c) for r in range(row, row + rowspan) for c in range(col, col + colspan)
+            if (r, c) != (row, col)
+        )
+    return {key: "".join(values) for key, values in attributes.items()}, hidden
+
+
+def _row_html(row_index, cells, first_col_is_header, attributes, hidden, header=False):
+    parts = ["<tr>"]
+    for col_index, text in enumerate(cells):
+        if (row_index, col_index) in hidden:
+            continue
+        attrs = attributes.get((row_index, col_index), "")
+        if header:
+            parts.append(f'<th scope="col"{attrs}>{_cell_html(text)}</th>')
+        elif first_col_is_header and col_index == 0:
+            parts.append(f'<th scope="row"{attrs}>{_cell_html(text)}</th>')
+        else:
+            parts.append(f"<td{attrs}>{_cell_html(text)}</td>")
+    parts.append("</tr>")
+    return "".join(parts)
+
+
+def compile_table(raw_value):
+    """
+    Compile a DataTableBlock raw value, or fetch it from the cache.
+
+    Returns {"hash", "title", "caption", "header", "rows", "header_html",
+    "rows_html"}; header/rows hold the plain cell text for CSV export.
+    """
+    digest = table_hash(raw_value)
+    key = f"blog:table:{digest}"
+    compiled = cache.get(key)
+    if compiled is not None:
+        return compiled
+
+    table = raw_value.get("table") or {}
+    data = [[_cell_text(cell) for cell in row or []] for row in table.get("data") or []]
+    first_row_is_header, first_col_is_header = _header_flags(raw_value, table)
+    attributes, hidden = _cell_attributes(table)
+
+    header, rows, offset = None, data, 0
+    if first_row_is_header and data:
+        header, rows, offset = data[0], data[1:], 1
+
+    compiled = {
+        "hash": digest,
+        "title": raw_value.get("title") or "",
+        "caption": raw_value.get("table_caption") or table.get("table_caption") or "",
+        "header": header,
+        "rows": rows,
+        "header_html": (
+            _row_html(0, header, first_col_is_header, attributes, hidden, header=True)
+            if header is not None else ""
+        ),
+        "rows_html": [
+            _row_html(index + offset, row, first_col_is_header, attributes, hidden)
+            for index, row in enumerate(rows)
+        ],
+    }
+    cache.set(key, compiled, TABLE_CACHE_TIMEOUT)
+    return compiled
+
+
+def render_table(compiled, limit=None):
+    """The <table> element with at most `limit` body rows."""
+    rows_html = compiled["rows_html"] if not limit else compiled["rows_html"][:limit]
+    parts = ['<table class="table data-table">']
+    if compiled["caption"]:
+        parts.append(f"<caption>{escape(compiled['caption'])}</caption>")
+    if compiled["header_html"]:
+        parts.append(f"<thead>{compiled['header_html']}</thead>")
+    parts.append(f"<tbody>{''.join(rows_html)}</tbody></table>")
+    return mark_safe("".join(parts))
+
+
+def table_csv(compiled):
+    output = io.StringIO()
+    writer = csv.writer(output)
+    if compiled["header"] is not None:
+        writer.writerow(compiled["header"])
+    writer.writerows(compiled["rows"])
+    return output.getvalue()
+
+
+def table_context(block, value, page=None):
+    """Template context for one DataTableBlock on `page`."""
+    raw_value = block.get_prep_value(value)
+    compiled = compile_table(raw_value)
+    row_count = len(compiled["rows"])
+    limit = get_row_limit()
+
+    context = {"table_html": render_table(compiled), "row_count": row_count}
+    if page is None or not page.pk:
+        # Previews of unsaved pages have nowhere to fetch rows from
+        return context
+
+    args = [page.pk, compiled["hash"]]
+    context["csv_url"] = reverse("data_table_csv", args=args)
+    if limit and row_count > limit:
+        context["table_html"] = render_table(compiled, limit)
+        context["rows_url"] = reverse("data_table_rows", args=args)
+        context["rows_shown"] = limit
+    return context
+
+
+# ----------------------------
+# Views
+# ----------------------------
+def _raw_tables(stream_value):
+    """Yield (block, raw value) for each DataTableBlock in a StreamValue, without converting it."""
+    from .models import DataTableBlock
+
+    for item in stream_value.raw_data:
+        child_block = stream_value.stream_block.child_blocks.get(item.get("type"))
+        if isinstance(child_block, DataTableBlock) and isinstance(item.get("value"), dict):
+            yield child_block, item["value"]
+
+
+def find_table(page_id, digest):
+    """
+    The compiled table with this hash on a live, public page, or 404.
+
+    Tables are matched on the raw stream data, so the rest of the body
+    (images, snippets, pages) is never converted. Only when stored data
+    predates a block option, and so hashes differently from what the
+    page rendered, is a table converted to compare its normalised form.
+    """
+    page = Page.objects.live().public().filter(pk=page_id).first()
+    if page is None:
+        raise Http404("Page not found")
+    page = page.specific
+
+    tables = [
+        table for name in stream_field_names(type(page)) for table in _raw_tables(getattr(page, name))
+    ]
+    for block, raw_value in tables:
+        if table_hash(raw_value) == digest:
+            return compile_table(raw_value)
+    for block, raw_value in tables:
+        raw_value = block.get_prep_value(block.to_python(raw_value))
+        if table_hash(raw_value) == digest:
+            return compile_table(raw_value)
+    raise Http404("Table not found")
+
+
+@require_GET
+def table_rows_view(request, page_id, digest):
+    compiled = find_table(page_id, digest)
+    try:
+        offset = max(0, int(request.GET.get("offset", get_row_limit())))
+        limit = max(1, int(request.GET.get("limit", len(compiled["rows_html"]))))
+    except ValueError:
+        return JsonResponse({"error": "Invalid offset or limit"}, status=400)
+
+    rows_html = compiled["rows_html"][offset:offset + limit]
+    next_offset = offset + limit if offset + limit < len(compiled["rows_html"]) else None
+    response = JsonResponse({"html": "".join(rows_html), "next": next_offset})
+    patch_cache_control(response, public=True, max_age=TABLE_MAX_AGE)
+    return response
+
+
+@require_GET
+def table_csv_view(request, page_id, digest):
+    compiled = find_table(page_id, digest)
+    response = HttpResponse(table_csv(compiled), content_type="text/csv; charset=utf-8")
+    filename = slugify(compiled["title"] or compiled["caption"]) or "table"
+    response["Content-Disposition"] = f'attachment; filename="{filename}.csv"'
+    patch_cache_control(response, public=True, max_age=TABLE_MAX_AGE)
+    return response
@@ -0,0 +1,56 @@
+# blog/tasks.py
+from django_tasks import task
+
+from wagtail.images import get_image_model
+from wagtail.models import Page
+
+from .embeds import page_embeds, warm_embeds
+from .polls import flush_poll_votes
+from .renditions import generate_api_renditions, get_page_images, image_is_used_by_live_page
+from .sitemaps import update_sitemap_shards
+from .snapshots import export_api_snapshots
+
+
+@task()
+def generate_page_renditions_task(page_id):
+    """Pre-generate the API image renditions for a newly published page."""
+    page = Page.objects.filter(pk=page_id).first()
+    if page is None:
+        return
+    generate_api_renditions(get_page_images(page.specific))
+
+
+@task()
+def generate_image_renditions_task(image_id):
+    """Regenerate the API renditions of a changed image that live pages show."""
+    image = get_image_model().objects.filter(pk=image_id).first()
+    if image is None or not image_is_used_by_live_page(image_id):
+        return
+    generate_api_renditions([image])
+
+
+@task()
+def warm_page_embeds_task(page_id):
+    """Resolve the embeds of a newly published page before anyone views it."""
+    page = Page.objects.filter(pk=page_id).first()
+    if page is None:
+        return
+    warm_embeds(page_embeds(page.specific), workers=1)
+
+
+@task()
+def export_api_snapshots_task():
+    """Refresh the static API snapshots after content changed."""
+    export_api_snapshots()
+
+
+@task()
+def update_sitemap_shards_task(shards):
+    """Rebuild the sitemap shards holding the changed objects, plus the index."""
+    update_sitemap_shards([tuple(shard) for shard in shards])
+
+
+@task()
+def flush_poll_votes_task():
+    """Move buffered poll votes into PollChoice.votes."""
+    flush_poll_votes()
@@ -0,0 +1,38 @@
+# blog/taxonomy.py
+"""
+Cached ArticleType, Location and Sector lists for filter sidebars.
+
+The lists change rarely and are read on every listing request, so they
+are cached until one of them is saved or deleted (see
+blog/signals.py). Filters resolve a slug against the cached list rather
+than querying or slugifying every row.
+"""
+from django.core.cache import cache
+
+from .models import ArticleType, Location, Sector
+
+# The entry never expires, so bump the version whenever its shape changes
+TAXONOMY_CACHE_KEY = "blog:taxonomies:v2"
+
+
+def get_taxonomies():
+    """{"article_types": [...], "locations": [...], "sectors": [...]}, each item {"id", "name", "slug"}."""
+    taxonomies = cache.get(TAXONOMY_CACHE_KEY)
+    if taxonomies is None:
+        taxonomies = {
+            "article_types": list(ArticleType.objects.order_by("name").values("id", "name", "slug")),
+            "locations": list(Location.objects.order_by("name").values("id", "name", "slug")),
+            "sectors": list(Sector.objects.order_by("name").values("id", "name", "slug")),
+        }
+        cache.set(TAXONOMY_CACHE_KEY, taxonomies, None)
+    return taxonomies
+
+
+def clear_taxonomies():
+    cache.delete(TAXONOMY_CACHE_KEY)
+
+
+def find_by_slug(items, slug):
+    if not slug:
+        return None
+    return next((item for item in items if item["slug"] == slug), None)
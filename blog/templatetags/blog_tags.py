@@ -0,0 +1,16 @@
+# blog/templatetags/blog_tags.py
+from django import template
+
+from ..streamfield import render_stream_html
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def stream_html(context, page, field_name="body"):
+    """
+    Cached equivalent of `{% for block in page.body %}{% include_block block %}`.
+
+    Usage: {% stream_html page "body" %}
+    """
+    return render_stream_html(page, field_name, context.flatten(), context.get("request"))
@@ -1,3 +1,1816 @@
-from django.test import TestCase
+import asyncio
+import base64
+import datetime
+import gzip
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import QuerySet
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import escape
+
+import requests
+from wagtail.blocks.stream_block import StreamValue
+from wagtail.embeds.models import Embed
+from wagtail.images.models import Image
+from wagtail.images.rect import Rect
+from wagtail.images.tests.utils import get_test_image_file
+from wagtail.models import Page, Site
+from wagtail.test.utils import WagtailPageTestCase
+
+from home.models import HomePage
+from .models import (
+    ArticlePage, ArticleType, Author, BlogIndexPage, BlogPage, KeyFactsPage, Location,
+    NewsIndexPage, Poll, PollChoice, PollVoteCounter,
+)
+from .bulk import BulkActionError, apply_bulk_action
+from .management.commands.import_assets import (
+    AssetDownloader, AssetManifest, AssetScraper, MissingCache, PageCache, WagtailUploader,
+)
+from .management.commands.import_assets import Command as ImportAssetsCommand
+from .management.commands.import_content import Command as ImportContentCommand
+from .cache import bump_content_version
+from .feeds import get_feed_payload
+from .forms import ContentBlockWidget
+from .legacy_blocks import render_blocks
+from .pagination import capped_count, keyset_paginate
+from . import poll_stream
+from .polls import flush_poll_votes, record_vote
+from .renditions import generate_api_renditions
+from .revisions import prune_revisions
+from .sitemaps import SITEMAP_SHARD_SIZE, build_sitemaps, update_sitemap_shards
+from .snapshots import export_api_snapshots
+from .tables import compile_table, find_table, table_csv_view, table_hash
+from .streamfield import collect_references, preload_stream, render_stream_html
+from .taxonomy import get_taxonomies
+
+
+class BlogTestMixin:
+    """
+    Shared page tree for blog tests: Root > Home > News.
+    """
+
+    def setUp(self):
+        root_page = Page.get_first_root_node()
+        self.homepage = HomePage(title="Home", slug="home-test")
+        root_page.add_child(instance=self.homepage)
+        Site.objects.create(hostname="testserver", root_page=self.homepage, is_default_site=True)
+        self.news_index = NewsIndexPage(title="News", slug="news")
+        self.homepage.add_child(instance=self.news_index)
+        self.blog_index = BlogIndexPage(title="Blog", slug="blog")
+        self.homepage.add_child(instance=self.blog_index)
+
+    def _create_page(self, parent, page, m2m=None):
+        parent.add_child(instance=page)
+        for field_name, values in (m2m or {}).items():
+            getattr(page, field_name).set(values)
+        page.save_revision().publish()
+        return page
+
+    def create_article(self, title, m2m=None, **kwargs):
+        kwargs.setdefault("date", datetime.date(2026, 1, 1))
+        kwargs.setdefault("intro", f"Intro for {title}")
+        return self._create_page(self.news_index, ArticlePage(title=title, **kwargs), m2m)
+
+    def create_blog_post(self, title, m2m=None, **kwargs):
+        kwargs.setdefault("date", datetime.date(2026, 1, 1))
+        kwargs.setdefault("intro", f"Intro for {title}")
+        return self._create_page(self.blog_index, BlogPage(title=title, **kwargs), m2m)
+
+    def create_key_fact(self, title, m2m=None, **kwargs):
+        return self._create_page(self.news_index, KeyFactsPage(title=title, **kwargs), m2m)
+
+
+class BlogAPIDeltaSyncTests(BlogTestMixin, WagtailPageTestCase):
+    """
+    Tests for the ?since= / ?cursor= delta-sync mode of the blog API.
+    """
+
+    def get_delta(self, **params):
+        response = self.client.get(reverse("wagtailapi:blog:listing"), params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_since_returns_changed_pages_in_publish_order(self):
+        first = self.create_article("First")
+        second = self.create_article("Second")
+
+        data = self.get_delta(since="2000-01-01T00:00:00Z")
+
+        self.assertEqual([item["id"] for item in data["items"]], [first.id, second.id])
+        self.assertEqual(data["deleted"], [])
+        self.assertFalse(data["meta"]["has_more"])
+
+    def test_cursor_walks_pages_and_reports_tombstones(self):
+        first = self.create_article("First")
+        second = self.create_article("Second")
+
+        page_one = self.get_delta(since="2000-01-01T00:00:00Z", limit=1)
+        self.assertEqual([item["id"] for item in page_one["items"]], [first.id])
+        self.assertTrue(page_one["meta"]["has_more"])
+
+        page_two = self.get_delta(cursor=page_one["meta"]["next_cursor"], limit=1)
+        self.assertEqual([item["id"] for item in page_two["items"]], [second.id])
+
+        # Nothing changed since the last cursor
+        sync_point = page_two["meta"]["next_cursor"]
+        self.assertEqual(self.get_delta(cursor=sync_point)["items"], [])
+
+        first.unpublish()
+        second.delete()
+
+        changes = self.get_delta(cursor=sync_point)
+        self.assertEqual(changes["items"], [])
+        self.assertEqual(
+            [(d["id"], d["reason"]) for d in changes["deleted"]],
+            [(first.id, "unpublished"), (second.id, "deleted")],
+        )
+
+    def test_republish_clears_tombstone(self):
+        article = self.create_article("Back again")
+        article.unpublish()
+        article.save_revision().publish()
+
+        data = self.get_delta(since="2000-01-01T00:00:00Z")
+        self.assertEqual([item["id"] for item in data["items"]], [article.id])
+        self.assertEqual(data["deleted"], [])
+
+    def test_invalid_parameters(self):
+        url = reverse("wagtailapi:blog:listing")
+        self.assertEqual(self.client.get(url, {"since": "yesterday"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"cursor": "not-a-cursor"}).status_code, 400)
+        for payload in ([{"dt": 1}, 5], [{"dt": "2026-02-30T00:00:00Z"}, 5]):
+            cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+            self.assertEqual(self.client.get(url, {"cursor": cursor}).status_code, 400)
+        self.assertEqual(
+            self.client.get(url, {"since": "2000-01-01T00:00:00Z", "offset": 10}).status_code,
+            400,
+        )
+
+
+class BlogAPIQueryCountTests(BlogTestMixin, WagtailPageTestCase):
+    """
+    The blog API must not issue per-item queries for taxonomy or image fields.
+    """
+
+    def setUp(self):
+        super().setUp()
+        news_type = ArticleType.objects.create(name="News")
+        europe = Location.objects.create(name="Europe")
+        image = Image.objects.create(title="Thumbnail", file=get_test_image_file())
+        for i in range(20):
+            self.create_article(
+                f"Article {i}",
+                m2m={"article_types": [news_type], "locations": [europe]},
+                tall_thumbnail=image,
+                wide_thumbnail=image,
+                page_header_image=image,
+                icon=image,
+            )
+
+    def test_listing_query_count_is_constant(self):
+        url = reverse("wagtailapi:blog:listing")
+        params = {"fields": "*"}
+        self.client.get(url, params)  # warm the site root paths cache
+
+        # count, view restrictions, site, pages (+ images and locale joined),
+        # renditions, then one prefetch each for article_types, locations and sectors
+        with self.assertNumQueries(8):
+            response = self.client.get(url, params)
+
+        items = response.json()["items"]
+        self.assertEqual(len(items), 20)
+        self.assertEqual(items[0]["wide_thumbnail"]["title"], "Thumbnail")
+        self.assertEqual(len(items[0]["article_types"]), 1)
+
+    def test_default_listing_skips_unrequested_relations(self):
+        url = reverse("wagtailapi:blog:listing")
+        self.client.get(url)
+
+        with self.assertNumQueries(4):
+            self.client.get(url)
+
+
+class APIImageRenditionTests(BlogTestMixin, WagtailPageTestCase):
+    """
+    Rendition URLs are served from renditions generated at publish time.
+    """
+
+    def setUp(self):
+        super().setUp()
+        # Wagtail caches renditions, which would outlive the rolled-back rows
+        cache.clear()
+        self.image = Image.objects.create(title="Thumbnail", file=get_test_image_file())
+
+    def get_renditions(self, article):
+        url = reverse("wagtailapi:blog:listing")
+        response = self.client.get(url, {"fields": "_,id,wide_thumbnail_renditions"})
+        items = {item["id"]: item for item in response.json()["items"]}
+        return items[article.id]["wide_thumbnail_renditions"]
+
+    def test_publish_generates_renditions(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            article = self.create_article("With image", wide_thumbnail=self.image)
+
+        renditions = self.get_renditions(article)
+
+        self.assertEqual(set(renditions), {"card", "wide", "hero"})
+        self.assertTrue(all(url.startswith("http://testserver/") for url in renditions.values()))
+
+    @override_settings(TASKS={"default": {"BACKEND": "django_tasks.backends.database.DatabaseBackend"}})
+    def test_publish_leaves_renditions_to_the_worker(self):
+        from django_tasks.backends.database.models import DBTaskResult
+
+        with self.captureOnCommitCallbacks(execute=True):
+            article = self.create_article("With image", wide_thumbnail=self.image)
+
+        self.assertFalse(self.image.renditions.exists())
+        result = DBTaskResult.objects.get(task_path="blog.tasks.generate_page_renditions_task")
+        self.assertEqual(result.args_kwargs["args"], [article.id])
+
+    def test_new_focal_point_regenerates_renditions(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            article = self.create_article("With image", wide_thumbnail=self.image)
+        old_urls = self.get_renditions(article)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.image.set_focal_point(Rect(0, 0, 100, 100))
+            self.image.save()
+
+        new_urls = self.get_renditions(article)
+        self.assertTrue(all(new_urls.values()))
+        self.assertNotEqual(new_urls["card"], old_urls["card"])
+
+    def test_images_no_live_page_shows_are_left_alone(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.image.title = "Renamed"
+            self.image.save()
+
+        self.assertFalse(self.image.renditions.exists())
+
+    def test_backfill_command(self):
+        article = self.create_article("Published before renditions", wide_thumbnail=self.image)
+        self.assertEqual(self.get_renditions(article)["wide"], None)
+
+        call_command("generate_api_renditions", stdout=StringIO())
+
+        self.assertTrue(all(self.get_renditions(article).values()))
+
+    def test_api_never_generates_renditions(self):
+        article = self.create_article("With image", wide_thumbnail=self.image)
+        self.image.renditions.all().delete()
+
+        self.assertEqual(self.get_renditions(article), {"card": None, "wide": None, "hero": None})
+        self.assertFalse(self.image.renditions.exists())
+
+        generate_api_renditions([self.image])
+        self.assertEqual(self.image.renditions.count(), 3)
+        self.assertIsNotNone(self.get_renditions(article)["card"])
+
+
+class FeedAPITests(BlogTestMixin, WagtailPageTestCase):
+    """
+    Tests for the unified /api/v2/feed/ endpoint.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.news_type = ArticleType.objects.create(name="News")
+        self.europe = Location.objects.create(name="Europe")
+
+    def get_feed(self, **params):
+        response = self.client.get(reverse("wagtailapi:feed:listing"), params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_mixed_feed_is_date_ordered(self):
+        article = self.create_article("Article", date=datetime.date(2026, 1, 3))
+        post = self.create_blog_post("Post", date=datetime.date(2026, 1, 2))
+        fact = self.create_key_fact("Fact", date=datetime.date(2026, 1, 4))
+
+        data = self.get_feed()
+
+        self.assertEqual([item["id"] for item in data["items"]], [fact.id, article.id, post.id])
+        self.assertEqual(data["items"][0]["meta"]["type"], "blog.KeyFactsPage")
+
+    def test_filters_and_sparse_fields(self):
+        tagged = self.create_article(
+            "Tagged", m2m={"article_types": [self.news_type], "locations": [self.europe]}
+        )
+        self.create_article("Untagged")
+        self.create_key_fact("Fact", m2m={"article_types": [self.news_type]})
+
+        data = self.get_feed(location=self.europe.name, fields="_,title,locations")
+
+        self.assertEqual([item["id"] for item in data["items"]], [tagged.id])
+        self.assertEqual(
+            data["items"][0],
+            {
+                "id": tagged.id,
+                "meta": {},
+                "title": "Tagged",
+                "locations": [{"id": self.europe.id, "meta": {"type": "blog.Location"}, "name": "Europe"}],
+            },
+        )
+        self.assertEqual(len(self.get_feed(article_type=self.news_type.id)["items"]), 2)
+        self.assertEqual(len(self.get_feed(type="blog.KeyFactsPage")["items"]), 1)
+
+    def test_cursor_pagination(self):
+        pages = [
+            self.create_article(f"Article {day}", date=datetime.date(2026, 1, day))
+            for day in range(1, 6)
+        ]
+
+        seen = []
+        data = self.get_feed(limit=2)
+        seen += [item["id"] for item in data["items"]]
+        while data["meta"]["next_cursor"]:
+            data = self.get_feed(limit=2, cursor=data["meta"]["next_cursor"])
+            seen += [item["id"] for item in data["items"]]
+
+        self.assertEqual(seen, [page.id for page in reversed(pages)])
+
+    def test_tampered_cursor_is_a_bad_request(self):
+        for payload in (["nope"], [{"d": 1}, 5], [{"d": "2026-13-01"}, 5]):
+            cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+            response = self.client.get(reverse("wagtailapi:feed:listing"), {"cursor": cursor})
+            self.assertEqual(response.status_code, 400, payload)
+
+    def test_query_count_does_not_grow_with_items(self):
+        def create_batch(prefix):
+            m2m = {"article_types": [self.news_type], "locations": [self.europe]}
+            self.create_article(f"{prefix} article", m2m=m2m)
+            self.create_blog_post(f"{prefix} post", m2m=m2m)
+            self.create_key_fact(f"{prefix} fact", m2m={"article_types": [self.news_type]})
+
+        params = {"fields": "*"}
+        create_batch("First")
+        self.get_feed(**params)  # warm the content type and site caches
+
+        with CaptureQueriesContext(connection) as small:
+            self.get_feed(**params)
+        create_batch("Second")
+        create_batch("Third")
+        with CaptureQueriesContext(connection) as large:
+            data = self.get_feed(**params)
+
+        self.assertEqual(len(data["items"]), 9)
+        self.assertEqual(len(small), len(large))
+
+
+class APISnapshotTests(BlogTestMixin, WagtailPageTestCase):
+    """
+    Tests for the static JSON snapshots of the public API.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.root = self.tempdir.name
+
+    def read_manifest(self):
+        with open(os.path.join(self.root, "manifest.json")) as f:
+            return json.load(f)
+
+    def test_export_writes_compressed_snapshots_and_manifest(self):
+        article = self.create_article("Snapshot me")
+
+        call_command("export_api_snapshots", root=self.root, stdout=StringIO())
+
+        path = os.path.join(self.root, "blog", "latest.json")
+        with open(path, "rb") as f:
+            body = f.read()
+        with gzip.open(path + ".gz") as f:
+            self.assertEqual(f.read(), body)
+
+        self.assertEqual([item["id"] for item in json.loads(body)["items"]], [article.id])
+
+        manifest = self.read_manifest()
+        self.assertEqual(
+            set(manifest["snapshots"]), {"blog/latest", "key-facts/latest", "pages/menu"}
+        )
+        self.assertEqual(manifest["snapshots"]["blog/latest"]["size"], len(body))
+
+    def test_unchanged_snapshots_are_not_rewritten(self):
+        self.create_article("Snapshot me")
+        export_api_snapshots(root=self.root)
+        path = os.path.join(self.root, "blog", "latest.json")
+        os.utime(path, (0, 0))
+
+        self.assertEqual(export_api_snapshots(root=self.root)["blog/latest"], "unchanged")
+        self.assertEqual(os.stat(path).st_mtime, 0)
+
+        self.create_article("Another one")
+        self.assertEqual(export_api_snapshots(root=self.root)["blog/latest"], "written")
+        self.assertNotEqual(os.stat(path).st_mtime, 0)
+
+    def test_publish_refreshes_snapshots(self):
+        with override_settings(BLOG_API_SNAPSHOT_ROOT=self.root):
+            with self.captureOnCommitCallbacks(execute=True):
+                article = self.create_article("Fresh")
+
+        with open(os.path.join(self.root, "blog", "latest.json")) as f:
+            self.assertEqual(json.load(f)["items"][0]["id"], article.id)
+
+    @override_settings(TASKS={"default": {"BACKEND": "django_tasks.backends.database.DatabaseBackend"}})
+    def test_publish_leaves_snapshots_to_the_worker(self):
+        from django_tasks.backends.database.models import DBTaskResult
+
+        with override_settings(BLOG_API_SNAPSHOT_ROOT=self.root):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.create_article("Fresh")
+
+        self.assertFalse(os.path.exists(os.path.join(self.root, "blog", "latest.json")))
+        self.assertEqual(DBTaskResult.objects.filter(task_path="blog.tasks.export_api_snapshots_task").count(), 1)
+
+
+class SyndicationFeedTests(BlogTestMixin, WagtailPageTestCase):
+    """
+    Tests for the cached RSS/Atom/JSON feeds.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.news_type = ArticleType.objects.create(name="News")
+
+    def feed_url(self, section="news", fmt="rss"):
+        return reverse("blog_feed", args=[section, fmt])
+
+    def test_formats(self):
+        self.create_article("Tagged", m2m={"article_types": [self.news_type]})
+
+        rss = self.client.get(self.feed_url(fmt="rss"))
+        self.assertEqual(rss.status_code, 200)
+        self.assertIn(b"<rss", rss.content)
+        self.assertIn(b"<category>News</category>", rss.content)
+
+        atom = self.client.get(self.feed_url(fmt="atom"))
+        self.assertIn(b'xmlns="http://www.w3.org/2005/Atom"', atom.content)
+
+        data = self.client.get(self.feed_url(fmt="json")).json()
+        self.assertEqual(data["version"], "https://jsonfeed.org/version/1.1")
+        self.assertEqual([item["title"] for item in data["items"]], ["Tagged"])
+
+        with self.assertRaises(Http404):
+            get_feed_payload(RequestFactory().get("/"), "news", "txt")
+
+    def test_article_type_filter(self):
+        self.create_article("Tagged", m2m={"article_types": [self.news_type]})
+        self.create_article("Untagged")
+
+        data = self.client.get(self.feed_url(fmt="json"), {"type": "news"}).json()
+        self.assertEqual([item["title"] for item in data["items"]], ["Tagged"])
+        with self.assertRaises(Http404):
+            get_feed_payload(RequestFactory().get("/", {"type": "nope"}), "news", "rss")
+
+    def test_cached_until_publish_and_conditional_get(self):
+        self.create_article("First")
+        response = self.client.get(self.feed_url())
+        etag = response["ETag"]
+        self.assertTrue(response.has_header("Last-Modified"))
+
+        with self.assertNumQueries(0):
+            not_modified = self.client.get(self.feed_url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_article("Second")
+
+        response = self.client.get(self.feed_url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"Second", response.content)
+
+
+class SitemapTests(BlogTestMixin, WagtailPageTestCase):
+    """
+    Tests for the sharded on-disk sitemaps.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.root = self.tempdir.name
+
+    def read(self, name):
+        with open(os.path.join(self.root, "public", name), encoding="utf-8") as f:
+            return f.read()
+
+    def test_full_build_writes_shards_and_index(self):
+        author = Author.objects.create(name="Jane Doe")
+        article = self.create_article("Mapped", author_profile=author)
+        article.refresh_from_db()
+
+        counts = build_sitemaps(root=self.root)
+
+        self.assertEqual(set(counts), {"sitemap-pages-0.xml", "sitemap-authors-0.xml"})
+        pages = self.read("sitemap-pages-0.xml")
+        self.assertIn("<loc>http://testserver/news/mapped/</loc>", pages)
+        self.assertIn(f"<lastmod>{article.last_published_at.isoformat()}</lastmod>", pages)
+
+        authors = self.read("sitemap-authors-0.xml")
+        self.assertIn(f"/author/id/{author.id}/</loc>", authors)
+        self.assertIn(f"<lastmod>{article.last_published_at.isoformat()}</lastmod>", authors)
+
+        index = self.read("sitemap.xml")
+        self.assertIn("/sitemaps/sitemap-pages-0.xml</loc>", index)
+        self.assertIn("/sitemaps/sitemap-authors-0.xml</loc>", index)
+        # Only the XML is served; the lock and sidecars stay private
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.root, "public"))),
+            ["sitemap-authors-0.xml", "sitemap-authors-0.xml.gz", "sitemap-pages-0.xml",
+             "sitemap-pages-0.xml.gz", "sitemap.xml", "sitemap.xml.gz"],
+        )
+
+    def test_site_root_paths_are_looked_up_once_per_shard(self):
+        for i in range(5):
+            self.create_article(f"Mapped {i}")
+
+        with patch.object(Site, "get_site_root_paths", wraps=Site.get_site_root_paths) as lookup:
+            build_sitemaps(root=self.root)
+
+        self.assertEqual(lookup.call_count, 1)
+        pages = self.read("sitemap-pages-0.xml")
+        for i in range(5):
+            self.assertIn(f"<loc>http://testserver/news/mapped-{i}/</loc>", pages)
+
+    def test_incremental_update_only_touches_one_shard(self):
+        self.create_article("Mapped")
+        build_sitemaps(root=self.root)
+        # A shard for a far away id range that must be left alone
+        with open(os.path.join(self.root, "sitemap-pages-7.xml.json"), "w") as f:
+            json.dump({"count": 1, "lastmod": None}, f)
+
+        unpublished = self.create_article("Going away")
+        update_sitemap_shards([("pages", unpublished.pk // SITEMAP_SHARD_SIZE)], root=self.root)
+        self.assertIn("going-away", self.read("sitemap-pages-0.xml"))
+
+        unpublished.unpublish()
+        update_sitemap_shards([("pages", 0)], root=self.root)
+        self.assertNotIn("going-away", self.read("sitemap-pages-0.xml"))
+        self.assertIn("/sitemaps/sitemap-pages-7.xml</loc>", self.read("sitemap.xml"))
+
+    def test_publish_updates_sitemap(self):
+        with override_settings(BLOG_SITEMAP_ROOT=self.root):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.create_article("Fresh")
+
+        self.assertIn("/news/fresh/</loc>", self.read("sitemap-pages-0.xml"))
+        self.assertIn("sitemap-pages-0.xml", self.read("sitemap.xml"))
+
+
+class PollVotingTests(TestCase):
+    """
+    Tests for buffered poll voting.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.poll = Poll.objects.create(title="Do you pay cash?")
+        self.yes = PollChoice.objects.create(poll=self.poll, question="Yes")
+        self.no = PollChoice.objects.create(poll=self.poll, question="No")
+        self.vote_url = reverse("poll_vote", args=[self.poll.pk])
+        self.results_url = reverse("poll_results", args=[self.poll.pk])
+
+    def test_one_vote_per_visitor(self):
+        response = self.client.post(self.vote_url, {"choice": self.yes.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["voted"], self.yes.pk)
+
+        response = self.client.post(self.vote_url, {"choice": self.no.pk})
+        self.assertEqual(response.status_code, 409)
+
+        self.assertEqual(self.client.post(self.vote_url, {"choice": 0}).status_code, 400)
+        self.assertTrue(self.client.get(self.results_url).json()["voted"])
+
+    def test_votes_are_buffered_then_flushed(self):
+        for _ in range(30):
+            record_vote(self.yes.pk)
+        record_vote(self.no.pk)
+
+        self.yes.refresh_from_db()
+        self.assertEqual(self.yes.votes, 0)
+        self.assertLessEqual(PollVoteCounter.objects.filter(choice=self.yes).count(), 16)
+
+        self.assertEqual(flush_poll_votes(), 31)
+        self.assertEqual(flush_poll_votes(), 0)
+        self.yes.refresh_from_db()
+        self.assertEqual(self.yes.votes, 30)
+
+    def test_results_include_pending_votes_and_are_cached(self):
+        PollChoice.objects.filter(pk=self.no.pk).update(votes=1)
+        for _ in range(3):
+            record_vote(self.yes.pk)
+
+        results = self.client.get(self.results_url).json()["results"]
+        self.assertEqual(results["total"], 4)
+        self.assertEqual(
+            [(choice["question"], choice["percent"]) for choice in results["choices"]],
+            [("Yes", 75.0), ("No", 25.0)],
+        )
+
+        with self.assertNumQueries(0):
+            self.client.get(self.results_url)
+
+
+class PollStreamTests(TestCase):
+    """
+    Tests for the server-sent event poll result streams.
+    """
+
+    def test_watchers_share_one_aggregation_per_tick(self):
+        calls = []
+
+        def aggregate(poll_id):
+            calls.append(poll_id)
+            return {"poll": poll_id, "total": len(calls)}
+
+        async def watch_all():
+            broadcaster = poll_stream.PollBroadcaster(aggregate)
+            streams = [broadcaster.watch(1) for _ in range(50)]
+            first = await asyncio.gather(*(anext(stream) for stream in streams))
+            for stream in streams:
+                await stream.aclose()
+            return broadcaster, first
+
+        broadcaster, first = asyncio.run(watch_all())
+
+        self.assertEqual(calls, [1])
+        self.assertEqual(first, [{"poll": 1, "total": 1}] * 50)
+        self.assertEqual(broadcaster.channels[1].watchers, set())
+
+    def test_wsgi_request_gets_a_single_snapshot(self):
+        poll = Poll.objects.create(title="Do you pay cash?", results_title="Thanks!")
+        PollChoice.objects.create(poll=poll, question="Yes")
+
+        response = self.client.get(reverse("poll_results_stream", args=[poll.pk]))
+
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        body = b"".join(response.streaming_content).decode()
+        self.assertTrue(body.startswith("retry: "))
+        self.assertIn("event: results", body)
+        self.assertIn('"results_title": "Thanks!"', body)
+
+
+class StreamFieldCacheTests(BlogTestMixin, WagtailPageTestCase):
+    """
+    Tests for the per-revision rendered body cache.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.key_fact = self.create_key_fact("Cash facts", slug="cash-facts")
+        self.poll = Poll.objects.create(title="Do you pay cash?")
+        self.article = self.create_article("Linked", body=json.dumps([
+            {"type": "content", "value": {
+                "content": f'<p><a linktype="page" id="{self.key_fact.pk}">facts</a></p>',
+            }},
+            {"type": "poll", "value": {"poll": self.poll.pk}},
+        ]))
+
+    def render(self, page=None):
+        page = page or ArticlePage.objects.get(pk=self.article.pk)
+        return render_stream_html(page, "body", {"page": page})
+
+    def test_references_are_read_from_raw_data(self):
+        self.assertEqual(
+            collect_references(self.article.body),
+            {Page: {self.key_fact.pk}, Poll: {self.poll.pk}},
+        )
+
+    def test_second_render_is_served_from_cache(self):
+        html = self.render()
+        self.assertIn("/cash-facts/", html)
+        self.assertIn("Do you pay cash?", html)
+
+        page = ArticlePage.objects.get(pk=self.article.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.render(page), html)
+
+    def test_page_template_uses_cached_body(self):
+        post = self.create_blog_post("Post", body=json.dumps([
+            {"type": "poll", "value": {"poll": self.poll.pk}},
+        ]))
+
+        response = self.client.get(post.url)
+
+        self.assertContains(response, "Do you pay cash?")
+        post.refresh_from_db()
+        self.assertIsNotNone(cache.get(f"blog:body:{post.pk}:{post.live_revision_id}:en-gb:body"))
+
+    def test_changed_poll_invalidates_body(self):
+        self.render()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.poll.title = "Do you still pay cash?"
+            self.poll.save()
+
+        self.assertIn("Do you still pay cash?", self.render())
+
+    def test_republished_linked_page_invalidates_body(self):
+        self.render()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.key_fact.slug = "more-cash-facts"
+            self.key_fact.save_revision().publish()
+
+        self.assertIn("/more-cash-facts/", self.render())
+
+    def test_new_revision_is_rendered_fresh(self):
+        self.render()
+        page = ArticlePage.objects.get(pk=self.article.pk)
+        page.body = json.dumps([{"type": "content", "value": {"content": "<p>Rewritten</p>"}}])
+        page.save_revision().publish()
+
+        html = self.render()
+        self.assertIn("Rewritten", html)
+        self.assertNotIn("Do you pay cash?", html)
+
+
+class StreamFieldPreloadTests(BlogTestMixin, WagtailPageTestCase):
+    """
+    Tests for batched resolution of chooser blocks.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.slides = [self.create_blog_post(f"Slide {i}") for i in range(12)]
+        self.key_fact = self.create_key_fact("Cash facts")
+        self.images = [
+            Image.objects.create(title=f"Image {i}", file=get_test_image_file()) for i in range(3)
+        ]
+        self.poll = Poll.objects.create(title="Do you pay cash?")
+        self.body = BlogPage(title="Body", body=json.dumps(
+            [{"type": "facts_carousel", "value": {"slides": [
+                {"type": "item", "value": slide.pk, "id": str(slide.pk)} for slide in self.slides
+            ]}}]
+            + [{"type": "key_fact_image", "value": {"key_fact_page": self.key_fact.pk}}]
+            + [
+                {"type": "image_caption", "value": {"image": image.pk, "internal_link": self.slides[0].pk}}
+                for image in self.images
+            ]
+            + [{"type": "poll", "value": {"poll": self.poll.pk}}]
+        )).body
+
+    def test_one_query_per_model(self):
+        # Page types, BlogPage, KeyFactsPage, images, image renditions, polls
+        with self.assertNumQueries(6):
+            stream = preload_stream(self.body)
+            values = [block.value for block in stream]
+
+        self.assertEqual([slide.pk for slide in values[0]["slides"]], [slide.pk for slide in self.slides])
+        self.assertIsInstance(values[1]["key_fact_page"], KeyFactsPage)
+        self.assertEqual([value["image"] for value in values[2:5]], self.images)
+        self.assertEqual(values[5]["poll"], self.poll)
+
+    def test_preloaded_values_match_wagtail(self):
+        stream = preload_stream(self.body)
+        self.assertEqual(len(stream), len(self.body))
+        for preloaded, original in zip(stream, self.body):
+            self.assertEqual(preloaded.block_type, original.block_type)
+            self.assertEqual(preloaded.render(), original.render())
+
+    def test_wrong_page_type_resolves_to_none(self):
+        body = ArticlePage(title="Body", body=json.dumps([
+            {"type": "key_fact_image", "value": {"key_fact_page": self.slides[0].pk}},
+        ])).body
+        self.assertIsNone(preload_stream(body)[0].value["key_fact_page"])
+
+
+class EmbedWarmupTests(BlogTestMixin, WagtailPageTestCase):
+    """
+    Tests for resolving embeds at publish time and with warm_embeds.
+    """
+
+    def video_body(self, *urls):
+        return json.dumps([
+            {"type": "video_caption", "value": {"video_url": url, "caption": "Video"}} for url in urls
+        ])
+
+    def test_publish_stores_embeds(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_blog_post("Video", body=self.video_body("https://vimeo.com/1"))
+
+        embed = Embed.objects.get(url="https://vimeo.com/1")
+        self.assertEqual(embed.type, "video")
+        self.assertIn("<iframe", embed.html)
+
+    @override_settings(TASKS={"default": {"BACKEND": "django_tasks.backends.database.DatabaseBackend"}})
+    def test_publish_queues_work_for_the_worker(self):
+        from django_tasks.backends.database.models import DBTaskResult
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_blog_post("Video", body=self.video_body("https://vimeo.com/1"))
+
+        # Nothing ran in the publishing request
+        self.assertFalse(Embed.objects.exists())
+        self.assertIn("blog.tasks.warm_page_embeds_task", DBTaskResult.objects.values_list("task_path", flat=True))
+
+        # What db_worker does with each row, minus its own transaction handling
+        for result in DBTaskResult.objects.all():
+            result.task.call(*result.args_kwargs["args"], **result.args_kwargs["kwargs"])
+        self.assertTrue(Embed.objects.filter(url="https://vimeo.com/1").exists())
+
+    def test_warm_embeds_command_resolves_live_pages_once(self):
+        self.create_blog_post("First", body=self.video_body("https://vimeo.com/1", "https://youtu.be/2"))
+        self.create_blog_post("Second", body=self.video_body("https://youtu.be/2"))
+        draft = BlogPage(
+            title="Draft",
+            date=datetime.date(2026, 1, 1),
+            body=self.video_body("https://vimeo.com/3"),
+            live=False,
+        )
+        self.blog_index.add_child(instance=draft)
+        self.assertFalse(Embed.objects.exists())
+
+        out = StringIO()
+        call_command("warm_embeds", workers=1, stdout=out)
+
+        self.assertIn("Resolved 2 of 2 embeds", out.getvalue())
+        self.assertEqual(
+            set(Embed.objects.values_list("url", flat=True)),
+            {"https://vimeo.com/1", "https://youtu.be/2"},
+        )
+
+
+class DataTableTests(BlogTestMixin, WagtailPageTestCase):
+    """
+    Tests for compiled DataTableBlock rendering, lazy rows and CSV export.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.raw_table = {
+            "title": "Cash use by country",
+            "table": {"data": [["Country", "Share"], ["<b>Malta</b>", "71%"]] + [
+                [f"Country {i}", f"{i}%"] for i in range(118)
+            ]},
+            "table_headers": "row",
+            "table_caption": "",
+        }
+        self.post = self.create_blog_post("Tables", body=json.dumps([
+            {"type": "data_table", "value": self.raw_table},
+        ]))
+        block = BlogPage.objects.get(pk=self.post.pk).body[0]
+        self.digest = table_hash(block.block.get_prep_value(block.value))
+
+    def test_page_renders_escaped_rows_up_to_the_limit(self):
+        html = render_stream_html(self.post, "body", {"page": self.post})
+
+        self.assertIn('<th scope="col">Country</th>', html)
+        self.assertIn("<td>&lt;b&gt;Malta&lt;/b&gt;</td>", html)
+        self.assertEqual(html.count("<tr>"), 1 + 50)
+        self.assertIn(reverse("data_table_rows", args=[self.post.pk, self.digest]), html)
+        self.assertIn("Show all 119 rows", html)
+        self.assertIsNotNone(cache.get(f"blog:table:{self.digest}"))
+
+    def test_rows_endpoint_returns_the_rest(self):
+        response = self.client.get(
+            reverse("data_table_rows", args=[self.post.pk, self.digest]), {"offset": 50}
+        )
+
+        data = response.json()
+        self.assertEqual(data["html"].count("<tr>"), 69)
+        self.assertIsNone(data["next"])
+        self.assertIn("public", response["Cache-Control"])
+
+    def test_csv_download_has_every_row(self):
+        response = self.client.get(reverse("data_table_csv", args=[self.post.pk, self.digest]))
+
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn('filename="cash-use-by-country.csv"', response["Content-Disposition"])
+        lines = response.content.decode().splitlines()
+        self.assertEqual(len(lines), 120)
+        self.assertEqual(lines[:2], ["Country,Share", "<b>Malta</b>,71%"])
+
+    def test_table_is_found_without_converting_the_body(self):
+        with patch.object(StreamValue, "_prefetch_blocks") as prefetch:
+            compiled = find_table(self.post.pk, self.digest)
+
+        self.assertEqual(compiled["hash"], self.digest)
+        prefetch.assert_not_called()
+
+    def test_table_saved_before_a_block_option_is_still_found(self):
+        legacy_table = {"title": "Legacy", "table": {"data": [["a"], ["b"]]}}
+        post = self.create_blog_post("Legacy table", body=json.dumps([
+            {"type": "data_table", "value": legacy_table},
+        ]))
+        block = BlogPage.objects.get(pk=post.pk).body[0]
+        digest = table_hash(block.block.get_prep_value(block.value))
+
+        self.assertNotEqual(digest, table_hash(legacy_table))
+        self.assertEqual(find_table(post.pk, digest)["title"], "Legacy")
+
+    def test_unknown_table_is_404(self):
+        request = RequestFactory().get("/")
+        with self.assertRaises(Http404):
+            table_csv_view(request, self.post.pk, "0" * 40)
+
+    def test_merged_cells(self):
+        compiled = compile_table({"table": {
+            "data": [["a", "b"], ["c", "d"]],
+            "mergedCells": [{"row": 1, "col": 0, "rowspan": 1, "colspan": 2}],
+        }, "table_headers": "row"})
+
+        self.assertEqual(compiled["rows_html"], ['<tr><td colspan="2">c</td></tr>'])
+
+
+class LegacyBlockRendererTests(TestCase):
+    """
+    Tests for the shared renderer of the frontend form's JSON content blocks.
+    """
+
+    BLOCKS = [
+        {"type": "content", "content": "<script>alert(1)</script>"},
+        {"type": "image_caption", "caption": 'A "quoted" caption'},
+        {"type": "video_caption", "caption": "Video"},
+        {"type": "iframe_caption", "url": "javascript:alert(1)", "caption": "Bad"},
+        {"type": "iframe_caption", "url": "https://example.com/?a=1&b=2", "caption": "Good"},
+        {"type": "blockquote", "quote": "Cash is king", "author": "A & B"},
+        {"type": "data_table", "table_data": "a,<b>\nc,d"},
+        {"type": "poll", "question": "Cash?", "options": "Yes\n\nNo"},
+        {"type": "facts_carousel", "facts": '["<i>one</i>", "two"]'},
+        {"type": "key_fact_image", "fact": "71% pay cash"},
+        {"type": "unknown", "content": "ignored"},
+    ]
+
+    def test_every_block_type_is_rendered_escaped(self):
+        html = render_blocks(self.BLOCKS)
+
+        self.assertNotIn("<script>", html)
+        self.assertIn("<p>&lt;script&gt;alert(1)&lt;/script&gt;</p>", html)
+        self.assertIn('alt="A &quot;quoted&quot; caption"', html)
+        self.assertNotIn("javascript:", html)
+        self.assertIn('<iframe src="https://example.com/?a=1&amp;b=2"', html)
+        self.assertIn("<cite>— A &amp; B</cite>", html)
+        self.assertIn("<td>&lt;b&gt;</td>", html)
+        self.assertIn("<ul><li>Yes</li><li>No</li></ul>", html)
+        self.assertIn('<div class="fact-item">&lt;i&gt;one&lt;/i&gt;</div>', html)
+        self.assertIn("<p>71% pay cash</p>", html)
+        self.assertNotIn("ignored", html)
+
+    def test_editor_escapes_values(self):
+        html = ContentBlockWidget().render("content_blocks", json.dumps(self.BLOCKS))
+
+        self.assertIn("&lt;script&gt;alert(1)&lt;/script&gt;</textarea>", html)
+        self.assertIn('value="A &quot;quoted&quot; caption"', html)
+        self.assertEqual(html.count('class="content-block"'), len(self.BLOCKS))
+        self.assertNotIn("<script>", html)
+
+    def test_rendering_scales_linearly(self):
+        def escaped_characters(copies):
+            escaped = []
+
+            def counting_escape(text):
+                escaped.append(len(str(text)))
+                return escape(text)
+
+            with patch("blog.legacy_blocks.escape", counting_escape):
+                render_blocks(self.BLOCKS * copies)
+            return sum(escaped)
+
+        # Each piece of user content is escaped once, never the growing document
+        self.assertEqual(escaped_characters(400), 4 * escaped_characters(100))
+
+
+class BlogsDashboardTests(BlogTestMixin, WagtailPageTestCase):
+    """
+    Tests for the keyset-paginated blogs dashboard.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.cash = ArticleType.objects.create(name="Cash & Society")
+        self.malta = Location.objects.create(name="Malta")
+        for i in range(25):
+            self.create_blog_post(
+                f"Post {i:02d}", date=datetime.date(2026, 1, 1 + i % 5),
+                m2m={"article_types": [self.cash]} if i % 2 else None,
+            )
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "password")
+        self.client.force_login(user)
+
+    def test_taxonomy_slugs_are_generated(self):
+        self.assertEqual(self.cash.slug, "cash-society")
+        self.assertEqual([item["slug"] for item in get_taxonomies()["locations"]], ["malta"])
+
+    def test_names_with_the_same_slug_get_numbered_slugs(self):
+        self.assertEqual(ArticleType.objects.create(name="Cash Society").slug, "cash-society-2")
+        self.assertEqual(ArticleType.objects.create(name="Cash-Society").slug, "cash-society-3")
+        self.assertEqual(Location.objects.create(name="MALTA").slug, "malta-2")
+
+    def test_keyset_pages_walk_forwards_and_back(self):
+        qs = BlogPage.objects.live()
+        ordering = [("date", True), ("pk", True)]
+        first = keyset_paginate(qs, ordering, 10)
+        second = keyset_paginate(qs, ordering, 10, after=first.next_cursor)
+        third = keyset_paginate(qs, ordering, 10, after=second.next_cursor)
+        back = keyset_paginate(qs, ordering, 10, before=third.previous_cursor)
+
+        seen = first.object_list + second.object_list + third.object_list
+        expected = list(qs.order_by("-date", "-pk"))
+        self.assertEqual(seen, expected)
+        self.assertFalse(first.has_previous)
+        self.assertFalse(third.has_next)
+        self.assertEqual(back.object_list, second.object_list)
+        self.assertEqual(back.next_cursor, second.next_cursor)
+
+    def test_keyset_cursor_carries_null_sort_keys(self):
+        qs = BlogPage.objects.live()
+        qs.update(latest_revision_created_at=None)
+        qs.filter(pk__in=list(qs.values_list("pk", flat=True)[:15])).update(
+            latest_revision_created_at=timezone.now()
+        )
+        ordering = [("latest_revision_created_at", True), ("pk", True)]
+        first = keyset_paginate(qs, ordering, 20)
+        second = keyset_paginate(qs, ordering, 20, after=first.next_cursor)
+        back = keyset_paginate(qs, ordering, 20, before=second.previous_cursor)
+
+        self.assertEqual(len(first.object_list + second.object_list), 25)
+        self.assertIsNone(first.object_list[-1].latest_revision_created_at)
+        self.assertEqual(set(first.object_list + second.object_list), set(qs))
+        self.assertEqual(back.object_list, first.object_list)
+
+    def test_capped_count(self):
+        qs = BlogPage.objects.live()
+        self.assertEqual(capped_count(qs, 100), (25, True))
+        count, exact = capped_count(qs, 10)
+        self.assertFalse(exact)
+        self.assertGreater(count, 10)
+
+    def test_dashboard_filters_by_slug(self):
+        response = self.client.get(
+            reverse("blogs_dashboard_custom"), {"type": "cash-society", "sort": "title", "dir": "asc"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["filtered_count"], 12)
+        self.assertTrue(response.context["filtered_exact"])
+        titles = [post.title for post in response.context["blog_posts"]]
+        self.assertEqual(titles, [f"Post {i:02d}" for i in range(1, 25, 2)])
+
+    def test_dashboard_pages_by_cursor(self):
+        url = reverse("blogs_dashboard_custom")
+        response = self.client.get(url, {"sort": "title", "dir": "desc"})
+        page = response.context["page_obj"]
+        self.assertEqual(len(page.object_list), 20)
+        self.assertTrue(page.has_next)
+
+        response = self.client.get(url, {"sort": "title", "dir": "desc", "after": page.next_cursor})
+        titles = [post.title for post in response.context["blog_posts"]]
+        self.assertEqual(titles, ["Post 04", "Post 03", "Post 02", "Post 01", "Post 00"])
+        self.assertContains(response, "before=")
+
+    def test_tampered_cursor_falls_back_to_first_page(self):
+        wrong_type = base64.urlsafe_b64encode(json.dumps(["Post 10", {"dt": 1}]).encode()).decode()
+        for cursor in ("bogus", wrong_type):
+            response = self.client.get(reverse("blogs_dashboard_custom"), {"after": cursor})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.context["blog_posts"]), 20)
+
+    def test_taxonomy_cache_is_cleared_on_save(self):
+        self.assertEqual(len(get_taxonomies()["locations"]), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            Location.objects.create(name="Gozo")
+        self.assertEqual([item["name"] for item in get_taxonomies()["locations"]], ["Gozo", "Malta"])
+
+
+class BulkActionTests(BlogTestMixin, WagtailPageTestCase):
+    """
+    Tests for batched bulk actions on news articles.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.user = get_user_model().objects.create_superuser("admin", "admin@example.com", "password")
+        self.articles = [self.create_article(f"Article {i}") for i in range(3)]
+        self.ids = [article.pk for article in self.articles]
+
+    def revision_counts(self):
+        return [ArticlePage.objects.get(pk=pk).revisions.count() for pk in self.ids]
+
+    def test_flag_is_published_with_one_revision_per_page(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            result = apply_bulk_action(self.ids, "set:featured", self.user)
+
+        self.assertEqual(len(result.updated), 3)
+        self.assertEqual(self.revision_counts(), [2, 2, 2])
+        self.assertTrue(all(ArticlePage.objects.get(pk=pk).featured for pk in self.ids))
+        # Coalesced: the content version is bumped once for the whole batch
+        self.assertEqual([cb for cb in callbacks if cb is bump_content_version], [bump_content_version])
+
+        result = apply_bulk_action(self.ids, "set:featured", self.user)
+        self.assertEqual((len(result.updated), len(result.unchanged)), (0, 3))
+
+    def test_taxonomy_change_keeps_pending_drafts(self):
+        cash = ArticleType.objects.create(name="Cash")
+        draft = self.articles[0]
+        draft.title = "Draft title"
+        draft.save_revision()
+
+        apply_bulk_action(self.ids, f"add:article_types:{cash.pk}", self.user)
+
+        live = ArticlePage.objects.get(pk=draft.pk)
+        self.assertEqual(live.title, "Article 0")
+        self.assertFalse(live.article_types.exists())
+        latest = live.get_latest_revision_as_object()
+        self.assertEqual(latest.title, "Draft title")
+        self.assertEqual([t.name for t in latest.article_types.all()], ["Cash"])
+        self.assertEqual(list(ArticlePage.objects.get(pk=self.ids[1]).article_types.all()), [cash])
+
+    def test_unpublish_and_unknown_actions(self):
+        with self.assertRaises(BulkActionError):
+            apply_bulk_action(self.ids, "set:title", self.user)
+        with self.assertRaises(BulkActionError):
+            apply_bulk_action(self.ids, "add:locations:999", self.user)
+
+        apply_bulk_action(self.ids[:2], "unpublish", self.user)
+        self.assertEqual(ArticlePage.objects.live().count(), 1)
+        apply_bulk_action(self.ids, "publish", self.user)
+        self.assertEqual(ArticlePage.objects.live().count(), 3)
+        self.assertEqual(self.revision_counts(), [1, 1, 1])
+
+    def test_dashboard_posts_bulk_action(self):
+        self.client.force_login(self.user)
+        url = reverse("admin_articles")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'value="set:cover_story"')
+
+        response = self.client.post(url, {"action": "set:cover_story", "page_ids": self.ids[:2]})
+        self.assertRedirects(response, url)
+        self.assertEqual(ArticlePage.objects.filter(cover_story=True).count(), 2)
+
+
+class KeyFactsListingTests(BlogTestMixin, WagtailPageTestCase):
+    """
+    Tests for the paginated, filterable Key Facts admin listing.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.cash = ArticleType.objects.create(name="Cash")
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "password")
+        self.client.force_login(user)
+        self.url = reverse("admin_keyfacts")
+
+    def create_facts(self, count, start=0):
+        for i in range(start, start + count):
+            self.create_key_fact(
+                f"Fact {i}", intro=f"Intro {i}", date=datetime.date(2026, 1, 1 + i),
+                page_header_image=Image.objects.create(title=f"Fact {i}", file=get_test_image_file()),
+                m2m={"article_types": [self.cash]} if i % 2 else None,
+            )
+
+    def titles(self, response):
+        return [fact.title for fact in response.context["key_facts"]]
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self.create_facts(3)
+        self.client.get(self.url)  # generate the thumbnails
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(self.url)
+
+        self.create_facts(6, start=3)
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(self.titles(response)), 9)
+        self.assertEqual(len(many), len(few))
+
+    def test_search_and_filters(self):
+        self.create_facts(6)
+
+        self.assertEqual(self.titles(self.client.get(self.url, {"q": "intro 4"})), ["Fact 4"])
+        self.assertEqual(self.titles(self.client.get(self.url, {"type": "cash"})), ["Fact 5", "Fact 3", "Fact 1"])
+        response = self.client.get(self.url, {"date_from": "2026-01-02", "date_to": "2026-01-03"})
+        self.assertEqual(self.titles(response), ["Fact 2", "Fact 1"])
+        self.assertEqual(len(self.titles(self.client.get(self.url, {"date_from": "2026-13-01"}))), 6)
+
+    @patch("blog.admin_views.KEY_FACTS_PER_PAGE", 4)
+    def test_keyset_pages(self):
+        self.create_facts(6)
+
+        first = self.client.get(self.url)
+        self.assertEqual(self.titles(first), ["Fact 5", "Fact 4", "Fact 3", "Fact 2"])
+        second = self.client.get(self.url, {"after": first.context["page_obj"].next_cursor})
+        self.assertEqual(self.titles(second), ["Fact 1", "Fact 0"])
+        self.assertFalse(second.context["page_obj"].has_next)
+
+
+class ImportContentTests(BlogTestMixin, WagtailPageTestCase):
+    """
+    Tests for the bulk import_content command.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.sitemap_root = os.path.join(self.tmpdir.name, "sitemaps")
+        self.snapshot_root = os.path.join(self.tmpdir.name, "api_snapshots")
+        roots = override_settings(BLOG_SITEMAP_ROOT=self.sitemap_root, BLOG_API_SNAPSHOT_ROOT=self.snapshot_root)
+        roots.enable()
+        self.addCleanup(roots.disable)
+        self.existing = self.create_article("Existing")
+
+    def write_jsonl(self, records, name="articles.jsonl"):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w") as f:
+            f.writelines(json.dumps(record) + "\n" for record in records)
+        return path
+
+    def records(self, count):
+        return [
+            {
+                "title": f"Imported {i}", "intro": f"Intro {i}", "date": "2025-05-01",
+                "body": f"<p>Body {i}</p>", "featured": "yes",
+                "article_types": "News; Analysis", "locations": ["Malta"],
+            }
+            for i in range(count)
+        ]
+
+    def run_import(self, path, *args):
+        out = StringIO()
+        call_command("import_content", path, *args, stdout=out)
+        return out.getvalue()
+
+    def test_imports_a_valid_tree_with_revisions_and_tags(self):
+        records = self.records(5)
+        records[2]["title"] = "Existing"
+        records[3].pop("intro")
+        output = self.run_import(self.write_jsonl(records), "--batch-size", "2")
+
+        self.assertIn("Imported 4 pages", output)
+        self.assertIn("Line 4: This field cannot be blank.", output)
+        self.assertIn("pages/s", output)
+        self.assertEqual(Page.find_problems(), ([], [], [], [], []))
+
+        self.news_index.refresh_from_db()
+        self.assertEqual(self.news_index.numchild, 5)
+        page = ArticlePage.objects.get(slug="existing-2")
+        self.assertEqual(page.url_path, f"{self.news_index.url_path}existing-2/")
+        self.assertTrue(page.live and page.featured)
+        self.assertEqual(page.body[0].value["content"].source, "<p>Body 2</p>")
+        self.assertEqual(sorted(t.name for t in page.article_types.all()), ["Analysis", "News"])
+        self.assertEqual(page.live_revision, page.latest_revision)
+        revision_page = page.latest_revision.as_object()
+        self.assertEqual(revision_page.title, "Existing")
+        self.assertEqual(len(revision_page.locations.all()), 1)
+
+        # The tree stays usable for ordinary inserts
+        self.create_article("Later")
+        self.assertEqual([p.title for p in self.news_index.get_children()][-2:], ["Imported 4", "Later"])
+        self.assertEqual(Page.find_problems(), ([], [], [], [], []))
+
+    def test_sitemaps_and_snapshots_include_the_new_pages(self):
+        self.run_import(self.write_jsonl(self.records(2)))
+
+        sitemaps = "".join(
+            open(os.path.join(self.sitemap_root, "public", name), encoding="utf-8").read()
+            for name in os.listdir(os.path.join(self.sitemap_root, "public")) if name.endswith(".xml")
+        )
+        self.assertIn("/imported-1/</loc>", sitemaps)
+        with open(os.path.join(self.snapshot_root, "blog", "latest.json"), encoding="utf-8") as f:
+            self.assertIn("Imported 1", f.read())
+
+    def test_renditions_are_generated_for_imported_images(self):
+        image = Image.objects.create(title="Thumbnail", file=get_test_image_file())
+        records = self.records(2)
+        records[0]["wide_thumbnail"] = image.pk
+        self.run_import(self.write_jsonl(records))
+
+        self.assertEqual(image.renditions.count(), 3)
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        ArticleType.objects.create(name="News")
+        ArticleType.objects.create(name="Analysis")
+        Location.objects.create(name="Malta")
+
+        def queries(count, name):
+            path = self.write_jsonl(self.records(count), name)
+            # Only the import itself; the sitemap and snapshot rebuilds list every page
+            with self.settings(BLOG_SITEMAP_ROOT=None, BLOG_API_SNAPSHOT_ROOT=None):
+                with CaptureQueriesContext(connection) as captured:
+                    self.run_import(path, "--batch-size", "100")
+            return len(captured)
+
+        # As many rows as one INSERT of every ArticlePage column takes on this
+        # backend (SQLite builds may cap a query at 999 parameters)
+        large = min(50, connection.ops.bulk_batch_size(ArticlePage._meta.concrete_fields, range(50)))
+        self.assertGreater(large, 5)
+        self.assertEqual(queries(5, "small.jsonl"), queries(large, "large.jsonl"))
+
+    def test_csv_and_xlsx(self):
+        import openpyxl
+
+        csv_path = os.path.join(self.tmpdir.name, "posts.csv")
+        with open(csv_path, "w", newline="") as f:
+            f.write("title,intro,date,live\nFrom CSV,Intro,2025-01-02,false\n")
+        self.run_import(csv_path, "--type", "blog")
+        post = BlogPage.objects.get(title="From CSV")
+        self.assertFalse(post.live)
+        self.assertTrue(post.has_unpublished_changes)
+        self.assertIsNone(post.live_revision)
+
+        xlsx_path = os.path.join(self.tmpdir.name, "posts.xlsx")
+        workbook = openpyxl.Workbook()
+        workbook.active.append(["title", "intro", "date"])
+        workbook.active.append(["From XLSX", "Intro", datetime.datetime(2025, 1, 3)])
+        workbook.save(xlsx_path)
+        self.run_import(xlsx_path, "--type", "blog")
+        self.assertEqual(BlogPage.objects.get(title="From XLSX").date, datetime.date(2025, 1, 3))
+
+    def test_resume_from_checkpoint(self):
+        path = self.write_jsonl(self.records(5))
+        with open(f"{path}.checkpoint", "w") as f:
+            json.dump({"records": 3}, f)
+
+        self.run_import(path, "--resume")
+
+        self.assertEqual(
+            sorted(ArticlePage.objects.filter(title__startswith="Imported").values_list("title", flat=True)),
+            ["Imported 3", "Imported 4"],
+        )
+        self.assertFalse(os.path.exists(f"{path}.checkpoint"))
+
+    def crash(self, path, when):
+        """Run an import of 4 records that stops at the first checkpoint write `when` matches."""
+        write = ImportContentCommand.write_checkpoint
+
+        def write_checkpoint(command, checkpoint_path, records, pending=None):
+            if when(pending):
+                raise KeyboardInterrupt
+            write(command, checkpoint_path, records, pending)
+
+        with patch.object(ImportContentCommand, "write_checkpoint", write_checkpoint):
+            with self.assertRaises(KeyboardInterrupt):
+                self.run_import(path, "--batch-size", "2")
+
+    def imported_titles(self):
+        return sorted(ArticlePage.objects.filter(title__startswith="Imported").values_list("title", flat=True))
+
+    def test_resume_after_the_batch_committed(self):
+        path = self.write_jsonl(self.records(4))
+        # Stopped after the commit, before the checkpoint recorded it
+        self.crash(path, lambda pending: pending is None)
+        self.assertEqual(self.imported_titles(), ["Imported 0", "Imported 1"])
+
+        self.run_import(path, "--batch-size", "2", "--resume")
+        self.assertEqual(self.imported_titles(), [f"Imported {i}" for i in range(4)])
+
+    def test_resume_after_the_batch_rolled_back(self):
+        path = self.write_jsonl(self.records(4))
+        self.crash(path, lambda pending: pending is not None)
+        self.assertEqual(self.imported_titles(), [])
+
+        self.run_import(path, "--batch-size", "2", "--resume")
+        self.assertEqual(self.imported_titles(), [f"Imported {i}" for i in range(4)])
+
+    def test_batched_insert_signature(self):
+        # blog.importer.insert_local_rows() calls this private QuerySet method
+        parameters = inspect.signature(QuerySet._batched_insert).parameters
+        self.assertEqual(list(parameters)[:4], ["self", "objs", "fields", "batch_size"])
+
+
+class ExportContentTests(BlogTestMixin, WagtailPageTestCase):
+    """
+    Tests for the streaming export_content command.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.news = ArticleType.objects.create(name="News")
+        for i in range(7):
+            self.create_article(f"Article {i}", m2m={"article_types": [self.news]})
+        self.create_article("Draft").unpublish()
+        poll = Poll.objects.create(title="Cash?")
+        PollChoice.objects.create(poll=poll, question="Yes")
+
+    def read_jsonl(self, path, opener=open):
+        with opener(path, "rt", encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_jsonl_reads_in_fixed_chunks(self):
+        path = os.path.join(self.tmpdir.name, "export.jsonl")
+        with CaptureQueriesContext(connection) as captured:
+            call_command("export_content", "-o", path, "--only", "pages", "--chunk-size", "3", stdout=StringIO())
+
+        rows = self.read_jsonl(path)
+        articles = [row for row in rows if row["model"] == "blog.articlepage"]
+        self.assertEqual([row["title"] for row in articles], [f"Article {i}" for i in range(7)])
+        self.assertEqual(articles[0]["article_types"], ["News"])
+        self.assertNotIn("Draft", [row["title"] for row in rows])
+        # 7 articles in chunks of 3: three page queries, each with one M2M prefetch
+        article_queries = [q for q in captured if 'FROM "blog_articlepage"' in q["sql"]]
+        self.assertEqual(len(article_queries), 4)
+
+    def test_gzip_round_trips_through_import(self):
+        self.create_blog_post("Post 1")
+        path = os.path.join(self.tmpdir.name, "export.jsonl")
+        call_command("export_content", "-o", path, "--gzip", stdout=StringIO())
+
+        rows = self.read_jsonl(f"{path}.gz", gzip.open)
+        poll = next(row for row in rows if row["model"] == "blog.poll")
+        self.assertEqual(poll["choices"][0]["question"], "Yes")
+        self.assertIn("blog.articletype", {row["model"] for row in rows})
+
+        # The whole mixed export, one run per page type
+        reimport = os.path.join(self.tmpdir.name, "reimport.jsonl")
+        with open(reimport, "w") as f:
+            f.writelines(json.dumps(row) + "\n" for row in rows)
+        out = StringIO()
+        call_command("import_content", reimport, stdout=out)
+        call_command("import_content", reimport, "--type", "blog", stdout=StringIO())
+
+        self.assertIn("Imported 7 pages", out.getvalue())
+        self.assertIn("Left out 1 blog.blogpage records of another type", out.getvalue())
+        self.assertEqual(ArticlePage.objects.filter(title="Article 3").count(), 2)
+        self.assertEqual(BlogPage.objects.filter(title="Post 1").count(), 2)
+        self.assertFalse(ArticlePage.objects.filter(title="Post 1").exists())
+
+    def test_xlsx_has_a_sheet_per_model(self):
+        import openpyxl
+
+        path = os.path.join(self.tmpdir.name, "export.xlsx")
+        call_command("export_content", "-o", path, stdout=StringIO())
+
+        workbook = openpyxl.load_workbook(path, read_only=True)
+        sheet = workbook["blog.articlepage"]
+        rows = list(sheet.iter_rows(values_only=True))
+        workbook.close()
+        header = rows[0]
+        self.assertEqual(len(rows), 8)
+        self.assertEqual(rows[1][header.index("article_types")], '["News"]')
+
+
+class PruneRevisionsTests(BlogTestMixin, WagtailPageTestCase):
+    """
+    Tests for the prune_revisions command.
+    """
+
+    def setUp(self):
+        super().setUp()
+        # Revision 1 is published by create_article, 2-4 are drafts,
+        # 5 is published again, 6-7 are drafts
+        self.article = self.create_article("Revisions")
+        for i in range(2, 8):
+            self.article.title = f"Revisions {i}"
+            revision = self.article.save_revision(log_action=True)
+            if i == 5:
+                revision.publish()
+        self.revisions = list(self.article.revisions.order_by("created_at", "pk"))
+
+    def remaining(self):
+        return [revision.object_str for revision in self.article.revisions.order_by("created_at", "pk")]
+
+    def test_dry_run_deletes_nothing(self):
+        out = StringIO()
+        call_command("prune_revisions", "--keep", "2", "--dry-run", stdout=out)
+        self.assertIn("3 revisions to prune", out.getvalue())
+        self.assertEqual(self.article.revisions.count(), 7)
+
+    def test_keeps_newest_and_published_revisions(self):
+        out = StringIO()
+        call_command("prune_revisions", "--keep", "2", "--batch-size", "1", stdout=out)
+
+        self.assertEqual(self.remaining(), ["Revisions", "Revisions 5", "Revisions 6", "Revisions 7"])
+        self.assertIn("Deleted 3 of 3", out.getvalue())
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.live_revision.object_str, "Revisions 5")
+
+    def test_ranks_revisions_once_however_many_batches(self):
+        with CaptureQueriesContext(connection) as captured:
+            self.assertEqual(list(prune_revisions(keep=2, batch_size=1)), [1, 2, 3])
+
+        self.assertEqual(sum("ROW_NUMBER" in query["sql"].upper() for query in captured), 1)
+
+    def test_keeps_revisions_with_comments(self):
+        from wagtail.models import Comment
+
+        user = get_user_model().objects.create_user("editor", "editor@example.com", "password")
+        Comment.objects.create(
+            page=self.article, user=user, text="Check this", contentpath="title",
+            revision_created=self.revisions[2],
+        )
+        call_command("prune_revisions", "--keep", "1", stdout=StringIO())
+        self.assertEqual(self.remaining(), ["Revisions", "Revisions 3", "Revisions 5", "Revisions 7"])
+
+
+class LocalAssetServer:
+    """
+    A stand-in for the old site and its CDN on 127.0.0.1.
+
+    `routes` maps a path to (status, body) or (status, body, headers), or
+    to a list of them, served in turn. Requests are recorded, with their
+    headers and the peak number in flight. With `gate`, every request is
+    held until `gate` requests are in flight at once (or a timeout passes).
+    """
+
+    GATE_TIMEOUT = 5
+
+    def __init__(self, routes, gate=None):
+        self.routes = {path: list(r) if isinstance(r, list) else [r] for path, r in routes.items()}
+        self.gate = gate
+        self.gate_open = threading.Event()
+        self.requests = []
+        self.request_headers = []
+        self.in_flight = self.peak = 0
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def respond(self, send_body):
+                with server.lock:
+                    server.requests.append((self.command, self.path))
+                    server.request_headers.append(dict(self.headers))
+                    server.in_flight += 1
+                    server.peak = max(server.peak, server.in_flight)
+                    responses = server.routes.get(self.path, [(404, b"")])
+                    status, body, *headers = responses.pop(0) if len(responses) > 1 else responses[0]
+                    if server.gate and server.in_flight >= server.gate:
+                        server.gate_open.set()
+                if server.gate:
+                    server.gate_open.wait(server.GATE_TIMEOUT)
+                with server.lock:
+                    server.in_flight -= 1
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers[0] if headers else {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(body)
+
+            def do_GET(self):
+                self.respond(True)
+
+            def do_HEAD(self):
+                self.respond(False)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.httpd.server_port}{path}"
+
+
+class AssetDownloaderTests(SimpleTestCase):
+    """
+    Tests for the concurrent import_assets downloader.
+    """
+
+    def downloader(self, **kwargs):
+        kwargs.setdefault("backoff", 0.01)
+        return AssetDownloader(StringIO(), None, **kwargs)
+
+    def test_downloads_concurrently_within_the_per_host_limit(self):
+        routes = {f"/img-{i}.png": (200, f"image {i}".encode()) for i in range(8)}
+        # The first requests wait for each other, so the limit is always reached
+        with LocalAssetServer(routes, gate=3) as server:
+            downloader = self.downloader(workers=8, per_host=3)
+            results = dict(downloader.download_many([server.url(path) for path in routes]))
+            downloader.close()
+        for asset in results.values():
+            self.addCleanup(asset.discard)
+
+        self.assertEqual(Path(results[server.url("/img-5.png")].path).read_bytes(), b"image 5")
+        self.assertEqual(len(results), 8)
+        self.assertEqual(server.peak, 3)
+
+    def test_retries_server_errors_and_skips_404s(self):
+        routes = {"/flaky.png": [(503, b""), (500, b""), (200, b"finally")]}
+        with LocalAssetServer(routes) as server:
+            downloader = self.downloader(workers=2)
+            results = dict(downloader.download_many([server.url("/flaky.png"), server.url("/missing.png")]))
+            downloader.close()
+
+        self.addCleanup(results[server.url("/flaky.png")].discard)
+        self.assertEqual(Path(results[server.url("/flaky.png")].path).read_bytes(), b"finally")
+        self.assertIsNone(results[server.url("/missing.png")])
+        self.assertEqual(server.requests.count(("GET", "/flaky.png")), 3)
+        self.assertEqual(server.requests.count(("GET", "/missing.png")), 1)
+
+    def test_gives_up_after_max_retries(self):
+        with LocalAssetServer({"/down.png": (503, b"")}) as server:
+            downloader = self.downloader(max_retries=2)
+            self.assertIsNone(downloader.download(server.url("/down.png")))
+            downloader.skip_failed = False
+            with self.assertRaises(requests.HTTPError):
+                downloader.download(server.url("/down.png"))
+            downloader.close()
+
+    def test_hashes_content_while_downloading(self):
+        with LocalAssetServer({"/a.png": (200, b"abc" * 50000)}) as server:
+            downloader = self.downloader()
+            asset = downloader.download(server.url("/a.png"))
+            downloader.close()
+        self.addCleanup(asset.discard)
+
+        self.assertEqual(asset.size, 150000)
+        self.assertEqual(asset.sha1, hashlib.sha1(b"abc" * 50000).hexdigest())
+        self.assertEqual(asset.sha256, hashlib.sha256(b"abc" * 50000).hexdigest())
+
+    def test_skips_files_over_the_size_limit(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with LocalAssetServer({"/huge.png": (200, b"x" * 5000), "/small.png": (200, b"x" * 10)}) as server:
+                downloader = self.downloader(max_size=1000, temp_dir=temp_dir)
+                self.assertIsNone(downloader.download(server.url("/huge.png")))
+                asset = downloader.download(server.url("/small.png"))
+                downloader.close()
+
+            self.assertEqual(server.requests.count(("GET", "/huge.png")), 1)
+            self.assertEqual(os.listdir(temp_dir), [os.path.basename(asset.path)])
+            asset.discard()
+            self.assertEqual(os.listdir(temp_dir), [])
+
+    def test_probes_without_downloading(self):
+        routes = {
+            "/found.png": (200, b"x" * 1000),
+            "/no-head.png": [(405, b""), (206, b"x")],
+            "/forbidden.png": (403, b""),
+        }
+        with LocalAssetServer(routes) as server:
+            downloader = self.downloader()
+            results = dict(downloader.probe_many(
+                [server.url(path) for path in ["/found.png", "/no-head.png", "/forbidden.png", "/missing.png"]]
+            ))
+            downloader.close()
+
+        self.assertEqual(
+            {path: results[server.url(path)] for path in ["/found.png", "/no-head.png", "/forbidden.png", "/missing.png"]},
+            {"/found.png": True, "/no-head.png": True, "/forbidden.png": False, "/missing.png": False},
+        )
+        self.assertNotIn(("GET", "/found.png"), server.requests)
+        self.assertIn(("GET", "/no-head.png"), server.requests)
+
+
+class AssetScraperTests(SimpleTestCase):
+    """
+    Tests for the import_assets page scraper and its HTTP cache.
+    """
+
+    HTML = b"""<html><body>
+        <img src="https://d3an988loexeh7.cloudfront.net/media/original_images/logo.png">
+        <img data-src="https://d3an988loexeh7.cloudfront.net/media/images/lazy.jpg">
+        <div style="background: url('https://d3an988loexeh7.cloudfront.net/media/banner.webp')"></div>
+        <script>{"image": "https://d3an988loexeh7.cloudfront.net/media/images/card.png"}</script>
+        <iframe src="https://player.vimeo.com/video/488891865"></iframe>
+    </body></html>"""
+
+    def test_single_pass_finds_tags_styles_and_script_urls(self):
+        with LocalAssetServer({"/": (200, self.HTML)}) as server:
+            assets = AssetScraper(StringIO(), None).scrape_page(server.url("/"))
+
+        self.assertEqual(assets["images"], {
+            "https://d3an988loexeh7.cloudfront.net/media/original_images/logo.png",
+            "https://d3an988loexeh7.cloudfront.net/media/images/lazy.jpg",
+            "https://d3an988loexeh7.cloudfront.net/media/banner.webp",
+            "https://d3an988loexeh7.cloudfront.net/media/images/card.png",
+        })
+        self.assertEqual(assets["videos"], ["488891865"])
+
+    def test_unchanged_pages_are_not_downloaded_again(self):
+        routes = {"/": [(200, self.HTML, {"ETag": '"v1"', "Last-Modified": "Mon, 05 Oct 2026 10:00:00 GMT"}), (304, b"")]}
+        with tempfile.TemporaryDirectory() as output_dir, LocalAssetServer(routes) as server:
+            cache = PageCache(output_dir)
+            first = AssetScraper(StringIO(), None, cache=cache).scrape_page(server.url("/"))
+            cache.save()
+            second = AssetScraper(StringIO(), None, cache=PageCache(output_dir)).scrape_page(server.url("/"))
+
+        self.assertEqual(first, second)
+        self.assertEqual(server.request_headers[-1]["If-None-Match"], '"v1"')
+        self.assertEqual(server.request_headers[-1]["If-Modified-Since"], "Mon, 05 Oct 2026 10:00:00 GMT")
+
+
+class ImportAssetsManifestTests(TestCase):
+    """
+    Tests for content-hash deduplication and the import_assets manifest.
+    """
+
+    def setUp(self):
+        self.output_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.output_dir.cleanup)
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        media = override_settings(MEDIA_ROOT=media_root.name)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.command = ImportAssetsCommand(stdout=StringIO())
+        self.command._create_directories(Path(self.output_dir.name))
+
+    def png(self, colour):
+        return get_test_image_file(colour=colour).file.getvalue()
+
+    def process(self, server, paths):
+        downloader = AssetDownloader(StringIO(), None, backoff=0.01, temp_dir=self.output_dir.name)
+        uploader = WagtailUploader(StringIO(), self.command.style)
+        try:
+            return self.command._process_images(
+                [server.url(path) for path in paths], downloader, uploader, Path(self.output_dir.name), "all"
+            )
+        finally:
+            downloader.close()
+
+    def test_same_content_under_two_names_is_one_image(self):
+        routes = {"/a/logo.png": (200, self.png("red")), "/b/logo-copy.png": (200, self.png("red"))}
+        with LocalAssetServer(routes) as server:
+            uploaded = self.process(server, routes)
+
+        self.assertEqual(Image.objects.count(), 1)
+        self.assertEqual(Image.objects.get().file_hash, hashlib.sha1(self.png("red")).hexdigest())
+        self.assertEqual((Image.objects.get().width, Image.objects.get().file_size), (640, len(self.png("red"))))
+        self.assertEqual({asset["wagtail_id"] for asset in uploaded["logos"]}, {Image.objects.get().id})
+
+    def test_different_files_sharing_a_name_are_both_imported(self):
+        routes = {"/a/logo.png": (200, self.png("red")), "/b/logo.png": (200, self.png("blue"))}
+        with LocalAssetServer(routes) as server:
+            uploaded = self.process(server, routes)
+
+        self.assertEqual(Image.objects.count(), 2)
+        filenames = sorted(asset["filename"] for asset in uploaded["logos"])
+        self.assertEqual(len(set(filenames)), 2)
+        for filename in filenames:
+            self.assertTrue((Path(self.output_dir.name) / "logos" / filename).exists())
+        # Downloads were moved into place, not copied
+        self.assertFalse(list(Path(self.output_dir.name).glob(".download-*")))
+
+    def test_rerun_skips_imported_urls_without_downloading(self):
+        routes = {"/a/logo.png": (200, self.png("red")), "/fact-card.png": (200, self.png("green"))}
+        with LocalAssetServer(routes) as server:
+            first = self.process(server, routes)
+            requests_made = len(server.requests)
+            second = self.process(server, routes)
+
+            self.assertEqual(len(server.requests), requests_made)
+            self.assertEqual(first, second)
+
+            # A deleted image is imported again
+            Image.objects.filter(id=first["logos"][0]["wagtail_id"]).delete()
+            self.process(server, routes)
+            self.assertEqual(server.requests[requests_made:], [("GET", "/a/logo.png")])
+
+        manifest = AssetManifest(self.output_dir.name)
+        self.assertEqual(
+            manifest.entries[server.url("/fact-card.png")]["sha256"],
+            hashlib.sha256(self.png("green")).hexdigest(),
+        )
+
+    def test_known_missing_candidates_are_not_probed_until_they_expire(self):
+        routes = {"/key-fact-1.png": (200, self.png("red"))}
+        downloader = AssetDownloader(StringIO(), None, backoff=0.01)
+        with LocalAssetServer(routes) as server:
+            candidates = [server.url("/key-fact-1.png"), server.url("/key-fact-2.png")]
+
+            def probe():
+                return self.command._probe_candidates(
+                    candidates, downloader, AssetManifest(self.output_dir.name), MissingCache(self.output_dir.name)
+                )
+
+            self.assertEqual(probe(), [server.url("/key-fact-1.png")])
+            self.assertEqual(probe(), [server.url("/key-fact-1.png")])
+            self.assertEqual(server.requests.count(("HEAD", "/key-fact-2.png")), 1)
+            self.assertEqual(server.requests.count(("HEAD", "/key-fact-1.png")), 2)
+
+            with patch("time.time", return_value=time.time() + 8 * 24 * 3600):
+                probe()
+            self.assertEqual(server.requests.count(("HEAD", "/key-fact-2.png")), 2)
+        downloader.close()
+        self.assertFalse(any(method == "GET" for method, path in server.requests))
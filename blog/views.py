@@ -4,9 +4,9 @@ from django.contrib import messages
 from wagtail.images import get_image_model
 from wagtail.rich_text import RichText
 from .forms import BlogPostForm
+from .legacy_blocks import render_blocks
 from .models import BlogIndexPage, BlogPage, SupportPage, WhyCashMattersPage
 from .models import WhyCashMattersFeaturePage
-import json
 from django.shortcuts import redirect
 from wagtail.admin.auth import permission_required
 from wagtail.models import Page
@@ -15,112 +15,7 @@ from .models import BlogIndexPage
 
 def content_blocks_to_html(blocks):
     """Convert content blocks to HTML"""
-    html_parts = []
-
-    for block in blocks:
-        block_type = block.get('type')
-
-        if block_type == 'content':
-            content = block.get('content', '').strip()
-            if content:
-                html_parts.append('<p>{}</p>'.format(content))
-
-        elif block_type == 'image_caption':
-            caption = block.get('caption', '').strip()
-            if caption:
-                html_parts.append(
-                    '<figure><img src="#" alt="{}">'
-                    '<figcaption>{}</figcaption></figure>'.format(
-                        caption, caption))
-
-        elif block_type == 'video_caption':
-            caption = block.get('caption', '').strip()
-            if caption:
-                html_parts.append(
-                    '<figure><video controls><source src="#" '
-                    'type="video/mp4"></video>'
-                    '<figcaption>{}</figcaption></figure>'.format(caption))
-
-        elif block_type == 'iframe_caption':
-            url = block.get('url', '').strip()
-            caption = block.get('caption', '').strip()
-            if url:
-                iframe_html = ('<iframe src="{}" width="100%" '
-                              'height="400" frameborder="0"></iframe>'.format(
-                                  url))
-                if caption:
-                    iframe_html = ('<figure>{}<figcaption>{}</figcaption>'
-                                  '</figure>'.format(iframe_html, caption))
-                html_parts.append(iframe_html)
-
-        elif block_type == 'blockquote':
-            quote = block.get('quote', '').strip()
-            author = block.get('author', '').strip()
-            if quote:
-                blockquote_html = '<blockquote><p>{}</p>'.format(quote)
-                if author:
-                    blockquote_html += '<cite>— {}</cite>'.format(author)
-                blockquote_html += '</blockquote>'
-                html_parts.append(blockquote_html)
-
-        elif block_type == 'data_table':
-            table_data = block.get('table_data', '').strip()
-            if table_data:
-                # Simple CSV to table conversion
-                try:
-                    rows = [line.split(',') for line in
-                           table_data.split('\n') if line.strip()]
-                    if rows:
-                        table_html = '<table><tbody>'
-                        for row in rows:
-                            table_html += '<tr>'
-                            for cell in row:
-                                table_html += '<td>{}</td>'.format(
-                                    cell.strip())
-                            table_html += '</tr>'
-                        table_html += '</tbody></table>'
-                        html_parts.append(table_html)
-                except (ValueError, IndexError):
-                    html_parts.append('<pre>{}</pre>'.format(table_data))
-
-        elif block_type == 'poll':
-            question = block.get('question', '').strip()
-            options = block.get('options', '').strip()
-            if question:
-                poll_html = '<div class="poll"><h3>{}</h3>'.format(question)
-                if options:
-                    poll_html += '<ul>'
-                    for option in options.split('\n'):
-                        option = option.strip()
-                        if option:
-                            poll_html += '<li>{}</li>'.format(option)
-                    poll_html += '</ul>'
-                poll_html += '</div>'
-                html_parts.append(poll_html)
-
-        elif block_type == 'facts_carousel':
-            facts = block.get('facts', '').strip()
-            if facts:
-                try:
-                    facts_list = json.loads(facts)
-                    if isinstance(facts_list, list):
-                        carousel_html = '<div class="facts-carousel">'
-                        for fact in facts_list:
-                            carousel_html += ('<div class="fact-item">'
-                                            '{}</div>'.format(fact))
-                        carousel_html += '</div>'
-                        html_parts.append(carousel_html)
-                except (json.JSONDecodeError, TypeError):
-                    html_parts.append('<pre>{}</pre>'.format(facts))
-
-        elif block_type == 'key_fact_image':
-            fact = block.get('fact', '').strip()
-            if fact:
-                html_parts.append(
-                    '<div class="key-fact"><img src="#" alt="Key fact">'
-                    '<p>{}</p></div>'.format(fact))
-
-    return '\n'.join(html_parts)
+    return render_blocks(blocks)
 
 
 @permission_required("wagtailadmin.access_admin")
@@ -0,0 +1,19 @@
+"""
+ASGI config for cashmatters project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Long-lived responses such as the poll result streams (blog/poll_stream.py)
+are served through this entry point.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE",
+                      "cashmatters.settings.production")
+
+application = get_asgi_application()
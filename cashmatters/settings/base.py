@@ -60,6 +60,8 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django.contrib.postgres",
+    "django_tasks",
+    "django_tasks.backends.database",
 ]
 
 MIDDLEWARE = [
@@ -98,6 +100,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "cashmatters.wsgi.application"
+ASGI_APPLICATION = "cashmatters.asgi.application"
 
 
 # Database
@@ -122,6 +125,15 @@ DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
 #     }
 # }
 
+# Background tasks (blog/tasks.py): publish-time work such as renditions,
+# embeds, API snapshots and sitemap shards is queued in the database and
+# run by `python manage.py db_worker`, outside the request
+TASKS = {
+    "default": {
+        "BACKEND": "django_tasks.backends.database.DatabaseBackend",
+    },
+}
+
 # Logging configuration
 LOGGING = {
     "version": 1,
@@ -313,3 +325,11 @@ WAGTAILDOCS_EXTENSIONS = [
 
 
 WAGTAILSNIPPETS_MENU_SHOW_ALL = True
+
+# Directory nginx serves /api/snapshots/ from (see blog/snapshots.py).
+# Set to None to stop exporting snapshots on publish.
+BLOG_API_SNAPSHOT_ROOT = os.path.join(BASE_DIR, 'api_snapshots')
+
+# Sitemap state; nginx serves /sitemap.xml and /sitemaps/ from its public/
+# subdirectory (see blog/sitemaps.py)
+BLOG_SITEMAP_ROOT = os.path.join(BASE_DIR, 'sitemaps')
@@ -35,6 +35,20 @@ DATABASES = {
 #     }
 # }
 
+# Caches must be shared between gunicorn workers: publish-time invalidation
+# (blog/cache.py) only reaches the other workers through a shared backend.
+# Every deploy script runs `python manage.py createcachetable` to create its table.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "cashmatters_cache",
+    },
+    # Rendition lookups are per-image and safe to keep per process
+    "renditions": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+}
+
 # Security settings for production
 SECURE_SSL_REDIRECT = True
 SESSION_COOKIE_SECURE = True
@@ -61,6 +75,9 @@ STATIC_ROOT = '/cashmatters/staticfiles/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = '/cashmatters/media/'
 
+BLOG_API_SNAPSHOT_ROOT = '/cashmatters/api_snapshots/'
+BLOG_SITEMAP_ROOT = '/cashmatters/sitemaps/'
+
 # Wagtail settings for production
 WAGTAIL_SITE_NAME = 'CashMatters'
 
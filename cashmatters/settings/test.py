@@ -35,3 +35,11 @@ PASSWORD_HASHERS = [
 # Media files for tests
 MEDIA_ROOT = '/tmp/test_media'
 STATIC_ROOT = '/tmp/test_static'
+BLOG_API_SNAPSHOT_ROOT = '/tmp/test_api_snapshots'
+BLOG_SITEMAP_ROOT = '/tmp/test_sitemaps'
+
+# Resolve embeds without calling out to YouTube/Vimeo
+WAGTAILEMBEDS_FINDERS = [{'class': 'blog.embed_finders.LocalEmbedFinder'}]
+
+# Run background tasks as soon as they are enqueued
+TASKS = {'default': {'BACKEND': 'django_tasks.backends.immediate.ImmediateBackend'}}
@@ -0,0 +1,37 @@
+// Load the rows of large data tables that were left out of the page
+(function () {
+    if (window.dataTableRowsLoaded) {
+        return;
+    }
+    window.dataTableRowsLoaded = true;
+
+    document.addEventListener('click', function (event) {
+        var button = event.target.closest('[data-table-rows]');
+        if (!button) {
+            return;
+        }
+        var tbody = button.closest('.data-table-block').querySelector('tbody');
+        var url = button.getAttribute('data-table-rows') + '?offset=' + button.getAttribute('data-offset');
+
+        button.disabled = true;
+        fetch(url, { headers: { 'Accept': 'application/json' } })
+            .then(function (response) {
+                if (!response.ok) {
+                    throw new Error(response.status);
+                }
+                return response.json();
+            })
+            .then(function (data) {
+                tbody.insertAdjacentHTML('beforeend', data.html);
+                if (data.next === null) {
+                    button.remove();
+                } else {
+                    button.setAttribute('data-offset', data.next);
+                    button.disabled = false;
+                }
+            })
+            .catch(function () {
+                button.disabled = false;
+            });
+    });
+})();
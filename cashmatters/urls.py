@@ -476,95 +476,75 @@ from blog.models import BlogIndexPage
 # blog/views.py
 
 from django.contrib.admin.views.decorators import staff_member_required
-from django.core.paginator import Paginator
+from django.db.models import Exists, OuterRef
 from django.shortcuts import render
 from django.urls import reverse
-from django.utils.text import slugify
 
-from blog.models import BlogPage, BlogIndexPage, ArticleType, Location
+from blog.pagination import InvalidCursor, capped_count, keyset_paginate
+from blog.models import BlogPage, BlogIndexPage
+from blog.taxonomy import find_by_slug, get_taxonomies
+
+
+DASHBOARD_PER_PAGE = 20
+DASHBOARD_EXACT_COUNT_LIMIT = 1000
+
+# Keyset orderings per sort option; each ends with the unique page id
+DASHBOARD_ORDERINGS = {
+    "title": lambda desc: [("title", desc), ("pk", desc)],
+    "date": lambda desc: [("date", desc), ("pk", desc)],
+    "modified": lambda desc: [("latest_revision_created_at", desc), ("pk", desc)],
+    "featured": lambda desc: [("featured", desc), ("latest_revision_created_at", True), ("pk", True)],
+}
 
 
 @staff_member_required
 def blogs_dashboard(request):
     # Base queryset
-    qs_all = (
-        BlogPage.objects
-        .live()
-        .select_related("owner")
-        .prefetch_related("article_types", "locations")
-    )
-    total_count = qs_all.count()
+    qs_all = BlogPage.objects.live()
+    total_count, total_exact = capped_count(qs_all, DASHBOARD_EXACT_COUNT_LIMIT)
 
     # --- filters ---
     search_query = (request.GET.get("q") or "").strip()
     type_filter = (request.GET.get("type") or "").strip()
     location_filter = (request.GET.get("location") or "").strip()
+    taxonomies = get_taxonomies()
 
     qs = qs_all
 
     if search_query:
         qs = qs.filter(title__icontains=search_query)
 
-    # type filter (slug -> ArticleType)
-    if type_filter:
-        t = next(
-            (x for x in ArticleType.objects.all() if slugify(x.name) == type_filter),
-            None
-        )
-        if t:
-            qs = qs.filter(article_types__name=t.name)
-
-    # location filter (slug -> Location)
-    if location_filter:
-        loc = next(
-            (x for x in Location.objects.all() if slugify(x.name) == location_filter),
-            None
-        )
-        if loc:
-            qs = qs.filter(locations__name=loc.name)
+    # EXISTS on the M2M tables instead of a join, so no distinct() is needed
+    article_type = find_by_slug(taxonomies["article_types"], type_filter)
+    if article_type:
+        qs = qs.filter(Exists(BlogPage.article_types.through.objects.filter(
+            blogpage_id=OuterRef("pk"), articletype_id=article_type["id"],
+        )))
 
-    # Important: distinct BEFORE sorting (because of M2M filters)
-    qs = qs.distinct()
+    location = find_by_slug(taxonomies["locations"], location_filter)
+    if location:
+        qs = qs.filter(Exists(BlogPage.locations.through.objects.filter(
+            blogpage_id=OuterRef("pk"), location_id=location["id"],
+        )))
 
     # --- sorting ---
     sort = (request.GET.get("sort") or "modified").strip()
-    direction = (request.GET.get("dir") or "desc").strip().lower()
+    if sort not in DASHBOARD_ORDERINGS:
+        sort = "modified"
+    direction = "asc" if (request.GET.get("dir") or "desc").strip().lower() == "asc" else "desc"
+    ordering = DASHBOARD_ORDERINGS[sort](direction == "desc")
 
-    SORT_MAP = {
-        "title": "title",
-        "date": "date",  # Post Date
-        "modified": "latest_revision_created_at",  # Last modified
-        "featured": "featured",
-    }
-    field = SORT_MAP.get(sort, "latest_revision_created_at")
-    prefix = "-" if direction == "desc" else ""
-
-    if sort == "featured":
-        # Featured sort: respect dir
-        # desc -> featured first, asc -> non-featured first
-        if direction == "asc":
-            qs = qs.order_by("featured", "-latest_revision_created_at", "title")
-        else:
-            qs = qs.order_by("-featured", "-latest_revision_created_at", "title")
-    else:
-        # normal sorts + stable tie-breaker
-        qs = qs.order_by(f"{prefix}{field}", "-latest_revision_created_at", "title")
-
-    filtered_count = qs.count()
+    filtered_count, filtered_exact = capped_count(qs, DASHBOARD_EXACT_COUNT_LIMIT)
 
     # --- pagination ---
-    paginator = Paginator(qs, 20)
-    page_obj = paginator.get_page(request.GET.get("page"))
-
-    # sidebar lists (for template)
-    article_types = [
-        {"name": t.name, "slug": slugify(t.name)}
-        for t in ArticleType.objects.all().order_by("name")
-    ]
-    locations = [
-        {"name": l.name, "slug": slugify(l.name)}
-        for l in Location.objects.all().order_by("name")
-    ]
+    try:
+        page_obj = keyset_paginate(
+            qs, ordering, DASHBOARD_PER_PAGE,
+            after=request.GET.get("after") or None,
+            before=request.GET.get("before") or None,
+        )
+    except InvalidCursor:
+        page_obj = keyset_paginate(qs, ordering, DASHBOARD_PER_PAGE)
 
     # add_url (Add blog page button)
     parent = BlogIndexPage.objects.first()
@@ -584,12 +564,14 @@ def blogs_dashboard(request):
         "page_obj": page_obj,
         "blog_posts": page_obj.object_list,
         "total_count": total_count,
+        "total_exact": total_exact,
         "filtered_count": filtered_count,
+        "filtered_exact": filtered_exact,
         "search_query": search_query,
         "type_filter": type_filter,
         "location_filter": location_filter,
-        "article_types": article_types,
-        "locations": locations,
+        "article_types": taxonomies["article_types"],
+        "locations": taxonomies["locations"],
         "add_url": add_url,
         "sort": sort,
         "dir": direction,
@@ -636,6 +618,10 @@ def set_language(request):
     return response
 
 from blog import admin_views
+from blog import feeds as blog_feeds
+from blog import polls as blog_polls
+from blog.poll_stream import results_stream_view
+from blog import tables as blog_tables
 urlpatterns = [
     path("i18n/", include("django.conf.urls.i18n")),
     path("set-language/", set_language, name="set_language"),
@@ -669,6 +655,12 @@ urlpatterns = [
     path("author/id/<int:author_id>/", author, name="author_profile_by_id"),
     path("blog/admin/", include("blog.urls")),
     path("blog/support/", support, name="blog_support_redirect"),
+    path("feeds/<slug:section>/<slug:fmt>/", blog_feeds.feed_view, name="blog_feed"),
+    path("polls/<int:poll_id>/vote/", blog_polls.vote_view, name="poll_vote"),
+    path("polls/<int:poll_id>/results/", blog_polls.results_view, name="poll_results"),
+    path("polls/<int:poll_id>/stream/", results_stream_view, name="poll_results_stream"),
+    path("tables/<int:page_id>/<slug:digest>/rows/", blog_tables.table_rows_view, name="data_table_rows"),
+    path("tables/<int:page_id>/<slug:digest>.csv", blog_tables.table_csv_view, name="data_table_csv"),
 ]
 
 if settings.DEBUG:
@@ -4,6 +4,9 @@
 # Migrate created migrations to database
 # python manage.py migrate
 
+# Shared cache table used for publish-invalidated caches
+python manage.py createcachetable
+
 #Collect static images
 python manage.py collectstatic --no-input
 
@@ -60,6 +60,8 @@ sudo -u django bash -c "cd /home/django/apps/cashmatters && source venv/bin/acti
 echo -e "${YELLOW}⚙️ Setting up Django...${NC}"
 sudo -u django bash -c "cd /home/django/apps/cashmatters && source venv/bin/activate && python manage.py collectstatic --noinput"
 sudo -u django bash -c "cd /home/django/apps/cashmatters && source venv/bin/activate && python manage.py migrate"
+# Only the production settings use the database cache
+sudo -u django bash -c "cd /home/django/apps/cashmatters && source venv/bin/activate && DJANGO_SETTINGS_MODULE=cashmatters.settings.production python manage.py createcachetable"
 
 # Create directories for static/media files
 sudo mkdir -p /home/django/apps/cashmatters/staticfiles
@@ -67,12 +69,18 @@ sudo mkdir -p /home/django/apps/cashmatters/media
 sudo chown -R django:www-data /home/django/apps/cashmatters/staticfiles
 sudo chown -R django:www-data /home/django/apps/cashmatters/media
 
-# Setup Gunicorn service
-echo -e "${YELLOW}🔧 Setting up Gunicorn service...${NC}"
+# Socket directory for the ASGI server that nginx proxies poll streams to
+sudo mkdir -p /var/www/cashmatters
+sudo chown django:www-data /var/www/cashmatters
+
+# Setup Gunicorn, Uvicorn and background task worker services
+echo -e "${YELLOW}🔧 Setting up Gunicorn, Uvicorn and worker services...${NC}"
 sudo cp /home/django/apps/cashmatters/gunicorn.service /etc/systemd/system/
+sudo cp /home/django/apps/cashmatters/uvicorn.service /etc/systemd/system/
+sudo cp /home/django/apps/cashmatters/db_worker.service /etc/systemd/system/
 sudo systemctl daemon-reload
-sudo systemctl start gunicorn
-sudo systemctl enable gunicorn
+sudo systemctl restart gunicorn uvicorn db_worker
+sudo systemctl enable gunicorn uvicorn db_worker
 
 # Setup Nginx
 echo -e "${YELLOW}🌐 Setting up Nginx...${NC}"
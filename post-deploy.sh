@@ -47,11 +47,12 @@ sudo -u django bash -c "cd /home/django/apps/cashmatters && source venv/bin/acti
 # Final setup
 echo -e "${YELLOW}🔄 Running final migrations and setup...${NC}"
 sudo -u django bash -c "cd /home/django/apps/cashmatters && source venv/bin/activate && DJANGO_SETTINGS_MODULE=cashmatters.settings.production python manage.py migrate"
+sudo -u django bash -c "cd /home/django/apps/cashmatters && source venv/bin/activate && DJANGO_SETTINGS_MODULE=cashmatters.settings.production python manage.py createcachetable"
 sudo -u django bash -c "cd /home/django/apps/cashmatters && source venv/bin/activate && DJANGO_SETTINGS_MODULE=cashmatters.settings.production python manage.py collectstatic --noinput"
 
 # Restart services
 echo -e "${YELLOW}🔄 Restarting services...${NC}"
-sudo systemctl restart gunicorn
+sudo systemctl restart gunicorn uvicorn db_worker
 sudo systemctl restart nginx
 
 echo -e "${GREEN}✅ Post-deployment setup completed!${NC}"